@@ -16,4 +16,4 @@
 
 
 __all__ = ['constants', 'identifier', 'data_model', 'ob', 'parser',
-           'taxonomy', 'validator']
+           'taxonomy', 'taxonomy_cache', 'taxonomy_tables', 'validator']
@@ -15,6 +15,12 @@
 """
 Sets pyoblib constants.
     SOLAR_TAXONOMY_DIR : path to solar taxonomy.
+    TAXONOMY_VERSION : version of the solar taxonomy files that can be loaded.
+    TAXONOMY_CACHE_DIR : path to the precompiled taxonomy snapshot images, set with the OBLIB_CACHE_DIR
+                         environment variable.  None if the variable is not set, in which case
+                         Taxonomy does not use the snapshot cache unless asked to.
+    DEFAULT_TAXONOMY_CACHE_DIR : path to the snapshot images when the cache is asked for and
+                                 OBLIB_CACHE_DIR is not set.
 """
 
 import os
@@ -29,6 +35,12 @@ else:
     # Running from source
     SOLAR_TAXONOMY_DIR = os.path.join(BASE_DIR, "data", "solar-taxonomy")
 
+TAXONOMY_VERSION = "2020-04-01"
+
+TAXONOMY_CACHE_DIR = os.environ.get("OBLIB_CACHE_DIR")
+
+DEFAULT_TAXONOMY_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "oblib", "taxonomy")
+
 
 # The following constants are based on hard-coded dates found in other modules.  Moving all of them into constants
 # is a first step towards standardization.  The second step will be analysis to see if some of them can be combined
@@ -49,18 +49,63 @@ then use the document's ``.get`` method to read data from  the document.
 import xml.etree.ElementTree
 from xml.etree.ElementTree import Element, SubElement
 import datetime
+import functools
 import json
 
 from six import string_types
-from oblib import constants, taxonomy, validator, identifier
+from oblib import constants, taxonomy, validator, identifier, fact_store
 from oblib.ob import (
     OBError, OBTypeError, OBContextError,
     OBConceptError, OBNotFoundError,
-    OBUnitError)
+    OBUnitError, OBValidationError, OBValidationErrors)
 
 UNTABLE = "NON_TABLE_CONCEPTS"
 
 
+class TableSchema(object):
+    """
+    The schema of a table (Hypercube) within an entrypoint, shared by the
+    Hypercubes of every OBInstance of the entrypoint (see
+    OBInstanceTemplate).  Membership data is held in frozensets and the
+    domain of each axis is resolved up front so that validating a context
+    costs a constant time per axis.
+
+    Attributes:
+      axes: dict
+        axis name to Axis instance.
+      line_items: frozenset
+        names of the line items allowed in the table.
+      domains: dict
+        axis name to the domain name of the axis, None for an explicit
+        dimension.
+      domain_members: dict
+        axis name to a frozenset of the allowed axis values, empty if the
+        values are not restricted.
+      required_axes: frozenset
+        names of the axes that must be given in every context of the table.
+    """
+    def __init__(self, axes, line_items):
+        """
+        Args:
+          axes: dict
+            axis name to Axis instance, the domains and domain members of
+            the axes must already be set.
+          line_items: iterable
+            names of the line items allowed in the table.
+        """
+        self.axes = axes
+        self.line_items = frozenset(line_items)
+        self.domains = {}
+        self.domain_members = {}
+        required_axes = []
+        for axis_name, axis in axes.items():
+            self.domains[axis_name] = axis.get_domain()
+            self.domain_members[axis_name] = frozenset(axis.domainMembers)
+            if axis.get_details("typed_domain_ref"):
+                required_axes.append(axis_name)
+        self.required_axes = frozenset(required_axes)
+
+
 class Hypercube(object):
     """
     Data structure representing a table (aka a Hypercube) within a document.
@@ -72,8 +117,9 @@ class Hypercube(object):
     """
     def __init__(self, ob_instance, table_name):
         """
-        Constructs a Hypercube instance with an empty list of Contexts. Figures out
-        the axes and allowed line items using the relationships from the OBInstance.
+        Constructs a Hypercube instance with an empty list of Contexts. The
+        axes and allowed line items are shared with the OBInstanceTemplate
+        of the OBInstance.
 
         Args:
           ob_instance: reference to OBInstance instance
@@ -83,52 +129,17 @@ class Hypercube(object):
         """
 
         self._table_name = table_name
+        self._schema = ob_instance._template.get_table_schema(table_name)
         # self._axes is a dictionary where key is the axis name and value is the
         # axis Concept instance.
-        self._axes = {}
-        self._allowed_line_items = []
+        self._axes = self._schema.axes
+        self._allowed_line_items = self._schema.line_items
         # self.contexts stores a list of contexts that have been populated within
-        # this table instance.
+        # this table instance, self._contexts_by_key indexes them by key.
         self.contexts = []
+        self._contexts_by_key = {}
         self.ts = ob_instance.ts
 
-        relationships = ob_instance.relations
-        # Use the relationships to find the names of my axes:
-        for relation in relationships:
-            if relation.role == taxonomy.RelationshipRole.hypercube_dimension:
-                if relation.from_ == self._table_name:
-                    axis_name = relation.to
-                    if not axis_name in self._axes:
-                        if not isinstance( ob_instance.get_concept(axis_name), Axis):
-                            raise OBError(
-                                "Expected {} to be an Axis instance but it isn't"\
-                                .format(axis_name))
-                        self._axes[axis_name] = ob_instance.get_concept(axis_name)
-
-        # If there's an arcrole of "all" then the "from" is a LineItems
-        # and the "to" is the table?  I think?
-        for relation in relationships:
-            if relation.role == taxonomy.RelationshipRole.dimension_all:
-                if relation.to == self._table_name:
-                    line_item = relation.from_
-                    if not self.has_line_item(line_item):
-                        self._allowed_line_items.append(line_item)
-
-        # If there's dimension-domain or domain-member relationships for any
-        # of my axes, extract that information as well:
-        for relation in relationships:
-            if relation.role == taxonomy.RelationshipRole.dimension_domain:
-                if relation.from_ in self._axes:
-                    domain = relation.to
-                    self._axes[ relation.from_ ].domain = domain
-
-        for relation in relationships:
-            if relation.role == taxonomy.RelationshipRole.domain_member:
-                for axis in list(self._axes.values()):
-                    if axis.domain == relation.from_:
-                        member = relation.to
-                        axis.domainMembers.append( member )
-
     def get_name(self):
         """
         Returns:
@@ -166,13 +177,15 @@ class Hypercube(object):
           Otherwise, a unique ID is assigned to the new context and it's both
           stored and returned.
         """
-        for context in self.contexts:
-            if context.equals_context(new_context):
-                return context
+        key, context = self._find_context(new_context)
+        if context is not None:
+            return context
         # For the ID, just use "HypercubeName_serialNumber":
         new_id = "%s_%d" % (self._table_name, len(self.contexts))
         new_context.set_id(self, new_id)
         self.contexts.append(new_context)
+        if key is not None:
+            self._contexts_by_key[key] = new_context
         return new_context
 
     def lookup_context(self, old_context):
@@ -183,10 +196,26 @@ class Hypercube(object):
           If there is a matching Context stored in the table already, returns
           that one; otherwise returns None.
         """
-        for context in self.contexts:
-            if context.equals_context(old_context):
-                return context
-        return None
+        return self._find_context(old_context)[1]
+
+    def _find_context(self, context):
+        """
+        Args:
+          context: a Context instance
+        Returns:
+          A tuple of the key of the context (see Context.get_key) and the
+          matching Context stored in the table or None.  The key is None if
+          the context has a value that cannot be hashed, such a context is
+          compared with every stored context.
+        """
+        try:
+            key = context.get_key()
+            return key, self._contexts_by_key.get(key)
+        except TypeError:
+            for stored_context in self.contexts:
+                if stored_context.equals_context(context):
+                    return None, stored_context
+            return None, None
 
     def _toXML(self):
         """
@@ -206,7 +235,7 @@ class Hypercube(object):
           domain, as opposed to an explicit dimension.
         """
         # TODO if not present, return False? or throw exception?
-        return self.get_domain(dimensionName) is not None
+        return self._schema.domains[dimensionName] is not None
 
     def get_domain(self, dimensionName):
         """
@@ -217,8 +246,7 @@ class Hypercube(object):
           The domain name (a string, name of a Concept) corresponding to the named
           dimension, if that dimension is a typed dimension; otherwise returns None.
         """
-        axis = self._axes[dimensionName]
-        return axis.get_domain()
+        return self._schema.domains[dimensionName]
 
 
     def get_valid_values_for_axis(self, dimensionName):
@@ -247,8 +275,8 @@ class Hypercube(object):
           otherwise.
         """
         # TODO make this a method of the Axis object?
-        axis = self._axes[dimensionName]
-        if len(axis.domainMembers) == 0:
+        domain_members = self._schema.domain_members[dimensionName]
+        if len(domain_members) == 0:
             # If this is a domain axis but not an enumerated domain axis, then for
             # now we'll allow anything. For example, ProductIdentifierAxis has
             # ProductIdentiferDomain but the value is not restricted to an enumerated
@@ -256,7 +284,7 @@ class Hypercube(object):
             # kind of axis?
             return True
 
-        return dimensionValue in axis.domainMembers
+        return dimensionValue in domain_members
 
     def _is_valid_context(self, context):
         """
@@ -273,15 +301,14 @@ class Hypercube(object):
             raise OBContextError("{} is not a valid Context instance".format(context))
 
         for axis_name in self._axes:
-            if self.ts.get_concept_details(axis_name).typed_domain_ref and not axis_name in context.axes:
-                raise OBContextError(
-                    "Missing required {} axis for table {}".format(
-                        axis_name, self._table_name))
-            elif not self.ts.get_concept_details(axis_name).typed_domain_ref and not axis_name in context.axes:
+            if not axis_name in context.axes:
+                if axis_name in self._schema.required_axes:
+                    raise OBContextError(
+                        "Missing required {} axis for table {}".format(
+                            axis_name, self._table_name))
                 continue
 
             # Check that the value is not outside the domain, for domain-based axes:
-            axis = self._axes[axis_name]
             if self.is_typed_dimension(axis_name):
                 axis_value = context.axes[axis_name]
                 if not self.is_axis_value_within_domain(axis_name, axis_value):
@@ -296,6 +323,112 @@ class Hypercube(object):
                         axis_name, self._table_name))
 
 
+# Types of the context field values which are hashable as they are.
+_SCALAR_TYPES = frozenset([type(None), bool, int, float, str,
+                           datetime.date, datetime.datetime])
+
+
+def _hashable(value):
+    """
+    Converts the dicts (such as a duration), lists and sets within a context
+    field value to hashable equivalents.
+    """
+    if type(value) in _SCALAR_TYPES:
+        return value
+    elif isinstance(value, dict):
+        return (dict, frozenset((k, v if type(v) in _SCALAR_TYPES else _hashable(v))
+                                for k, v in value.items()))
+    elif isinstance(value, list):
+        return (list, tuple(v if type(v) in _SCALAR_TYPES else _hashable(v) for v in value))
+    elif isinstance(value, tuple):
+        return (tuple, tuple(v if type(v) in _SCALAR_TYPES else _hashable(v) for v in value))
+    elif isinstance(value, (set, frozenset)):
+        return (frozenset, frozenset(value))
+    return value
+
+
+def _context_key(context):
+    """
+    Returns:
+      A hashable key identifying a Context instance (see Context.get_key) or
+      the keyword args of a context, None if the context has a value that
+      cannot be hashed.
+    """
+    try:
+        if isinstance(context, Context):
+            return context.get_key()
+        key = _hashable(context)
+        hash(key)
+        return key
+    except TypeError:
+        return None
+
+
+# Keyword args of set() that are attributes of the fact rather than fields of
+# its context.
+_FACT_ARGS = ("unit_name", "precision", "decimals", "fact_id")
+
+
+def _context_args_key(kwargs):
+    """
+    Returns:
+      A hashable key identifying the context given by a Context instance or
+      the keyword args of set() (the keys of _FACT_ARGS are ignored), None if
+      the context has a value that cannot be hashed.
+    """
+    if isinstance(kwargs, Context):
+        context_key = _context_key(kwargs)
+    elif "context" in kwargs:
+        context_key = _context_key(kwargs["context"])
+    else:
+        try:
+            return ("context_args", frozenset(
+                (k, v if type(v) in _SCALAR_TYPES else _hashable(v))
+                for k, v in kwargs.items() if k not in _FACT_ARGS))
+        except TypeError:
+            return None
+    return None if context_key is None else ("context", context_key)
+
+
+def _value_key(value):
+    """
+    Returns:
+      The value itself if it can be hashed, None otherwise.
+    """
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return None
+
+
+def _cached(cache, key, function, *args):
+    """
+    Calls function(*args) once per key of the cache, the later calls with the
+    same key return the stored result, or raise the stored OBError again.
+    Args:
+      cache: dict or None
+        results of the previous calls, nothing is cached if None.
+      key: hashable tuple
+        identifies the call, nothing is cached if its last element is None.
+      function: callable
+      args: arguments of function
+    Returns:
+      The result of function(*args).
+    """
+    if cache is None or key[-1] is None:
+        return function(*args)
+    if key not in cache:
+        try:
+            cache[key] = (function(*args), None)
+        except OBError as e:
+            cache[key] = (None, e)
+    result, error = cache[key]
+    if error is not None:
+        raise error.with_traceback(None)
+    return result
+
+
 class Context(object):
     """
     Represents the context for one or more facts. The context tells us
@@ -384,6 +517,22 @@ class Context(object):
 
         return True
 
+    def get_key(self):
+        """
+        Returns:
+          A hashable key made of the entity, the period and the axes (in
+          sorted order) of the context.  Two contexts have the same key if
+          and only if equals_context is True for them.
+        Raises:
+          TypeError if a field value cannot be hashed.
+        """
+        key = (_hashable(self.entity), _hashable(self.instant),
+               _hashable(self.duration),
+               tuple(sorted((axis_name, _hashable(axis_value))
+                            for axis_name, axis_value in self.axes.items())))
+        hash(key)
+        return key
+
     def set_id(self, hypercube, new_id):
         """
         Adds this context to a hypercube and sets its ID. (A context ID is only
@@ -492,6 +641,8 @@ class Fact(object):
     as either XML or JSON. A Fact provides a value for a certain concept within
     a certain context, and can optionally provide units and a precision.
     """
+    __slots__ = ("concept_name", "value", "context", "unit", "decimals", "precision", "_id")
+
     def __init__(self, concept_name, context, unit, value, decimals=None, precision=None, id=None):
         """
         Constructs a Fact instance.
@@ -515,7 +666,7 @@ class Fact(object):
             EITHER precision OR decimals can be specified, not both.
           id: string
             optional, if included the fact id is set accordingly, otherwise it is
-            auto-generated.
+            auto-generated the first time it is read.
         Raises:
           OBError if constructor is given conflicting information
         """
@@ -535,11 +686,24 @@ class Fact(object):
         # either require a decimals/precision or provide a default. If non-numeric,
         # don't allow decimals/precision to be set.
 
-        # Fill in the id property with a UUID:
-        if id is None:
-            self.id = identifier.identifier()
-        else:
-            self.id = id
+        # The id property is filled in with a UUID when it is first read, so
+        # that no UUID is generated for facts whose ID is replaced or never
+        # exported.
+        self._id = id
+
+    @property
+    def id(self):
+        """
+        The ID of this Fact (a string), a UUID generated the first time it is
+        read unless an ID was given.
+        """
+        if self._id is None:
+            self._id = identifier.identifier()
+        return self._id
+
+    @id.setter
+    def id(self, new_id):
+        self._id = new_id
 
     def set_id(self, new_id):
         """
@@ -557,21 +721,8 @@ class Fact(object):
           an XML element representing this Fact and all its fields in XBRL
           XML format.
         """
-        attribs = {"contextRef": self.context.get_id(),
-                   "id": self.id}
-        # TODO the self.unit may not be correct unitRef? not sure
-        if self.unit is not None:
-            attribs["unitRef"] = self.unit
-            if self.decimals is not None:
-                attribs["decimals"] = str(self.decimals)
-            elif self.precision is not None:
-                attribs["precision"] = str(self.precision)
-        elem = Element(self.concept_name, attrib=attribs)
-        if self.unit == "pure":
-            elem.text = "%d" % self.value
-        else:
-            elem.text = str(self.value)
-        return elem
+        return _fact_to_XML(self.concept_name, self.context.get_id(), self.id, self.unit,
+                            self.value, self.decimals, self.precision)
 
     def _toJSON(self):
         """
@@ -580,29 +731,66 @@ class Fact(object):
           JSON format. All values are strings except for True, False, and None
           which are literals. (see issue #142)
         """
-        aspects = self.context._toJSON()
-        aspects["concept"] = self.concept_name
-        if self.unit is not None:
-            aspects["unit"] = str(self.unit)
-            if self.decimals is not None:
-                aspects["decimals"] = str(self.decimals)
-            elif self.precision is not None:
-                aspects["precision"] = str(self.precision)
-
-        if isinstance( self.value, datetime.datetime):
-            # Format dates:
-            value_literal = self.value.isoformat(sep='T')
-        elif isinstance( self.value, bool):
-            # booleans are written as boolean literals
-            value_literal = self.value
-        elif isinstance( self.value, type(None)):
-            # So are Nones:
-            value_literal = self.value
-        else:
-            # All else gets converted to string:
-            value_literal = str(self.value)
-        return { "aspects": aspects,
-                 "value": value_literal}
+        return _fact_to_JSON(self.context._toJSON(), self.concept_name, self.unit,
+                             self.value, self.decimals, self.precision)
+
+
+def _fact_to_XML(concept_name, context_id, fact_id, unit, value, decimals, precision):
+    """
+    Returns:
+      an XML element representing a fact given by its fields in XBRL XML
+      format, see Fact._toXML.  Columnar documents export their facts with it
+      without creating Fact instances.
+    """
+    attribs = {"contextRef": context_id,
+               "id": fact_id}
+    # TODO the unit may not be correct unitRef? not sure
+    if unit is not None:
+        attribs["unitRef"] = unit
+        if decimals is not None:
+            attribs["decimals"] = str(decimals)
+        elif precision is not None:
+            attribs["precision"] = str(precision)
+    elem = Element(concept_name, attrib=attribs)
+    if unit == "pure":
+        elem.text = "%d" % value
+    else:
+        elem.text = str(value)
+    return elem
+
+
+def _fact_to_JSON(aspects, concept_name, unit, value, decimals, precision):
+    """
+    Args:
+      aspects: dict
+        the aspects of the context of the fact (see Context._toJSON), the
+        fields of the fact are added to it.
+    Returns:
+      a JSON-style dict representing a fact given by its fields in XBRL JSON
+      format, see Fact._toJSON.
+    """
+    aspects["concept"] = concept_name
+    if unit is not None:
+        aspects["unit"] = str(unit)
+        if decimals is not None:
+            aspects["decimals"] = str(decimals)
+        elif precision is not None:
+            aspects["precision"] = str(precision)
+
+    if isinstance(value, datetime.datetime):
+        # Format dates:
+        value_literal = value.isoformat(sep='T')
+    elif isinstance(value, bool):
+        # booleans are written as boolean literals
+        value_literal = value
+    elif isinstance(value, type(None)):
+        # So are Nones:
+        value_literal = value
+    else:
+        # All else gets converted to string:
+        value_literal = str(value)
+    return {"aspects": aspects,
+            "value": value_literal}
 
 
 class Concept(object):
@@ -612,7 +800,7 @@ class Concept(object):
     of which concepts are parents/children of other concepts in the schema hierarchy.
     Also stores concept metadata derived from the schema.
     """
-    def __init__(self, taxonomy, concept_name):
+    def __init__(self, taxonomy, concept_name, concept_validator=None):
         """
         Constructs a Concept instance with no parent and no children.
         Args:
@@ -620,13 +808,18 @@ class Concept(object):
             used to look up information about the named concept.
           concept_name: string
             name of an XBRL Concept in the taxonomy
+          concept_validator: validator.Validator
+            default None. Validator to share with other concepts, a new
+            one is created if None.
         Raises:
           Nothing, but prints a warning if concept_name is not found in taxonomy
         """
         self.name = concept_name
         self.parent = None
         self.children = []
-        self.validator = validator.Validator(taxonomy)
+        if concept_validator is None:
+            concept_validator = validator.Validator(taxonomy)
+        self.validator = concept_validator
 
         try:
             self.metadata = taxonomy.semantic.get_concept_details(concept_name)
@@ -796,7 +989,7 @@ class Axis(Concept):
     class is a subclass of Concept. In addition to the fields of a Concept,
     an Axis may also have a Domain and a finite set of allowed Domain Members.
     """
-    def __init__(self, taxonomy, concept_name):
+    def __init__(self, taxonomy, concept_name, concept_validator=None):
         """
         Constructs an Axis instance with no parent and no children.
         Args:
@@ -804,10 +997,13 @@ class Axis(Concept):
             used to look up information about the named concept.
           concept_name: string
             name of an XBRL Concept in the taxonomy
+          concept_validator: validator.Validator
+            default None. Validator to share with other concepts, a new
+            one is created if None.
         Raises:
           Nothing, but prints a warning if concept_name is not found in taxonomy
         """
-        super(Axis, self).__init__(taxonomy, concept_name)
+        super(Axis, self).__init__(taxonomy, concept_name, concept_validator)
         self.domain = None
         self.domainMembers = []
 
@@ -840,6 +1036,310 @@ class Axis(Concept):
 
 
 
+_UNTABLE_SCHEMA = TableSchema({}, [])
+
+
+class OBInstanceTemplate(object):
+    """
+    The schema of the OBInstances of one entrypoint: the Concept tree and the
+    tables with their axes, domains and line items.  It is built once from
+    the taxonomy relationships and shared by every OBInstance of the
+    entrypoint, so it must not be modified.  Use
+    Taxonomy.get_instance_template() to get the cached template rather than
+    constructing one.
+    """
+    def __init__(self, entrypoint_name, taxonomy):
+        """
+        Builds the template of an entrypoint.
+        Args:
+          entrypoint_name: string
+            name of an Entrypoint or "All" (see OBInstance).
+          taxonomy: reference to the Taxonomy singleton.
+        Raises:
+          OBNotFoundError if the named Entrypoint cannot be found.
+        """
+        self.entrypoint_name = entrypoint_name
+        self.ts = taxonomy.semantic
+        if not self.ts.is_entrypoint(entrypoint_name):
+            raise OBNotFoundError(
+                "There is no Orange Button entrypoint named {}.".format(
+                    entrypoint_name))
+
+        # A single validator is shared by all the concepts.
+        self._validator = validator.Validator(taxonomy)
+        self._concepts = {}
+        # self._tables maps each table name to its TableSchema.
+        self._tables = {}
+        # self._line_item_tables maps each line item to the first table
+        # allowing it.
+        self._line_item_tables = {}
+        # self._concept_tables maps each concept to the name of the table
+        # where it belongs, or UNTABLE, and self._table_concepts maps each
+        # table name, and UNTABLE, to the names of the concepts belonging in it.
+        self._concept_tables = {}
+        self._table_concepts = {}
+
+        # This gives me the list of every concept that could ever be
+        # included in the document.
+        concept_list = self.ts.get_entrypoint_concepts(entrypoint_name)
+        self._initialize_concepts(taxonomy, concept_list)
+
+        # Search through the relationships (this comes from
+        # solar_taxonomy/documents/<entrypoint>/<entrypoint><version>_def.xml)
+        # to find all of the tables, their axes, and parent/child
+        # relationships between concepts:
+        self._initialize_parents()
+        self._initialize_tables()
+        self._initialize_concept_tables()
+
+    def _initialize_concepts(self, taxonomy, concept_name_list):
+        """
+        Initializes the Concept dictionary of the template.
+        Args:
+          concept_name_list: list of strings
+            names of every concept allowed in this document.
+        """
+        for concept_name in concept_name_list:
+            if concept_name.endswith("_1"):
+                # There are a bunch of duplicate concept names that all end in "_1"
+                # that raise an exception if we try to query them.
+                continue
+            # Use substitution group to check whether this concept should be an
+            # Axis, and if so, instantiate the Axis subclass:
+            subgrp = self.ts.get_concept_details(concept_name).substitution_group
+            if subgrp.name == 'dimension':
+                new_concept = Axis(taxonomy, concept_name, self._validator)
+            else:
+                new_concept = Concept(taxonomy, concept_name, self._validator)
+            self._concepts[concept_name] = new_concept
+
+    def _initialize_parents(self):
+        """
+        Initializes the Concept tree of the template, using relations
+        from the taxonomy to relate parents to children in a tree structure.
+        """
+        for relation in self.ts.get_entrypoint_relationships(
+                self.entrypoint_name,
+                taxonomy.RelationshipRole.domain_member):
+            parent_name = relation.from_
+            child_name = relation.to
+            if parent_name.endswith("_1") or child_name.endswith("_1"):
+                # These are the duplicate concept names and are unwanted
+                continue
+            parent = self.get_concept(parent_name)
+            child = self.get_concept(child_name)
+            parent.add_child(child)
+
+    def _initialize_tables(self):
+        """
+        Initializes the table schemas of the template, using relations from
+        the taxonomy to find the axes and lineitems for each one.
+        """
+        # When there's an arcrole of "hypercube-dimensions", the "from"
+        # is a hypercube/table, and the "to" is an axis. Use these
+        # relationships to find all hypercube names.
+        table_axes = {}
+        for relation in self.ts.get_entrypoint_relationships(
+                self.entrypoint_name,
+                taxonomy.RelationshipRole.hypercube_dimension):
+            table_name = relation.from_
+            if table_name not in table_axes:
+                table_axes[table_name] = self._find_table_axes(table_name)
+
+        # The domain of an axis does not depend on the table, so each axis is
+        # resolved once even if it is shared by several tables.
+        resolved = set()
+        for axes in table_axes.values():
+            for axis_name, axis in axes.items():
+                if axis_name not in resolved:
+                    self._resolve_axis_domain(axis_name, axis)
+                    resolved.add(axis_name)
+
+        for table_name, axes in table_axes.items():
+            line_items = self._find_table_line_items(table_name)
+            self._tables[table_name] = TableSchema(axes, line_items)
+            for line_item in line_items:
+                self._line_item_tables.setdefault(line_item, table_name)
+
+    def _initialize_concept_tables(self):
+        """
+        Initializes the map from each concept of the template to the table
+        where it belongs.  We know that a concept belongs in a table because
+        the concept is a descendant of a LineItem that has a relationship to
+        the table.  Concepts that do not belong in any table are mapped to
+        UNTABLE.
+        """
+        for concept_name, concept in self._concepts.items():
+            table_name = UNTABLE
+            # Walk up the ancestors like get_ancestors() does, but stop if the
+            # tree loops back on itself (this happens in the "All" entrypoint).
+            visited = set()
+            ancestor = concept.parent
+            while ancestor is not None and ancestor.name not in visited:
+                if "LineItem" in ancestor.name: # maybe not????
+                    line_item_table = self._line_item_tables.get(ancestor.name)
+                    if line_item_table is not None:
+                        table_name = line_item_table
+                        break
+                visited.add(ancestor.name)
+                ancestor = ancestor.parent
+            self._concept_tables[concept_name] = table_name
+            self._table_concepts.setdefault(table_name, []).append(concept_name)
+
+    def _find_table_axes(self, table_name):
+        """
+        Figures out the axes of a table using the relationships from the
+        taxonomy.
+        Args:
+          table_name: string
+            name of the table within the solar taxonomy, e.g.: "solar:ProductIdentifierTable".
+        Returns:
+          A dict from axis name to Axis instance.
+        """
+        axes = {}
+
+        # Use the relationships to find the names of my axes:
+        for relation in self.ts.get_relationships_from(
+                self.entrypoint_name, table_name,
+                taxonomy.RelationshipRole.hypercube_dimension):
+            axis_name = relation.to
+            if not axis_name in axes:
+                if not isinstance( self.get_concept(axis_name), Axis):
+                    raise OBError(
+                        "Expected {} to be an Axis instance but it isn't"\
+                        .format(axis_name))
+                axes[axis_name] = self.get_concept(axis_name)
+        return axes
+
+    def _find_table_line_items(self, table_name):
+        """
+        Figures out the allowed line items of a table using the relationships
+        from the taxonomy.
+        Args:
+          table_name: string
+            name of the table within the solar taxonomy, e.g.: "solar:ProductIdentifierTable".
+        Returns:
+          A list of line item names.
+        """
+        allowed_line_items = []
+        # If there's an arcrole of "all" then the "from" is a LineItems
+        # and the "to" is the table?  I think?
+        for relation in self.ts.get_relationships_to(
+                self.entrypoint_name, table_name,
+                taxonomy.RelationshipRole.dimension_all):
+            line_item = relation.from_
+            if not line_item in allowed_line_items:
+                allowed_line_items.append(line_item)
+        return allowed_line_items
+
+    def _resolve_axis_domain(self, axis_name, axis):
+        """
+        Sets the domain and the domain members of an axis from its
+        dimension-domain and domain-member relationships.
+        Args:
+          axis_name: string
+            name of the axis
+          axis: Axis instance
+        """
+        for relation in self.ts.get_relationships_from(
+                self.entrypoint_name, axis_name,
+                taxonomy.RelationshipRole.dimension_domain):
+            axis.domain = relation.to
+
+        for relation in self.ts.get_relationships_from(
+                self.entrypoint_name, axis.domain,
+                taxonomy.RelationshipRole.domain_member):
+            if not relation.to in axis.domainMembers:
+                axis.domainMembers.append( relation.to )
+
+    def get_concepts(self):
+        """
+        Returns:
+          dict of the Concept instances allowed by the entrypoint, keyed by
+          concept name.
+        """
+        return self._concepts
+
+    def get_concept(self, concept_name):
+        """
+        Args:
+          concept_name: string
+            name of a concept
+        Returns:
+          Concept instance matching concept_name.
+        """
+        return self._concepts[concept_name]
+
+    def get_table_names(self):
+        """
+        Returns:
+          A list of the names of all tables (hypercubes) of the entrypoint.
+        """
+        return list(self._tables.keys())
+
+    def has_table(self, table_name):
+        """
+        Returns:
+          True if table_name is a table of the entrypoint.
+        """
+        return table_name in self._tables
+
+    def get_table_schema(self, table_name):
+        """
+        Args:
+          table_name: string
+            name of a table (Hypercube) or UNTABLE
+        Returns:
+          TableSchema of the table, the schema of UNTABLE has no axes and no
+          line items.
+        """
+        if table_name == UNTABLE:
+            return _UNTABLE_SCHEMA
+        return self._tables[table_name]
+
+    def get_line_item_table(self, line_item_name):
+        """
+        Args:
+          line_item_name: string
+            name of a concept which may or may not be a line item
+        Returns:
+          Name of the first table allowing the line item, None if no table
+          allows it.
+        """
+        return self._line_item_tables.get(line_item_name)
+
+    def get_concept_table(self, concept_name):
+        """
+        Args:
+          concept_name: string
+            name of a concept allowed by the entrypoint
+        Returns:
+          Name of the table where the concept belongs, or UNTABLE if it does
+          not belong in any table.
+        Raises:
+          KeyError if the concept is not allowed by the entrypoint.
+        """
+        return self._concept_tables[concept_name]
+
+    def get_concept_table_map(self):
+        """
+        Returns:
+          dict from the name of each concept allowed by the entrypoint to the
+          name of the table where it belongs, or UNTABLE.
+        """
+        return dict(self._concept_tables)
+
+    def get_table_concepts(self, table_name):
+        """
+        Args:
+          table_name: string
+            name of a table (Hypercube) or UNTABLE
+        Returns:
+          list of the names of the concepts which belong in the table.
+        """
+        return list(self._table_concepts.get(table_name, []))
+
+
 class OBInstance(object):
     """
     Data structure representing an Orange Button Instance document.
@@ -862,7 +1362,8 @@ class OBInstance(object):
     entrypoint, though -- the spec supports a multiple-entrypoint Instance
     or an Instance with no entrypoint. These are not implemented yet.)
     """
-    def __init__(self, entrypoint_name, taxonomy, dev_validation_off=False):
+    def __init__(self, entrypoint_name, taxonomy, dev_validation_off=False, columnar=False,
+                 id_allocator="random"):
         """
         Constructs an OBInstance instance. It starts out empty, until Facts
         are added.
@@ -880,102 +1381,55 @@ class OBInstance(object):
           dev_validation_off: boolean
             default False. Set it to True to turn validation rules off during 
             development. This should not be used during a release.
+          columnar: boolean
+            default False. Set it to True to store the facts in NumPy arrays
+            (see fact_store.ColumnarFactStore) rather than in self.facts,
+            which uses much less memory for large time series.
+          id_allocator: string or allocator
+            default "random". Allocates the IDs of the facts set without a
+            fact_id, when they are first read: "random", "sequential" or
+            "deterministic" (see identifier.get_id_allocator), or any object
+            with an allocate(concept_name, context) method returning an ID.
         Raises:
           OBNotFoundError if the named Entrypoint cannot be found.
+          ImportError if columnar is True and NumPy is not installed.
+          ValueError if id_allocator is an unknown mode.
         """
         self.ts = taxonomy.semantic
         self.tu = taxonomy.units
         self.taxonomy = taxonomy
         self.entrypoint_name = entrypoint_name
         self._dev_validation_off = dev_validation_off
-        self._all_my_concepts = {}
-
 
         if not self.ts.is_entrypoint(entrypoint_name):
             raise OBNotFoundError(
                 "There is no Orange Button entrypoint named {}.".format(
                     entrypoint_name))
 
-        # This gives me the list of every concept that could ever be
-        # included in the document.
-        concept_list = self.ts.get_entrypoint_concepts(entrypoint_name)
-        self._initialize_concepts(concept_list)
+        # The concepts, tables and their relationships come from the
+        # template shared by all the instances of the entrypoint.
+        self._template = taxonomy.get_instance_template(entrypoint_name)
+        self._all_my_concepts = self._template.get_concepts()
 
         # Get the relationships (this comes from solar_taxonomy/documents/
         #  <entrypoint>/<entrypoint><version>_def.xml)
         self.relations = self.ts.get_entrypoint_relationships(entrypoint_name)
 
-        # Search through the relationships to find all of the tables, their
-        # axes, and parent/child relationships between concepts:
-        self._initialize_parents()
-        self._initialize_tables()
+        # The Hypercubes holding the contexts of this document, created the
+        # first time each table is used.
+        self._tables = {}
+
+        if isinstance(id_allocator, string_types):
+            id_allocator = identifier.get_id_allocator(id_allocator)
+        self._id_allocator = id_allocator
 
         self.facts = {}
+        # With columnar=True the facts are kept in self._fact_store instead
+        # of self.facts, and their contexts are not stored in the Hypercubes.
+        self._fact_store = fact_store.ColumnarFactStore(id_allocator) if columnar else None
         self.taxonomy_name = constants.TAXONOMY_NAME
         self._default_context = {}
 
-    def _initialize_concepts(self, concept_name_list):
-        """
-        Initializes the internal Concept dictionary of the instance. Called by the
-        constructor, client code should not call this.
-        Args:
-          concept_name_list: list of strings
-            names of every concept allowed in this document.
-        """
-        for concept_name in concept_name_list:
-            if concept_name.endswith("_1"):
-                # There are a bunch of duplicate concept names that all end in "_1"
-                # that raise an exception if we try to query them.
-                continue
-            # Use substitution group to check whether this concept should be an
-            # Axis, and if so, instantiate the Axis subclass:
-            subgrp = self.ts.get_concept_details(concept_name).substitution_group
-            if subgrp.name == 'dimension':
-                new_concept = Axis(self.taxonomy, concept_name)
-            else:
-                new_concept = Concept(self.taxonomy, concept_name)
-            self._all_my_concepts[concept_name] = new_concept
-
-    def _initialize_tables(self):
-        """
-        Initializes the internal Hypercube (table) structures of the OBInstance,
-        using relations from the taxonomy to find the axes and lineitems for each one.
-        Called by the constructor, client code should NOT call this.
-        Args: None
-        Returns: None
-        """
-        # When there's an arcrole of "hypercube-dimensions", the "from"
-        # is a hypercube/table, and the "to" is an axis. Use these
-        # relationships to find all hypercube names.
-        self._tables = {}
-        all_table_names = set([])
-        for relation in self.relations:
-            if relation.role == taxonomy.RelationshipRole.hypercube_dimension:
-                table_name = relation.from_
-                all_table_names.add(table_name)
-
-        for table_name in all_table_names:
-            self._tables[table_name] = Hypercube(self, table_name)
-
-    def _initialize_parents(self):
-        """
-        Initializes the internal Concept tree of the Instance, using relations
-        from the taxonomy to relate parents to children in a tree structure.
-        Called by the constructor, client code should NOT call this.
-        Args: None
-        Returns: None
-        """
-        for relation in self.relations:
-            if relation.role == taxonomy.RelationshipRole.domain_member:
-                parent_name = relation.from_
-                child_name = relation.to
-                if parent_name.endswith("_1") or child_name.endswith("_1"):
-                    # These are the duplicate concept names and are unwanted
-                    continue
-                parent = self.get_concept(parent_name)
-                child = self.get_concept(child_name)
-                parent.add_child(child)
-
     def _get_namespaces(self):
         """
         Gets all namespaces that need to be included in the header of this
@@ -990,8 +1444,12 @@ class OBInstance(object):
         # The following namespaces are optional and are included in the header
         # only if they are referred to by a fact in this instance document.
         optional_namespaces = constants.OPTIONAL_NAMESPACES
-        for fact in self.get_all_facts():
-            concept_prefix = fact.concept_name.split(":")[0]
+        if self._fact_store is not None:
+            concept_names = self._fact_store.get_concept_names()
+        else:
+            concept_names = [fact.concept_name for fact in self.get_all_facts()]
+        for concept_name in concept_names:
+            concept_prefix = concept_name.split(":")[0]
             for ns in optional_namespaces:
                 if concept_prefix == ns:
                     namespaces[ "xmlns:{}".format(ns)] = optional_namespaces[ns]
@@ -1016,7 +1474,10 @@ class OBInstance(object):
           A list of strings identifying all table (hypercubes) allowed
           in this instance document by the entrypoint.
         """
-        return list(self._tables.keys())
+        table_names = self._template.get_table_names()
+        if UNTABLE in self._tables:
+            table_names.append(UNTABLE)
+        return table_names
 
     def get_table(self, table_name):
         """
@@ -1027,6 +1488,10 @@ class OBInstance(object):
           Hypercube instance matching the given table_name string, if it's a
           table allowed in this instance document by the entrypoint.
         """
+        if table_name not in self._tables:
+            if not self._template.has_table(table_name):
+                raise KeyError(table_name)
+            self._tables[table_name] = Hypercube(self, table_name)
         return self._tables[table_name]
 
     def _identify_relations(self, concept_name):
@@ -1038,10 +1503,10 @@ class OBInstance(object):
             name of a concept
         Returns: None
         """
-        from_me = [r for r in self.relations if r['from'] == concept_name]
+        from_me = self.ts.get_relationships_from(self.entrypoint_name, concept_name)
         for x in from_me:
             print("{} -> {} -> {}".format(concept_name, x.role, x.to))
-        to_me = [r for r in self.relations if r.to == concept_name]
+        to_me = self.ts.get_relationships_to(self.entrypoint_name, concept_name)
         for x in to_me:
             print("{} -> {} -> {}".format(x.from_, x.role, concept_name))
 
@@ -1061,21 +1526,24 @@ class OBInstance(object):
             raise OBConceptError(
                 "{} is not an allowed concept for {}".format(
                     concept_name, self.entrypoint_name))
-        # We know that a concept belongs in a table because the concept
-        # is a descendant of a LineItem that has a relationship to the
-        # table.
-        ancestors = self._all_my_concepts[concept_name].get_ancestors()
-        for ancestor in ancestors:
-            if "LineItem" in ancestor.name: # maybe not????
-                for table in list(self._tables.values()):
-                    if table.has_line_item(ancestor.name):
-                        return table
-
-        # print "Warning: no table for {}, writing it to default table".format(concept_name)
-        # kind of a hack here -- make a placeholder table with no axes for the non-table concepts
-        if not UNTABLE in self._tables:
-            self._tables[UNTABLE] = Hypercube(self, UNTABLE)
-        return self._tables[UNTABLE]
+        table_name = self._template.get_concept_table(concept_name)
+        if table_name == UNTABLE:
+            # print "Warning: no table for {}, writing it to default table".format(concept_name)
+            # kind of a hack here -- make a placeholder table with no axes for the non-table concepts
+            if not UNTABLE in self._tables:
+                self._tables[UNTABLE] = Hypercube(self, UNTABLE)
+            return self._tables[UNTABLE]
+        return self.get_table(table_name)
+
+    def get_concept_table_map(self):
+        """
+        Maps every concept that can be written to this instance document to
+        its table, so that facts can be grouped by table before they are set.
+        Returns:
+          dict from concept name (string) to the name of the table where the
+          concept belongs, or UNTABLE if it does not belong in any table.
+        """
+        return self._template.get_concept_table_map()
 
     def get_all_writable_concepts(self):
         """
@@ -1281,83 +1749,264 @@ class OBInstance(object):
           OBTypeError: if the value given is the wrong type for the concept
         """
 
-        if "unit_name" in kwargs:
-            unit_name = kwargs.pop("unit_name")
-            valid_unit_name = self.tu.is_unit(unit_name)
-        else:
-            unit_name = None
-            valid_unit_name = False
+        concept_name, value, kwargs, fact_args = self._get_record_args(
+            (concept_name, value, kwargs))
+        concept, table, key = self._get_concept_table(concept_name)
+        context = self._get_fact_context(concept, kwargs)
+        self._add_fact(concept, table, context, value, fact_args, None)
 
-        if "precision" in kwargs:
-            precision = kwargs.pop("precision")
-        else:
-            precision = None
+    def set_many(self, records):
+        """
+        Adds many facts to the document, as if set() was called for each
+        record in turn.  The records are first grouped by context, then the
+        context of each group is built, validated and stored once per table
+        and period type of the concepts using it, and each concept and unit
+        is checked once for all the records using them.  A record that
+        cannot be set does not stop the others from being set.
 
-        if "decimals" in kwargs:
-            decimals = kwargs.pop("decimals")
+        Args:
+          records: iterable of tuples
+            (concept_name, value[, kwargs[, unit_name[, more_kwargs]]]) where
+            kwargs is either a Context instance or a dict of the keyword args
+            accepted by set(), for instance {"context": ctx, "unit_name": "kWh"}
+            or {"entity": "ACME", "duration": "forever", "unit_name": "kWh"},
+            unit_name is None or the name of the unit, and more_kwargs is a
+            dict of keyword args of set() added to kwargs, for instance
+            {"decimals": 2}.
+        Returns:
+          list of (index, error) tuples, one for each record that was not set,
+          where index is the position of the record in records and error is
+          the OBError that set() would have raised for it, or an OBError if
+          the record does not have between 2 and 5 elements.  The list is
+          empty if every record was set.
+        """
+        errors = []
+        groups = {}
+        # The records are kept in parallel lists rather than a tuple each, so
+        # that grouping them adds no objects for the garbage collector to scan.
+        concept_names, values, record_groups, record_fact_args = [], [], [], []
+        for index, record in enumerate(records):
+            try:
+                concept_name, value, kwargs, fact_args = self._get_record_args(record)
+            except OBError as e:
+                errors.append((index, e))
+                concept_name = value = kwargs = fact_args = None
+            # A group is (kwargs, stored contexts), the contexts are keyed by
+            # the table and the period type of their concepts as the stored
+            # context only depends on both.  Records whose context cannot be
+            # hashed get a group of their own.
+            group = None
+            if kwargs is not None:
+                key = _context_args_key(kwargs)
+                group = groups.get(key) if key is not None else None
+                if group is None:
+                    group = (kwargs, {})
+                    if key is not None:
+                        groups[key] = group
+            concept_names.append(concept_name)
+            values.append(value)
+            record_groups.append(group)
+            record_fact_args.append(fact_args)
+
+        cache = {}
+        for index, (concept_name, value, group, fact_args) in enumerate(
+                zip(concept_names, values, record_groups, record_fact_args)):
+            if group is None:
+                continue
+            try:
+                concept, table, key = _cached(cache, ("concept", concept_name),
+                                              self._get_concept_table, concept_name)
+                kwargs, contexts = group
+                context = contexts.get(key)
+                if context is None:
+                    # The errors name the concept so they are cached per concept.
+                    context = _cached(contexts, (concept_name,) + key,
+                                      self._get_fact_context, concept, kwargs)
+                    contexts[key] = context
+                self._add_fact(concept, table, context, value, fact_args, cache)
+            except OBError as e:
+                errors.append((index, e))
+
+        errors.sort(key=lambda error: error[0])
+        return errors
+
+    @staticmethod
+    def _get_record_args(record):
+        """
+        Args:
+          record: tuple
+            a record of set_many().
+        Returns:
+          A tuple (concept_name, value, kwargs, fact_args) where kwargs is the
+          Context instance or the dict of keyword args giving the context of
+          the fact (the keys of _FACT_ARGS are ignored in it) and fact_args
+          is the tuple (unit_name, precision, decimals, fact_id).
+        Raises:
+          OBError if the record does not have between 2 and 5 elements.
+        """
+        if not 2 <= len(record) <= 5:
+            raise OBError(
+                "Record has {} elements, expected (concept_name, value[, kwargs[, unit_name[, "
+                "more_kwargs]]])".format(len(record)))
+        concept_name, value = record[0], record[1]
+        kwargs = record[2] if len(record) > 2 else {}
+        if isinstance(kwargs, Context):
+            fact_args = [None, None, None, None]
         else:
-            decimals = None
+            fact_args = [kwargs.get(name) for name in _FACT_ARGS]
+        if len(record) > 3:
+            if record[3] is not None:
+                fact_args[0] = record[3]
+            if len(record) > 4:
+                more_kwargs = record[4]
+                for i, name in enumerate(_FACT_ARGS):
+                    if name in more_kwargs:
+                        fact_args[i] = more_kwargs[name]
+                if any(name not in _FACT_ARGS for name in more_kwargs):
+                    kwargs = dict({"context": kwargs} if isinstance(kwargs, Context) else kwargs)
+                    kwargs.update(more_kwargs)
+        return concept_name, value, kwargs, tuple(fact_args)
+
+    def _get_fact_context(self, concept, kwargs):
+        """
+        Gets the context of a fact, see _store_fact_context().
+        Args:
+          concept: Concept instance
+          kwargs: Context instance or dict
+            context of the fact, see _get_record_args().
+        Returns:
+          The Context stored in the table of the concept.
+        Raises:
+          OBContextError if the context is not correct for the concept.
+        """
+        if isinstance(kwargs, Context):
+            return self._store_fact_context(concept, kwargs, {})
+        elif "context" in kwargs:
+            return self._store_fact_context(concept, kwargs["context"], {})
+        context_args = {k: v for k, v in kwargs.items() if k not in _FACT_ARGS}
+        return self._store_fact_context(concept, None, context_args)
 
-        if "fact_id" in kwargs:
-            fact_id = kwargs.pop("fact_id")
-        else:
-            fact_id = None
+    def _add_fact(self, concept, table, context, value, fact_args, cache):
+        """
+        Checks the unit and the value of a fact and adds it to the document.
+        Args:
+          concept: Concept instance
+          table: Hypercube instance
+            table of the concept.
+          context: Context instance
+            context of the fact, see _get_fact_context().
+          value: string, float, int, boolean, or date
+          fact_args: tuple
+            (unit_name, precision, decimals, fact_id) of the fact.
+          cache: dict or None
+            results of the checks already made by set_many(), None for set().
+        Raises:
+          OBUnitError, OBTypeError or OBError, as set().
+        """
+        concept_name = concept.name
+        unit_name, precision, decimals, fact_id = fact_args
+        if not self._dev_validation_off:
+            _cached(cache, ("unit", unit_name, concept_name),
+                    self._check_fact_unit, concept_name, unit_name)
+            _cached(cache, ("value", concept_name, type(value), _value_key(value)),
+                    self._check_fact_value, concept, value)
+        if self._fact_store is not None:
+            self._fact_store.add(table, concept_name, context, unit_name, value,
+                                 decimals=decimals, precision=precision, fact_id=fact_id)
+            return
+        fact = Fact(concept_name, context, unit_name, value,
+                    precision=precision, decimals=decimals, id=fact_id)
+        # self.facts is nested dict keyed first on table then on context ID
+        # and finally on concept:
+        table_facts = self.facts.get(table.get_name())
+        if table_facts is None:
+            table_facts = self.facts[table.get_name()] = {}
+        context_facts = table_facts.get(context.get_id())
+        if context_facts is None:
+            context_facts = table_facts[context.get_id()] = {}
+        context_facts[concept_name] = fact
 
+    def _get_concept_table(self, concept_name):
+        """
+        Returns:
+          A tuple (concept, table, key) of the Concept instance of the named
+          concept, its table and the key of the contexts it shares with the
+          other concepts, (table name, period type).
+        Raises:
+          OBConceptError if the concept is not writable in this document.
+        """
+        concept = self._get_writable_concept(concept_name)
+        table = self.get_table_for_concept(concept_name)
+        return concept, table, (table.get_name(), concept.get_details("period_type"))
+
+    def _get_writable_concept(self, concept_name):
+        """
+        Returns:
+          Concept instance of the named concept.
+        Raises:
+          OBConceptError if the concept is not writable in this document.
+        """
         if not self.is_concept_writable(concept_name):
             raise OBConceptError(
                 "{} is not a writeable concept".format(concept_name))
-        concept = self.get_concept(concept_name)
+        return self.get_concept(concept_name)
 
-        if "context" in kwargs:
-            context = kwargs.pop("context")
-        elif len(list(kwargs.keys())) > 0:
+    def _store_fact_context(self, concept, context, context_args):
+        """
+        Completes and validates the context of a fact and stores it in the
+        table of the concept.
+        Args:
+          concept: Concept instance
+          context: Context instance or None
+            context given to set(), if any.
+          context_args: dict
+            keyword args to construct the context from if none is given.
+        Returns:
+          The Context stored in the table.
+        Raises:
+          OBContextError if the context is not correct for the concept.
+        """
+        if context is None and len(context_args) > 0:
             # turn the remaining keyword args into a Context object -- this
             # is just syntactic sugar to make this method easier to call.
             # TODO this block will not work
+            context_args = dict(context_args)
             period = concept.get_details("period_type")
-            if period not in kwargs and period in self._default_context:
-                kwargs[period.value] = self._default_context[period]
-            context = Context(**kwargs)
-        else:
-            context = None
+            if period not in context_args and period in self._default_context:
+                context_args[period.value] = self._default_context[period]
+            context = Context(**context_args)
 
         # Use default values, if any have been set, to fill in missing fields of context:
         if len(self._default_context) > 0:
             context = self._fill_in_context_from_defaults(context, concept)
 
-        if not self._is_valid_context(concept_name, context):
+        if not self._is_valid_context(concept.name, context):
             raise OBContextError(
-                "Insufficient context for {}".format(concept_name))
+                "Insufficient context for {}".format(concept.name))
 
-        # Check unit type:
-        if not self._dev_validation_off and not  self._is_valid_unit(concept_name, unit_name):
+        if self._fact_store is not None:
+            # The fact store encodes the context in the row of the fact.
+            return context
+        table = self.get_table_for_concept(concept.name)
+        return table.store_context(context) # dedupes, assigns ID
+
+    def _check_fact_unit(self, concept_name, unit_name):
+        """
+        Raises:
+          OBUnitError if the unit is wrong for the concept.
+        """
+        if not self._is_valid_unit(concept_name, unit_name):
             raise OBUnitError(
                 "{} is not a valid unit name for {}".format(unit_name, concept_name))
 
-        # check datatype of given value against concept
-        if not self._dev_validation_off and not concept.validate_datatype(value):
+    def _check_fact_value(self, concept, value):
+        """
+        Raises:
+          OBTypeError if the value is the wrong type for the concept.
+        """
+        if not concept.validate_datatype(value):
             raise OBTypeError(
-                "{} is the wrong datatype for {}".format(value, concept_name))
-
-        table = self.get_table_for_concept(concept_name)
-        context = table.store_context(context) # dedupes, assigns ID
-
-        f = Fact(concept_name, context, unit_name, value,
-                 precision=precision,
-                 decimals=decimals,
-                 id=fact_id)
-
-        # self.facts is nested dict keyed first on table then on context ID
-        # and finally on concept:
-        if not table.get_name() in self.facts:
-            self.facts[table.get_name()] = {}
-        if not context.get_id() in self.facts[table.get_name()]:
-            self.facts[table.get_name()][context.get_id()] = {}
-        # TODO simplify above with defaultdict
-
-        self.facts[table.get_name()][context.get_id()][concept_name] = f
-        # Or: we could keep facts in a flat list, and get() could look them
-        # up by getting context from hypercube and getting fact from context
+                "{} is the wrong datatype for {}".format(value, concept.name))
 
     def get(self, concept_name, context=None):
         """
@@ -1388,11 +2037,15 @@ class OBInstance(object):
         # TODO a function that returns multiple, i.e. all facts for given
         # concept regardless of context, or vice versa.
         table = self.get_table_for_concept(concept_name)
+        if self._fact_store is not None:
+            return self._fact_store.get(table, concept_name, context)
         context = table.lookup_context(context)
         if table.get_name() in self.facts:
             if context.get_id() in self.facts[table.get_name()]:
                 if concept_name in self.facts[table.get_name()][context.get_id()]:
-                    return self.facts[table.get_name()][context.get_id()][concept_name]
+                    fact = self.facts[table.get_name()][context.get_id()][concept_name]
+                    self._allocate_fact_id(fact)
+                    return fact
         return None
 
     def get_all_facts(self):
@@ -1401,13 +2054,28 @@ class OBInstance(object):
             a list of Fact. All facts are returned in a single list, regardless
             of which table or context they belong to.
         """
+        if self._fact_store is not None:
+            return [fact for table_name in self._fact_store.get_table_names()
+                    for fact in self._fact_store.get_facts(self._tables[table_name])]
+
         all_facts = []
         for table_dict in list(self.facts.values()):
             for context_dict in list(table_dict.values()):
                 for fact in list(context_dict.values()):
+                    self._allocate_fact_id(fact)
                     all_facts.append(fact)
         return all_facts
 
+    def _allocate_fact_id(self, fact):
+        """
+        Gives a fact set without a fact_id the ID allocated by the ID
+        allocator of this document (see the constructor).
+        Args:
+          fact: Fact instance
+        """
+        if fact._id is None:
+            fact.id = self._id_allocator.allocate(fact.concept_name, fact.context)
+
     def _make_unit_tag(self, unit_id):
         """
         Args:
@@ -1443,19 +2111,45 @@ class OBInstance(object):
                                     "xlink:type": "simple"})
 
         # Add a context tag for each context we want to reference:
-        for hypercube in list(self._tables.values()):
-            tags = hypercube._toXML()
+        table_contexts = []
+        for table_name in self.get_table_names():
+            if table_name not in self._tables:
+                # Tables that were never used have no contexts.
+                continue
+            table = self._tables[table_name]
+            if self._fact_store is None:
+                tags = table._toXML()
+            else:
+                # Decode the contexts once for their tags and their facts.
+                contexts = self._fact_store.get_contexts(table)
+                tags = [context._toXML() for context in contexts]
+                table_contexts.append((table, contexts))
             for tag in tags:
                 xbrl.append(tag)
 
-        facts = self.get_all_facts()
-        required_units = set([fact.unit for fact in self.get_all_facts() \
-                              if fact.unit is not None])
+        if self._fact_store is not None:
+            required_units = set()
+            for table, contexts in table_contexts:
+                required_units.update(self._fact_store.get_units(table))
+        else:
+            facts = self.get_all_facts()
+            required_units = set([fact.unit for fact in facts \
+                                  if fact.unit is not None])
         for unit in required_units:
             # Add a unit tag defining each unit we want to reference:
             xbrl.append(self._make_unit_tag(unit))
 
-        for fact in self.get_all_facts():
+        if self._fact_store is not None:
+            # The facts are written straight from the columns of the store.
+            for table, contexts in table_contexts:
+                context_ids = [context.get_id() for context in contexts]
+                for number, concept_name, unit, value, decimals, precision, fact_id \
+                        in self._fact_store.iter_facts(table, contexts):
+                    xbrl.append(_fact_to_XML(concept_name, context_ids[number], fact_id,
+                                             unit, value, decimals, precision))
+            return xbrl
+
+        for fact in facts:
             xbrl.append( fact._toXML() )
 
         return xbrl
@@ -1529,6 +2223,19 @@ class OBInstance(object):
             "href": self.taxonomy_name
         })
 
+        if self._fact_store is not None:
+            # The facts are written straight from the columns of the store,
+            # with the aspects of each context made once.
+            for table_name in self._fact_store.get_table_names():
+                table = self._tables[table_name]
+                contexts = self._fact_store.get_contexts(table)
+                aspects = [context._toJSON() for context in contexts]
+                for number, concept_name, unit, value, decimals, precision, fact_id \
+                        in self._fact_store.iter_facts(table, contexts):
+                    masterJsonObj["facts"][fact_id] = _fact_to_JSON(
+                        dict(aspects[number]), concept_name, unit, value, decimals, precision)
+            return json.dumps(masterJsonObj)
+
         facts = self.get_all_facts()
 
         for fact in facts:
@@ -1613,22 +2320,216 @@ class OBInstance(object):
                     context.axes[axis_name] = self._default_context[axis_name]
         return context
 
-    def is_valid(self):
+    def validate(self, tables=None, executor=None):
         """
-        (Placeholder).
+        Validates the whole document: checks, in a single pass over the facts
+        of each table, that the facts are valid (see is_valid) and that no
+        required fact is missing (see is_complete).  The concepts, contexts,
+        units and values shared by several facts are only checked once.
+        Args:
+          tables: list of strings or None
+            names of the tables to validate, or UNTABLE for the facts which
+            are not in a table.  By default every table holding facts and
+            UNTABLE.  Tables are validated independently of each other, so a
+            large document can be validated in shards of tables.
+          executor: concurrent.futures.Executor or None
+            executor running the validation of each table, for instance a
+            concurrent.futures.ThreadPoolExecutor.  By default the tables are
+            validated in turn.
+        Returns:
+          OBValidationErrors holding the errors found, empty if there are none.
+          The errors of the facts are the OBConceptError, OBContextError,
+          OBUnitError or OBTypeError that set() would raise for them, prefixed
+          by the concept and context of the fact.  The context, unit and value
+          of a fact are checked independently so a fact can have several
+          errors.  Missing facts are OBValidationErrors.
+        Raises:
+          OBNotFoundError if a table is not a table of the entrypoint.
+        """
+        return self._validate(tables, executor, True, True)
 
+    def is_valid(self, tables=None, executor=None):
+        """
+        Args:
+          tables, executor: see validate().
         Returns: true if all of the facts in the document validate.
           i.e. they have allowed data types, allowed units, anything that needs
           to be in a table has all the required axis values to identify its place
-          in that table, etc.
+          in that table, etc.  Facts are validated even if dev_validation_off
+          was set.
         """
-        return True
+        return not self._validate(tables, executor, True, False).get_errors()
 
-    def is_complete(self):
+    def is_complete(self, tables=None, executor=None):
         """
-        (Placeholder).
-
+        Args:
+          tables, executor: see validate().
         Returns: True if no required facts are missing, i.e. if
-          there is a value for all concepts with nillable=False
+          there is a value for all concepts with nillable=False: each such
+          concept which is not in a table has a fact, and each context of a
+          table has a fact for each such concept of the table.
         """
-        return True
+        return not self._validate(tables, executor, False, True).get_errors()
+
+    def _validate(self, tables, executor, valid, complete):
+        """
+        Implements validate(), is_valid() and is_complete().
+        Args:
+          tables, executor: see validate().
+          valid: boolean
+            True to check that the facts are valid.
+          complete: boolean
+            True to check that no required fact is missing.
+        Returns:
+          OBValidationErrors holding the errors found.
+        """
+        if tables is None:
+            if self._fact_store is not None:
+                tables = self._fact_store.get_table_names()
+            else:
+                tables = list(self.facts.keys())
+            if UNTABLE not in tables:
+                tables.append(UNTABLE)
+        for table_name in tables:
+            if table_name != UNTABLE and not self._template.has_table(table_name):
+                raise OBNotFoundError(
+                    "There is no table named {} in {}.".format(table_name, self.entrypoint_name))
+
+        validate_table = functools.partial(self._validate_table, valid=valid, complete=complete)
+        if executor is None:
+            results = map(validate_table, tables)
+        else:
+            results = executor.map(validate_table, tables)
+        validation_errors = OBValidationErrors("Error(s) found in document")
+        for table_errors in results:
+            for error in table_errors:
+                validation_errors.append(error)
+        return validation_errors
+
+    def _validate_table(self, table_name, valid, complete):
+        """
+        Validates the facts of a table, see _validate().
+        Returns:
+          list of the OBErrors found.
+        """
+        errors = []
+        # cache holds the results of the checks like in set_many(), and
+        # valid_contexts the (context ID, period type) of the contexts which
+        # are known to be valid.
+        cache = {}
+        valid_contexts = set()
+        # Each context ID maps to the context and the names of the concepts
+        # having a value in it.
+        context_concepts = {}
+        for fact in self._get_table_facts(table_name):
+            context_id = fact.context.get_id()
+            if complete and fact.value is not None:
+                if context_id not in context_concepts:
+                    context_concepts[context_id] = (fact.context, set())
+                context_concepts[context_id][1].add(fact.concept_name)
+            if valid:
+                for e in self._check_fact(fact, context_id, cache, valid_contexts):
+                    errors.append(type(e)("{} in context {}: {}".format(
+                        fact.concept_name, context_id, e)))
+        if complete:
+            errors += self._find_missing_facts(table_name, context_concepts)
+        return errors
+
+    def _get_table_facts(self, table_name):
+        """
+        Returns:
+          An iterable of the Facts of a table.
+        """
+        if self._fact_store is not None:
+            if table_name not in self._fact_store.get_table_names():
+                return []
+            return self._fact_store.get_facts(self._tables[table_name])
+        return (fact for context_facts in self.facts.get(table_name, {}).values()
+                for fact in context_facts.values())
+
+    def _check_fact(self, fact, context_id, cache, valid_contexts):
+        """
+        Checks a fact like set() does, except that the context, the unit and
+        the value are checked independently of each other.
+        Args:
+          fact: Fact instance
+          context_id: string
+            ID of the context of the fact.
+          cache: dict
+            results of the checks of the previous facts of the table.
+          valid_contexts: set
+            (context ID, period type) of the contexts known to be valid.
+        Returns:
+          list of the OBErrors that set() would raise for the fact, the error
+          of the concept only if the concept cannot be written.
+        """
+        concept_name = fact.concept_name
+        try:
+            concept = _cached(cache, ("concept", concept_name),
+                              self._get_writable_concept, concept_name)
+        except OBError as e:
+            return [e]
+
+        errors = []
+        # The validity of a context only depends on the period type of the
+        # concept, the errors name the concept so they are cached per concept.
+        period_type = concept.get_details("period_type")
+        if (context_id, period_type) not in valid_contexts:
+            try:
+                _cached(cache, ("context", concept_name, context_id),
+                        self._is_valid_context, concept_name, fact.context)
+                valid_contexts.add((context_id, period_type))
+            except OBError as e:
+                errors.append(e)
+
+        try:
+            _cached(cache, ("unit", fact.unit, concept_name),
+                    self._check_fact_unit, concept_name, fact.unit)
+        except OBError as e:
+            errors.append(e)
+        try:
+            _cached(cache, ("value", concept_name, type(fact.value), _value_key(fact.value)),
+                    self._check_fact_value, concept, fact.value)
+        except OBError as e:
+            errors.append(e)
+        return errors
+
+    def _find_missing_facts(self, table_name, context_concepts):
+        """
+        Args:
+          table_name: string
+            name of a table or UNTABLE
+          context_concepts: dict
+            context and names of the concepts having a value in it, for each
+            context ID of the table.
+        Returns:
+          list of an OBValidationError for each missing fact of the concepts
+          with nillable=False.  A concept of a table is required in each
+          context of the table with the period type of the concept.
+        """
+        required = [self.get_concept(concept_name)
+                    for concept_name in self._template.get_table_concepts(table_name)
+                    if self.is_concept_writable(concept_name) and
+                    self.get_concept(concept_name).get_details("nillable") is False]
+        errors = []
+        if table_name == UNTABLE:
+            found = set()
+            for context, concepts in context_concepts.values():
+                found |= concepts
+            for concept in required:
+                if concept.name not in found:
+                    errors.append(OBValidationError(
+                        "Missing fact of required concept {}".format(concept.name)))
+            return errors
+        for context_id, (context, concepts) in context_concepts.items():
+            if context.instant is not None:
+                period_type = taxonomy.PeriodType.instant
+            else:
+                period_type = taxonomy.PeriodType.duration
+            for concept in required:
+                if concept.name not in concepts and \
+                        taxonomy.PeriodType(concept.get_details("period_type")) == period_type:
+                    errors.append(OBValidationError(
+                        "Missing fact of required concept {} in context {}".format(
+                            concept.name, context_id)))
+        return errors
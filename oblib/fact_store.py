@@ -0,0 +1,595 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handles the columnar storage of the facts of an OBInstance.
+
+An OBInstance normally keeps each fact as a Fact object referring to a Context object.  For time series,
+such as 15 minute interval readings, this means several Python objects per reading.  A ColumnarFactStore
+instead keeps the distinct contexts of each table in a NumPy array, one row per context holding the period
+and the entity and axis values (as codes), and the facts of each table and concept in NumPy arrays of the
+values and of the unit, decimals and precision (as a code into a side table).  Context and Fact objects are
+only created when the facts are read or exported.
+
+NumPy is an optional dependency of oblib, it is required by ColumnarFactStore only:
+::
+    pip install oblib[columnar]
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax, columnar=True)
+::
+"""
+
+import datetime
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+from oblib import identifier
+from oblib.ob import OBError, OBContextError
+
+
+# Codes of the period of a context, in the first column of the context rows.
+_INSTANT = 0
+_DURATION = 1
+_FOREVER = 2
+
+# Flags of the third column of the context rows, set if the start (or instant)
+# and the end of the period are dates rather than datetimes.
+_START_IS_DATE = 1
+_END_IS_DATE = 2
+
+# Number of columns of the context rows before the axis columns: period, start
+# (or instant), end, date flags and entity.
+_FIXED_COLUMNS = 5
+
+# Code of a missing entity or axis value and of a missing start or end.
+_MISSING = -1
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+_MICROSECOND = datetime.timedelta(microseconds=1)
+
+_INITIAL_CAPACITY = 16
+
+
+def _encode_time(value, name):
+    """
+    Args:
+      value: datetime or date
+      name: string
+        name of the field holding the value, for errors.
+    Returns:
+      A tuple of the number of microseconds since 1970-01-01 and True if the
+      value is a date.
+    Raises:
+      OBContextError if the value is not a date or a naive datetime.
+    """
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is not None:
+            raise OBContextError(
+                "{} {} has a time zone, it cannot be stored in a columnar OBInstance".format(name, value))
+        return (value - _EPOCH) // _MICROSECOND, False
+    elif isinstance(value, datetime.date):
+        return (datetime.datetime(value.year, value.month, value.day) - _EPOCH) // _MICROSECOND, True
+    raise OBContextError(
+        "{} {} is not a date, it cannot be stored in a columnar OBInstance".format(name, value))
+
+
+def _decode_time(microseconds, is_date):
+    """
+    Returns:
+      The datetime or date encoded by _encode_time.
+    """
+    value = _EPOCH + datetime.timedelta(microseconds=int(microseconds))
+    if is_date:
+        return value.date()
+    return value
+
+
+class _Column(object):
+    """
+    A NumPy array which grows as rows are appended to it.
+    """
+
+    def __init__(self, dtype, width=None):
+        """
+        Args:
+          dtype: NumPy dtype of the values.
+          width: int or None
+            number of values of each row, None for a column of single values.
+        """
+        shape = _INITIAL_CAPACITY if width is None else (_INITIAL_CAPACITY, width)
+        self._array = numpy.empty(shape, dtype=dtype)
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    @property
+    def dtype(self):
+        return self._array.dtype
+
+    def append(self, value):
+        """
+        Appends a value (or a row of values) at the end of the column.
+        """
+        if self._size == len(self._array):
+            self._array = numpy.concatenate([self._array, numpy.empty_like(self._array)])
+        self._array[self._size] = value
+        self._size += 1
+
+    def set(self, row, value):
+        """
+        Replaces the value (or the row of values) of a row of the column.
+        """
+        self._array[row] = value
+
+    def astype(self, dtype):
+        """
+        Converts the values of the column to another dtype.
+        """
+        self._array = self._array.astype(dtype)
+
+    def values(self):
+        """
+        Returns:
+          A NumPy array view of the values of the column.
+        """
+        return self._array[:self._size]
+
+
+class _ColumnGroup(object):
+    """
+    The facts of one concept within one table, in the order they were added.
+    """
+
+    def __init__(self, concept_name):
+        """
+        Args:
+          concept_name: string
+        """
+        self.concept_name = concept_name
+        # The values start in a typed column, which is converted to an object
+        # column when a value of another type is added.
+        self.values = None
+        self.attributes = _Column(numpy.int32)
+        # self._rows maps each context number of the table to the row of the
+        # current fact of the concept in that context, _MISSING if there is
+        # none.
+        self._rows = numpy.full(_INITIAL_CAPACITY, _MISSING, dtype=numpy.int64)
+        # Fact IDs given to set() or generated when the fact was first read,
+        # keyed by row.
+        self.fact_ids = {}
+
+    def append(self, context_number, value, attributes_code, fact_id):
+        """
+        Appends a fact, or overwrites the row of the current fact of the
+        concept in the context if there is one.
+        """
+        if self.values is None:
+            self.values = _Column(self._get_dtype(value))
+        elif self.values.dtype != object and self._get_dtype(value) != self.values.dtype:
+            self.values.astype(object)
+        if self.values.dtype == numpy.int64 and not -2**63 <= value < 2**63:
+            self.values.astype(object)
+        while context_number >= len(self._rows):
+            self._rows = numpy.concatenate([self._rows, numpy.full_like(self._rows, _MISSING)])
+        row = int(self._rows[context_number])
+        if row == _MISSING:
+            row = len(self.attributes)
+            self.values.append(value)
+            self.attributes.append(attributes_code)
+            self._rows[context_number] = row
+        else:
+            self.values.set(row, value)
+            self.attributes.set(row, attributes_code)
+        if fact_id is not None:
+            self.fact_ids[row] = fact_id
+        else:
+            # The ID of the replaced fact is not reused.
+            self.fact_ids.pop(row, None)
+
+    def get_row(self, context_number):
+        """
+        Returns:
+          The row of the current fact of the concept in a context, None if
+          there is none.
+        """
+        if context_number >= len(self._rows) or self._rows[context_number] == _MISSING:
+            return None
+        return int(self._rows[context_number])
+
+    def get_rows(self):
+        """
+        Returns:
+          A tuple (NumPy array, NumPy array) of the context numbers having a
+          fact of the concept, in increasing order, and of the rows of those
+          facts.
+        """
+        numbers = numpy.flatnonzero(self._rows != _MISSING)
+        return numbers, self._rows[numbers]
+
+    @staticmethod
+    def _get_dtype(value):
+        """
+        Returns:
+          The NumPy dtype able to hold the value and give it back unchanged.
+        """
+        if type(value) is bool:
+            return numpy.dtype(bool)
+        elif type(value) is int:
+            return numpy.dtype(numpy.int64)
+        elif type(value) is float:
+            return numpy.dtype(numpy.float64)
+        return numpy.dtype(object)
+
+    def get_fact_id(self, row, id_allocator, context):
+        """
+        Args:
+          row: int
+          id_allocator: allocator of the IDs (see identifier.get_id_allocator)
+          context: Context instance
+            context of the fact.
+        Returns:
+          The ID of the fact of a row, allocated the first time it is needed.
+        """
+        if row not in self.fact_ids:
+            self.fact_ids[row] = id_allocator.allocate(self.concept_name, context)
+        return self.fact_ids[row]
+
+
+class _TableIndex(object):
+    """
+    The distinct contexts of a table, numbered in the order in which they were
+    first used, as Hypercube.store_context does.
+    """
+
+    def __init__(self, width):
+        """
+        Args:
+          width: int
+            number of columns of the context rows (see ColumnarFactStore).
+        """
+        self.contexts = _Column(numpy.int64, width)
+        # self._numbers maps the bytes of each context row to its number.
+        self._numbers = {}
+
+    @staticmethod
+    def _get_key(context_row):
+        return numpy.array(context_row, dtype=numpy.int64).tobytes()
+
+    def find_context(self, context_row):
+        """
+        Returns:
+          The number of the context, None if the table has no such context.
+        """
+        return self._numbers.get(self._get_key(context_row))
+
+    def store_context(self, context_row):
+        """
+        Returns:
+          The number of the context, assigned the first time it is stored.
+        """
+        key = self._get_key(context_row)
+        number = self._numbers.get(key)
+        if number is None:
+            number = len(self.contexts)
+            self._numbers[key] = number
+            self.contexts.append(context_row)
+        return number
+
+
+class ColumnarFactStore(object):
+    """
+    Stores the facts of an OBInstance in NumPy arrays.  Each distinct context
+    of a table is stored once as a row of integers: the period code, the start
+    (or the instant) and the end in microseconds since 1970-01-01, flags
+    telling whether the start and end were dates, the entity code and a code
+    for the value of each axis of the table.  Entities, axis values and the
+    units, decimals and precision of the facts are stored once each, in side
+    tables.  Facts are found by context number and concept in constant time.
+    """
+
+    def __init__(self, id_allocator=None):
+        """
+        Constructs an empty ColumnarFactStore.
+        Args:
+          id_allocator: allocator of the IDs of the facts added without an ID
+            (see identifier.get_id_allocator), random UUIDs by default.
+        Raises:
+          ImportError if NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError(
+                "NumPy is required to store facts in columns, install it with: pip install oblib[columnar]")
+        # self._groups maps each table name to a dict from concept name to
+        # _ColumnGroup, in the order the tables and concepts were first used.
+        # The indexes are kept up to date as facts are added.
+        self._id_allocator = id_allocator or identifier.RandomIdAllocator()
+        self._groups = {}
+        self._axes = {}
+        self._indexes = {}
+        self._codes = {}
+        self._values = []
+        self._attributes = {}
+        self._attribute_values = []
+
+    def _get_code(self, value):
+        """
+        Returns:
+          The code of an entity or axis value, assigned the first time the
+          value is stored.
+        """
+        # The type is part of the key so that 1 and True get different codes.
+        key = (type(value), value)
+        try:
+            return self._codes[key]
+        except KeyError:
+            self._codes[key] = len(self._values)
+            self._values.append(value)
+            return self._codes[key]
+        except TypeError:
+            raise OBContextError(
+                "{} cannot be hashed, it cannot be stored in a columnar OBInstance".format(value))
+
+    def _encode_context(self, table, context, store=True):
+        """
+        Args:
+          table: Hypercube instance
+            table of the context.
+          context: Context instance
+          store: boolean
+            False to look up the codes of the entity and axis values without
+            assigning new ones.
+        Returns:
+          A list of integers, the row encoding the context, or None if store
+          is False and a value of the context was never stored.
+        """
+        if context.duration == "forever":
+            row = [_FOREVER, _MISSING, _MISSING, 0]
+        elif context.duration is not None:
+            start, start_is_date = _encode_time(context.duration["start"], "Duration start")
+            end, end_is_date = _encode_time(context.duration["end"], "Duration end")
+            row = [_DURATION, start, end,
+                   (_START_IS_DATE if start_is_date else 0) | (_END_IS_DATE if end_is_date else 0)]
+        else:
+            instant, is_date = _encode_time(context.instant, "Instant")
+            row = [_INSTANT, instant, _MISSING, _START_IS_DATE if is_date else 0]
+
+        values = [context.entity] + [context.axes.get(axis_name) for axis_name in self._axes[table.get_name()]]
+        for value in values:
+            if value is None:
+                row.append(_MISSING)
+            elif store:
+                row.append(self._get_code(value))
+            else:
+                try:
+                    row.append(self._codes[(type(value), value)])
+                except (KeyError, TypeError):
+                    return None
+        return row
+
+    def _decode_context(self, table, context_row, number):
+        """
+        Returns:
+          A Context instance with the fields encoded in context_row and the ID
+          of the context number within the table.
+        """
+        from oblib.data_model import Context
+
+        kwargs = {}
+        period, start, end, flags = [int(value) for value in context_row[:_FIXED_COLUMNS - 1]]
+        if period == _FOREVER:
+            kwargs["duration"] = "forever"
+        elif period == _DURATION:
+            kwargs["duration"] = {"start": _decode_time(start, flags & _START_IS_DATE),
+                                  "end": _decode_time(end, flags & _END_IS_DATE)}
+        else:
+            kwargs["instant"] = _decode_time(start, flags & _START_IS_DATE)
+        codes = [int(code) for code in context_row[_FIXED_COLUMNS - 1:]]
+        if codes[0] != _MISSING:
+            kwargs["entity"] = self._values[codes[0]]
+        for axis_name, code in zip(self._axes[table.get_name()], codes[1:]):
+            if code != _MISSING:
+                kwargs[axis_name] = self._values[code]
+        context = Context(**kwargs)
+        context.set_id(table, "%s_%d" % (table.get_name(), number))
+        return context
+
+    def _make_fact(self, group, row, context):
+        """
+        Args:
+          group: _ColumnGroup
+          row: int
+            row of the fact within the group.
+          context: Context instance
+            context of the fact.
+        Returns:
+          A Fact instance for a row of a column group.
+        """
+        from oblib.data_model import Fact
+
+        # tolist() converts the NumPy values to Python bool, int and float.
+        value = group.values.values()[row:row + 1].tolist()[0]
+        unit, decimals, precision = self._attribute_values[int(group.attributes.values()[row])]
+        return Fact(group.concept_name, context, unit, value,
+                    decimals=decimals, precision=precision,
+                    id=group.get_fact_id(row, self._id_allocator, context))
+
+    def add(self, table, concept_name, context, unit, value, decimals=None, precision=None, fact_id=None):
+        """
+        Adds a fact to the store.  If a fact was already added for the concept
+        and the context, it is replaced.
+        Args:
+          table: Hypercube instance
+            the table where the concept belongs.
+          concept_name: string
+          context: Context instance
+            validated context of the fact, it is not kept.
+          unit: string or None
+          value: value of the fact
+          decimals: integer or None
+          precision: integer or None
+          fact_id: string or None
+            ID of the fact, allocated when the fact is first read if None.
+        Raises:
+          OBError if both decimals and precision are given.
+          OBContextError if the context has a field which cannot be stored in
+          columns, such as a datetime with a time zone.
+        """
+        if decimals is not None and precision is not None:
+            raise OBError("Fact given both precision and decimals - use only one.")
+        table_name = table.get_name()
+        if table_name not in self._groups:
+            self._groups[table_name] = {}
+            self._axes[table_name] = sorted(table.get_axes())
+            self._indexes[table_name] = _TableIndex(_FIXED_COLUMNS + len(self._axes[table_name]))
+        number = self._indexes[table_name].store_context(self._encode_context(table, context))
+
+        groups = self._groups[table_name]
+        if concept_name not in groups:
+            groups[concept_name] = _ColumnGroup(concept_name)
+        attributes = (unit, decimals, precision)
+        if attributes not in self._attributes:
+            self._attributes[attributes] = len(self._attribute_values)
+            self._attribute_values.append(attributes)
+        groups[concept_name].append(number, value, self._attributes[attributes], fact_id)
+
+    def get(self, table, concept_name, context):
+        """
+        Args:
+          table: Hypercube instance
+            the table where the concept belongs.
+          concept_name: string
+          context: Context instance
+        Returns:
+          The Fact stored for the concept and the context, None if there is
+          none.
+        """
+        table_name = table.get_name()
+        group = self._groups.get(table_name, {}).get(concept_name)
+        if group is None:
+            return None
+        context_row = self._encode_context(table, context, store=False)
+        if context_row is None:
+            return None
+        index = self._indexes[table_name]
+        number = index.find_context(context_row)
+        if number is None:
+            return None
+        row = group.get_row(number)
+        if row is None:
+            return None
+        return self._make_fact(group, row, self._decode_context(table, index.contexts.values()[number], number))
+
+    def get_table_names(self):
+        """
+        Returns:
+          A list of the names of the tables having facts, in the order they
+          were first used.
+        """
+        return list(self._groups.keys())
+
+    def get_contexts(self, table):
+        """
+        Args:
+          table: Hypercube instance
+        Returns:
+          A list of the distinct Context instances of the facts of the table,
+          with their IDs, in the order they were first used.
+        """
+        if table.get_name() not in self._groups:
+            return []
+        return [self._decode_context(table, context_row, number)
+                for number, context_row in enumerate(self._indexes[table.get_name()].contexts.values())]
+
+    def get_facts(self, table, contexts=None):
+        """
+        Args:
+          table: Hypercube instance
+          contexts: list of Context instances or None
+            the result of get_contexts(table), if it was already called.
+        Returns:
+          A list of the Facts of the table, ordered by context and then by
+          concept.
+        """
+        from oblib.data_model import Fact
+
+        if contexts is None:
+            contexts = self.get_contexts(table)
+        return [Fact(concept_name, contexts[number], unit, value,
+                     decimals=decimals, precision=precision, id=fact_id)
+                for number, concept_name, unit, value, decimals, precision, fact_id
+                in self.iter_facts(table, contexts)]
+
+    def iter_facts(self, table, contexts):
+        """
+        Reads the facts of a table straight from the columns, without creating
+        Fact instances, to export them.
+        Args:
+          table: Hypercube instance
+          contexts: list of Context instances
+            the result of get_contexts(table).
+        Yields:
+          A tuple (context number, concept name, unit, value, decimals,
+          precision, fact ID) for each fact of the table, ordered by context
+          and then by concept.
+        """
+        if table.get_name() not in self._groups:
+            return
+        groups = list(self._groups[table.get_name()].values())
+        numbers, group_index, rows = [], [], []
+        for group_number, group in enumerate(groups):
+            group_numbers, group_rows = group.get_rows()
+            numbers.append(group_numbers)
+            group_index.append(numpy.full(len(group_numbers), group_number, dtype=numpy.int64))
+            rows.append(group_rows)
+        numbers = numpy.concatenate(numbers)
+        group_index = numpy.concatenate(group_index)
+        rows = numpy.concatenate(rows)
+        order = numpy.lexsort((group_index, numbers))
+        # tolist() converts the NumPy values to Python bool, int and float.
+        values = [group.values.values().tolist() for group in groups]
+        attributes = [group.attributes.values().tolist() for group in groups]
+        attribute_values = self._attribute_values
+        for number, group_number, row in zip(numbers[order].tolist(),
+                                             group_index[order].tolist(),
+                                             rows[order].tolist()):
+            group = groups[group_number]
+            unit, decimals, precision = attribute_values[attributes[group_number][row]]
+            yield (number, group.concept_name, unit, values[group_number][row], decimals, precision,
+                   group.get_fact_id(row, self._id_allocator, contexts[number]))
+
+    def get_units(self, table):
+        """
+        Args:
+          table: Hypercube instance
+        Returns:
+          A set of the units of the facts of the table, None excluded.
+        """
+        units = set()
+        for group in self._groups.get(table.get_name(), {}).values():
+            # Each row of a group holds a current fact, replaced facts are
+            # overwritten.
+            for code in numpy.unique(group.attributes.values()).tolist():
+                units.add(self._attribute_values[code][0])
+        units.discard(None)
+        return units
+
+    def get_concept_names(self):
+        """
+        Returns:
+          A set of the names of the concepts having facts.
+        """
+        return set(concept_name for groups in self._groups.values() for concept_name in groups)
@@ -14,11 +14,18 @@
 
 """Handles Orange Button identifiers."""
 
+import itertools
 import re
 import uuid
 
 REG_EX = "^[0-9a-f]{8}-[0-9a-f]{4}-[1-5][0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$"
 
+# Namespace of the fact IDs generated by DeterministicIdAllocator.
+FACT_ID_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "https://github.com/SunSpecOrangeButton/pyoblib/fact")
+
+# Mask of the last group of a UUID, which SequentialIdAllocator increments.
+_NODE_MASK = 0xffffffffffff
+
 
 def identifier():
     """
@@ -42,3 +49,141 @@ def validate(inp):
         True if the input string is a valid UUID, False otherwise.
     """
     return re.search(REG_EX, inp, re.IGNORECASE) is not None
+
+
+class RandomIdAllocator(object):
+    """
+    Allocates a random UUID (version 4) to each fact, see identifier().
+    """
+
+    def allocate(self, concept_name, context):
+        """
+        Args:
+            concept_name (string): Name of the concept of the fact.
+            context (Context): Context of the fact.
+
+        Returns:
+            A string containing a valid UUID.
+        """
+        return identifier()
+
+
+class SequentialIdAllocator(object):
+    """
+    Allocates consecutive UUIDs to the facts: the IDs only differ by their last
+    group, which is incremented for each fact.  This is much cheaper than
+    generating a random UUID for each fact.
+    """
+
+    def __init__(self, start=None):
+        """
+        Args:
+            start (string): Optional, a valid UUID which is allocated first.  A
+                random UUID is used by default.
+
+        Raises:
+            ValueError if start is not a valid UUID.
+        """
+        if start is None:
+            start = identifier()
+        elif not validate(start):
+            raise ValueError("{} is not a valid UUID".format(start))
+        start = start.lower()
+        self._prefix = start[:24]
+        self._counter = itertools.count(int(start[24:], 16))
+
+    def allocate(self, concept_name, context):
+        """
+        Args:
+            concept_name (string): Name of the concept of the fact.
+            context (Context): Context of the fact.
+
+        Returns:
+            A string containing a valid UUID.
+        """
+        return "%s%012x" % (self._prefix, next(self._counter) & _NODE_MASK)
+
+
+class DeterministicIdAllocator(object):
+    """
+    Allocates to each fact the UUID version 5 of its concept name and its
+    context fields (entity, period and axes) within a namespace, so that
+    exporting the same facts always gives the same IDs.
+    """
+
+    def __init__(self, namespace=FACT_ID_NAMESPACE):
+        """
+        Args:
+            namespace (uuid.UUID): Optional, namespace of the UUIDs, for
+                instance one per document source.  FACT_ID_NAMESPACE by default.
+        """
+        self._namespace = namespace
+
+    def allocate(self, concept_name, context):
+        """
+        Args:
+            concept_name (string): Name of the concept of the fact.
+            context (Context): Context of the fact.
+
+        Returns:
+            A string containing a valid UUID.
+        """
+        return str(uuid.uuid5(self._namespace, _fact_name(concept_name, context)))
+
+
+def _format_value(value):
+    """
+    Returns:
+        The type name and ISO format of a date or datetime, the repr of any
+        other value, so that values of different types such as 1 and "1" or
+        None and "None" give different strings.
+    """
+    if hasattr(value, "isoformat"):
+        return "{}({})".format(type(value).__name__, value.isoformat())
+    return repr(value)
+
+
+def _fact_name(concept_name, context):
+    """
+    Returns:
+        A string made of the concept name and the context fields, which does
+        not depend on the order the axes were given in.
+    """
+    if context.duration == "forever":
+        period = "forever"
+    elif context.duration is not None:
+        period = "{}/{}".format(_format_value(context.duration["start"]),
+                                _format_value(context.duration["end"]))
+    else:
+        period = _format_value(context.instant)
+    parts = [concept_name, "entity={}".format(_format_value(context.entity)), "period={}".format(period)]
+    for axis_name in sorted(context.axes):
+        parts.append("{}={}".format(axis_name, _format_value(context.axes[axis_name])))
+    return "\n".join(parts)
+
+
+# The fact ID allocators by mode, see get_id_allocator.
+ID_ALLOCATORS = {
+    "random": RandomIdAllocator,
+    "sequential": SequentialIdAllocator,
+    "deterministic": DeterministicIdAllocator
+}
+
+
+def get_id_allocator(mode):
+    """
+    Return a new fact ID allocator.
+
+    Args:
+        mode (string): "random", "sequential" or "deterministic".
+
+    Returns:
+        A RandomIdAllocator, SequentialIdAllocator or DeterministicIdAllocator.
+
+    Raises:
+        ValueError if the mode is unknown.
+    """
+    if mode not in ID_ALLOCATORS:
+        raise ValueError("Unknown fact ID allocator {}, use one of {}".format(
+            mode, ", ".join(sorted(ID_ALLOCATORS))))
+    return ID_ALLOCATORS[mode]()
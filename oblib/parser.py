@@ -64,53 +64,25 @@ class Parser(object):
             doc_concepts (list of strings): A list of all concepts in the input JSON/XML document.
 
         Returns:
-            A string contianing the name of the correct entrypoint.
-        TODO: This is algorithm is fairly slow since it loops through all entry points which is time
-        consuming for a small number of input concepts.  With this said there is not currently enough
-        support functions in Taxonomy to accomodate other algorithms.  It may be better to move this
-        into taxonomy_semantic and simultaneously improve the speed.
+            A string contianing the name of the correct entrypoint.  If a single entrypoint contains any
+            of the concepts it is returned, otherwise the one and only entrypoint that contains all of them.
         """ 
 
-        entrypoints_found = set()
-        for entrypoint in self._taxonomy.semantic.get_all_entrypoints():
-            if entrypoint == "All":
-                # Ignore the "All" entrypoint, which matches everything -- we're
-                # looking for a more specific one.
-                continue
-            for concept in self._taxonomy.semantic.get_entrypoint_concepts(entrypoint):
-                for doc_concept in doc_concepts:
-                    if doc_concept == concept:
-                        entrypoints_found.add(entrypoint)
+        # The "All" entrypoint, which matches everything, is ignored -- we're looking for a more
+        # specific one.
+        exact, candidates = self._taxonomy.semantic.find_entrypoints_for_concepts(doc_concepts)
 
-        if len(entrypoints_found) == 0:
+        if len(candidates) == 0:
             raise ob.OBValidationError("No entrypoint found given the set of facts")
-        elif len(entrypoints_found) == 1:
-            for entrypoint in entrypoints_found:
-                return entrypoint
+        elif len(candidates) == 1:
+            return candidates[0][0]
+        elif len(exact) == 1:
+            # Multiple candidate entrypoints are found but one and only one is a perfect fit.
+            return exact[0]
+        elif len(exact) > 1:
+            raise ob.OBValidationError("Multiple entrypoints ({}, {}) found given the set of facts".format(exact[0], exact[1]))
         else:
-            # Multiple candidate entrypoints are found.  See if there is one and only one
-            # perfect fit.
-            the_one = None
-            for entrypoint in entrypoints_found:
-                ok = True
-                for doc_concept in doc_concepts:
-                    ok2 = False
-                    for doc_concept2 in self._taxonomy.semantic.get_entrypoint_concepts(entrypoint):
-                        if doc_concept == doc_concept2:
-                            ok2 = True
-                            break
-                    if not ok2:
-                        ok = False
-                        break
-                if ok:
-                    if the_one is None:
-                        the_one = entrypoint
-                    else:
-                         raise ob.OBValidationError("Multiple entrypoints ({}, {}) found given the set of facts".format(the_one, entrypoint))
-            if the_one == None:
-                raise ob.OBValidationError("No entrypoint found given the set of facts")
-            else:
-                return the_one
+            raise ob.OBValidationError("No entrypoint found given the set of facts")
 
     def from_JSON_string(self, json_string, entrypoint_name=None):
         """ 
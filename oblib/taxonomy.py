@@ -15,7 +15,13 @@
 """Handles Orange button taxonomy."""
 
 import enum
-from oblib import ob
+import os
+import threading
+import time
+
+from six import string_types
+
+from oblib import constants, ob, util
 
 
 class SubstitutionGroup(enum.Enum):
@@ -109,15 +115,20 @@ class Entrypoint(object):
             Path to base filename (used by loader - not externally exposed)
     """
 
+    __slots__ = ("name", "full_name", "number", "entrypoint_type", "description", "_path")
+
     def __init__(self):
         self.name = None
         self.full_name = None
         self.number = None
         self.entrypoint_type = None
-        self.number = None
         self.description = None
         self._path = None
 
+    def to_dict(self):
+        """Convert Entrypoint to dict."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
 
 class ConceptDetails(object):
     """
@@ -146,6 +157,9 @@ class ConceptDetails(object):
             instance if it is a point in time.
     """
 
+    __slots__ = ("abstract", "id", "name", "nillable", "period_independent", "substitution_group",
+                 "type_name", "typed_domain_ref", "period_type")
+
     def __init__(self):
         """Element constructor."""
         self.abstract = None
@@ -171,6 +185,10 @@ class ConceptDetails(object):
             "," + str(self.period_type) + \
             "}"
 
+    def to_dict(self):
+        """Convert ConceptDetails to dict."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
 
 class Relationship(object):
     """
@@ -189,6 +207,8 @@ class Relationship(object):
             The order of the relationshps for a single entrypoint.
     """
 
+    __slots__ = ("role", "from_", "to", "order")
+
     def __init__(self):
         """Relationship constructor."""
         self.role = None
@@ -204,6 +224,10 @@ class Relationship(object):
             "," + str(self.order) + \
             "}"
 
+    def to_dict(self):
+        """Convert Relationship to dict."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
 
 class Calculation(object):
     """
@@ -224,6 +248,8 @@ class Calculation(object):
             The weight (-1 or 1) for calcuations.
     """
 
+    __slots__ = ("role", "from_", "to", "order", "weight")
+
     def __init__(self):
         """Relationship constructor."""
         self.role = None
@@ -241,6 +267,10 @@ class Calculation(object):
             "," + str(self.weight) + \
             "}"
 
+    def to_dict(self):
+        """Convert Calculation to dict."""
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
 
 class Unit(object):
     """
@@ -275,6 +305,9 @@ class Unit(object):
             Date for a unit
     """
 
+    __slots__ = ("id", "unit_id", "unit_name", "ns_unit", "item_type", "item_type_date", "symbol",
+                 "definition", "base_standard", "status", "version_date")
+
     def __init__(self):
         """Unit constructor."""
         self.id = None
@@ -306,7 +339,7 @@ class Unit(object):
 
     def to_dict(self):
         """Convert Unit to dict."""
-        return vars(self)
+        return {slot: getattr(self, slot) for slot in self.__slots__}
 
 
 class TaxonomyNumericTypes(object):
@@ -460,14 +493,29 @@ class TaxonomyTypes(object):
 
     def __init__(self, tl):
         """Constructor."""
-        self._types = tl._load_types()
+        # The enumerated values of each type are kept as a tuple, in the order of the taxonomy, and as a
+        # frozenset for membership tests.
+        self._types = {}
+        self._type_enum_sets = {}
+        # Indexes of the names of the types by enumerated value, and of the enumerated values of each type
+        # by normalized value (see _normalize_enum_value).
+        self._types_by_enum_value = {}
+        self._normalized_enum_values = {}
+        for name, enums in tl._load_types().items():
+            self._types[name] = tuple(enums)
+            self._type_enum_sets[name] = frozenset(enums)
+            normalized_enum_values = {}
+            for enum in enums:
+                self._types_by_enum_value.setdefault(enum, []).append(name)
+                normalized_enum_values.setdefault(_normalize_enum_value(enum), enum)
+            self._normalized_enum_values[name] = normalized_enum_values
 
     def get_all_types(self):
         """
         Used to lookup all types.
 
         Returns:
-             A map and sublists of types.
+             A map of the types to the tuple of their enumerated values.
         """
         return self._types
 
@@ -488,14 +536,64 @@ class TaxonomyTypes(object):
         Used to lookup a type enumeration.
 
         Returns:
-             An enumeration given a type or None if the type does not exist
-             in the taxonomy.
+             An enumeration (tuple of str in the order of the taxonomy) given a type or None if the type
+             does not exist in the taxonomy.
         """
         if name in self._types:
             return self._types[name]
         else:
             return None
 
+    def get_type_enum_set(self, name):
+        """
+        Used to lookup a type enumeration for membership tests.
+
+        Returns:
+             A frozenset of the enumerated values of a type or None if the type does not exist in the
+             taxonomy.
+        """
+        return self._type_enum_sets.get(name)
+
+    def is_type_enum_value(self, name, value):
+        """
+        Validates that a value is an enumerated value of a type.
+
+        Returns:
+            True if the value is an enumerated value of the type, false otherwise.
+        """
+        enum_set = self._type_enum_sets.get(name)
+        return enum_set is not None and isinstance(value, string_types) and value in enum_set
+
+    def get_types_for_enum_value(self, value):
+        """
+        Used to lookup the types having an enumerated value.
+
+        Returns:
+             A list of the names of the types having value as an enumerated value, empty if there are none.
+        """
+        return list(self._types_by_enum_value.get(value, []))
+
+    def find_type_enum_value(self, name, value):
+        """
+        Used to lookup an enumerated value of a type ignoring case and surrounding whitespace, for instance
+        "central" for "Central".
+
+        Returns:
+             The enumerated value as spelled in the taxonomy or None if the type does not exist in the
+             taxonomy or has no such value.
+        """
+        normalized_enum_values = self._normalized_enum_values.get(name)
+        if normalized_enum_values is None or not isinstance(value, string_types):
+            return None
+        return normalized_enum_values.get(_normalize_enum_value(value))
+
+
+def _normalize_enum_value(value):
+    """
+    Returns the form of an enumerated value used for case-insensitive lookups.
+    """
+    return value.strip().lower()
+
 
 class TaxonomyUnits(object):
     """
@@ -504,9 +602,42 @@ class TaxonomyUnits(object):
     Allows lookup of units in the taxonomy, and enumerated values for units.
     """
 
-    def __init__(self, tl):
-        """Constructor."""
-        self._units = tl._load_units()
+    def __init__(self, tl, tables=None):
+        """
+        Constructor.
+
+        Args:
+            tl (TaxonomyLoader): loader used to parse the units registry.
+            tables (TaxonomyTables): default None.  If given the units are read from this attached table
+                file (see taxonomy_tables) instead of being parsed, tl is not used.
+        """
+        if tables is not None:
+            from oblib import taxonomy_tables
+            self._units = taxonomy_tables.units_view(tables)
+        else:
+            self._units = tl._load_units()
+
+        # Indexes of the unit_id of the units by id, by unit_name and by item_type (a list since several units
+        # share an item type).  _units itself is the index by unit_id.
+        self._unit_ids_by_id = {}
+        self._unit_ids_by_unit_name = {}
+        self._unit_ids_by_item_type = {}
+        for unit_id, unit in self._units.items():
+            self._unit_ids_by_id[unit.id] = unit_id
+            self._unit_ids_by_unit_name[unit.unit_name] = unit_id
+            self._unit_ids_by_item_type.setdefault(unit.item_type, []).append(unit_id)
+
+    def export_tables(self, pathname, taxonomy_hash=None):
+        """
+        Writes the units to a compact table file that other processes can attach to (see
+        taxonomy_tables).
+
+        Args:
+            pathname (str): table file to write.
+            taxonomy_hash (str): default None.  Hash of the taxonomy files, recorded in the table file.
+        """
+        from oblib import taxonomy_tables
+        taxonomy_tables.write_units_tables(self, pathname, taxonomy_hash)
 
     def get_all_units(self):
         """
@@ -517,13 +648,29 @@ class TaxonomyUnits(object):
         """
         return self._units
 
-    def _by_id(self):
-        """Return a dict of the form {id: unit_id}"""
-        return {self._units[k].id: k for k in self._units.keys()}
+    def _find_unit_id(self, unit_str, attr=None):
+        """
+        Returns the unit_id of the unit given by unit_str, checking attributes unit_id, id and unit_name
+        in this order if attr is None, or None if there is no such unit.
 
-    def _by_unit_name(self):
-        """Return a dict of the form {unit_name: unit_id}"""
-        return {self._units[k].unit_name: k for k in self._units.keys()}
+        Raises:
+            ValueError if attr is not unit_id, unit_name, id, or None.
+        """
+        if attr == 'unit_id' or (attr is None and unit_str in self._units):
+            return unit_str if unit_str in self._units else None
+        elif attr == 'id':
+            return self._unit_ids_by_id.get(unit_str)
+        elif attr == 'unit_name':
+            return self._unit_ids_by_unit_name.get(unit_str)
+        elif attr:
+            raise ValueError('{} is not a valid unit attribute, must be one of'
+                             '"unit_id", "unit_name" or "id"'
+                             .format(attr))
+        else:  # attr is None and unit_str is not a unit_id
+            unit_id = self._unit_ids_by_id.get(unit_str)
+            if unit_id is None:
+                unit_id = self._unit_ids_by_unit_name.get(unit_str)
+            return unit_id
 
     def is_unit(self, unit_str, attr=None):
         """
@@ -546,20 +693,7 @@ class TaxonomyUnits(object):
         Raises:
             ValueError if attr is not a valid attribute
         """
-        if attr=='unit_id':
-            return unit_str in self._units.keys()
-        elif attr=='unit_name':
-            return unit_str in self._by_unit_name().keys()
-        elif attr=='id':
-            return unit_str in self._by_id().keys()
-        elif attr:
-            raise ValueError('{} is not a valid unit attribute, must be one of'
-                             '"unit_id", "unit_name" or "id"'
-                             .format(attr))
-        else: # attr is None, check for any attribute
-            return (unit_str in self._units.keys() or \
-                    unit_str in self._by_id().keys() or \
-                    unit_str in self._by_unit_name().keys())
+        return self._find_unit_id(unit_str, attr) is not None
 
     def get_unit(self, unit_str, attr=None):
         """
@@ -583,49 +717,50 @@ class TaxonomyUnits(object):
             OBNotFoundError if no unit is found.
             ValueError if attr is not unit_id, unit_name, id, or None.
         """
-        found = False
-        unit = None
-        if attr in {'unit_id', 'unit_name', 'id'}:
-            # valid attr, search for unit_str in attr's values
-            if attr=='unit_id':
-                if unit_str in self._units.keys():
-                    unit = self._units[unit_str]
-                    found = True
-            elif attr=='unit_name':
-                if unit_str in self._by_unit_name():
-                    unit_id = self._by_unit_name()[unit_str]
-                    unit = self._units[unit_id]
-                    found = True
-            elif attr=='id':
-                if unit_str in self._by_id():
-                    unit_id = self._by_id()[unit_str]
-                    unit = self._units[unit_id]
-                    found = True
-        elif attr:
-            raise ValueError('{} is not a recognized unit attribute'
-                             .format(attr))
-        else:  # attr is None
-            # search by unit_id, unit_name or id
-            if self.is_unit(unit_str, attr):
-                # find unit_id
-                try:
-                    unit = self._units[unit_str]
-                    found = True
-                except:
-                    if unit_str in self._by_id():
-                        unit_id = self._by_id()[unit_str]
-                        unit = self._units[unit_id]
-                        found = True
-                    elif unit_str in self._by_unit_name():
-                        unit_id = self._by_unit_name()[unit_str]
-                        unit = self._units[unit_id]
-                        found = True
-        if found:
-            return unit
+        unit_id = self._find_unit_id(unit_str, attr)
+        if unit_id is not None:
+            return self._units[unit_id]
         else:
             raise ob.OBNotFoundError("{} is not the type, name or id of a valid "
                                   "unit".format(unit_str, attr))
 
+    def get_units(self, unit_strs, attr=None):
+        """
+        Bulk version of get_unit, looks up several units at once.
+
+        Args:
+            unit_strs: list
+                unit_id, unit_name or id of each unit
+            attr: str, default None
+                checks only specified attribute, can be 'unit_id', 'unit_name',
+                or 'id'
+
+        Returns:
+            A list with the unit for each entry of unit_strs, or None for the
+            entries that are not the type, name or id of a valid unit.
+
+        Raises:
+            ValueError if attr is not unit_id, unit_name, id, or None.
+        """
+        units = []
+        for unit_str in unit_strs:
+            unit_id = self._find_unit_id(unit_str, attr)
+            units.append(self._units[unit_id] if unit_id is not None else None)
+        return units
+
+    def get_item_type_units(self, item_type):
+        """
+        Returns the units registered for an item type.
+
+        Args:
+            item_type: str
+                XBRL item type without namespace, for example energyItemType
+
+        Returns:
+            A list of units, empty if no unit has this item type.
+        """
+        return [self._units[unit_id] for unit_id in self._unit_ids_by_item_type.get(item_type, [])]
+
 
 class TaxonomySemantic(object):
     """
@@ -641,17 +776,71 @@ class TaxonomySemantic(object):
     #      the key and the value is a list of all concepts in the entrypoint.
     #    - _relationships_by_entrypoint is a map containing all relationshsips for individual entrypoints.  The
     #      entrypoint is the key and the value is a list of all concepts in the entyrpoint.
+    #    - _relationship_indexes is a map from entrypoint to the indexes of its relationships by role, by
+    #      (role, from_) and by (role, to), built the first time an entrypoint is queried.
+    #    - _calculations_by_from, _calculations_by_to and _calculation_closures index _calculations by
+    #      summation concept and by item concept and hold the weighted leaf expansion of each summation concept.
+    #    - _entrypoint_masks is an inverted index from concept to the entrypoints containing it, encoded as a
+    #      bitset (an int with bit i set for entrypoint _entrypoint_bits[i]), built on first use.
+
+    def __init__(self, tl, lazy_entrypoints=False, tables=None):
+        """
+        Constructor.
 
-    def __init__(self, tl):
-        """Constructor."""
+        Args:
+            tl (TaxonomyLoader): loader used to parse the taxonomy files.
+            lazy_entrypoints (boolean): default False.  If True the concepts and relationships of an
+                entrypoint are only parsed the first time the entrypoint is accessed, which saves start up
+                time and memory when only a few entrypoints are used.  Methods that need every entrypoint
+                (get_all_concepts, get_all_type_names, etc.) load all the remaining entrypoints.  Looking
+                up a concept that is not in a loaded entrypoint only loads its details.
+            tables (TaxonomyTables): default None.  If given the data is read from this attached table
+                file (see taxonomy_tables) instead of being parsed, tl is not used.
+        """
 
-        self._entrypoints, self._concepts_details = tl._load_entrypoints_concept_details()
-        self._concepts_by_entrypoint = tl._load_concepts()
-        self._relationships_by_entrypoint = tl._load_relationships()
-        self._calculations = tl._load_calculations()
-        self._reduce_unused_semantic_data()
+        self._relationship_indexes = {}
+        self._entrypoint_bits = None
+        self._entrypoint_masks = None
+        if tables is not None:
+            from oblib import taxonomy_tables
+            self._tl = None
+            self._elements = None
+            (self._entrypoints, self._concepts_details, self._concepts_by_entrypoint,
+             self._relationships_by_entrypoint, self._calculations) = taxonomy_tables.semantic_views(tables)
+            self._index_calculations()
+            return
 
-    def _reduce_unused_semantic_data(self):
+        self._calculations = tl._load_calculations()
+        self._index_calculations()
+        if not lazy_entrypoints:
+            self._tl = None
+            self._entrypoints, self._elements = tl._load_entrypoints_concept_details()
+            self._concepts_by_entrypoint = tl._load_concepts()
+            self._relationships_by_entrypoint = tl._load_relationships()
+            self._reduce_unused_semantic_data()
+        else:
+            self._tl = tl
+            self._lock = threading.RLock()
+            self._entrypoints = tl._load_entrypoints()
+            self._pre_files = dict(tl._entrypoint_files("pre."))
+            self._def_files = dict(tl._entrypoint_files("def."))
+            self._elements = {}
+            self._deferred_element_files = []
+            for pathname in tl._element_files():
+                if os.path.basename(pathname) == constants.US_GAAP_XSD:
+                    # Only a small fraction of the large US-GAAP schema is used by the solar taxonomy so it
+                    # is searched for the concepts of each entrypoint as they are loaded.
+                    self._deferred_element_files.append(pathname)
+                else:
+                    self._elements.update(tl._load_elements_file(pathname))
+            self._concepts_by_entrypoint = {}
+            self._relationships_by_entrypoint = {}
+            self._concepts_details = {}
+            # Concepts of the "All" entrypoint, which lists every concept of the taxonomy, read on the
+            # first lookup of a concept that is not loaded (see is_concept).
+            self._all_concept_ids = None
+
+    def _reduce_unused_semantic_data(self, concepts=None):
         """
         During loading of the elements unused elements may be loaded in the
         us-gaap and dei namespaces.  A new elements list can be created that
@@ -661,10 +850,32 @@ class TaxonomySemantic(object):
         Removing the elements has two benefits:
             - Allows simplifcation of accessor methods which no longer have to filter unused data.
             - Reduces in-memory footprint of data
+
+        When entrypoints are loaded on demand this runs incrementally for the concepts
+        of each newly loaded entrypoint.
+
+        Args:
+            concepts (list): concepts of the newly loaded entrypoint, None once all entrypoints are loaded.
         """
+        if concepts is not None:
+            details = {}
+            missing = set()
+            for c in concepts:
+                if c in self._concepts_details:
+                    continue
+                if c in self._elements:
+                    details[c] = self._elements[c]
+                else:
+                    missing.add(c)
+            for pathname in self._deferred_element_files:
+                if missing:
+                    details.update(self._tl._load_elements_file(pathname, missing))
+            self._concepts_details.update(details)
+            return
+
         # Create a list of elements in use and set them all to False
         concept_details_in_use = {}
-        for e in self._concepts_details:
+        for e in self._elements:
             concept_details_in_use[e] = False
 
         # Find all elements loaded by the taxonomy in the concepts object and
@@ -675,10 +886,113 @@ class TaxonomySemantic(object):
 
         # Create a new elements list and only add the elements that are in use.
         ne = {}
-        for e in self._concepts_details:
+        for e in self._elements:
             if concept_details_in_use[e]:
-                ne[e] = self._concepts_details[e]
+                ne[e] = self._elements[e]
         self._concepts_details = ne
+        self._elements = None
+
+    def _index_calculations(self):
+        """
+        Builds the calculation indexes from _calculations: the weighted items of each summation concept,
+        the summation concepts each item is used in and the weighted leaf expansion of each summation
+        concept.
+        """
+        self._calculations_by_from = {}
+        self._calculations_by_to = {}
+        for calculation in self._calculations:
+            self._calculations_by_from.setdefault(calculation.from_, []).append(
+                (calculation.to, int(calculation.weight)))
+            self._calculations_by_to.setdefault(calculation.to, []).append(calculation.from_)
+
+        self._calculation_closures = {}
+        for concept in self._calculations_by_from:
+            leaves = self._expand_calculation(concept, 1, (), {})
+            self._calculation_closures[concept] = tuple(leaves.items())
+
+    def _expand_calculation(self, concept, weight, path, leaves):
+        """
+        Adds the leaf items of a summation concept to leaves, multiplying the weights along the way and
+        adding the weights of items reached by several paths.  A summation concept already on the path is
+        treated as a leaf so that a cycle in the calculation network cannot recurse forever.
+
+        Args:
+            concept (str): summation concept to expand.
+            weight (int): product of the weights from the expanded concept down to concept.
+            path (tuple): summation concepts from the expanded concept down to concept.
+            leaves (dict): leaf concepts mapped to their weights, updated in place.
+
+        Returns:
+            leaves
+        """
+        path = path + (concept,)
+        for item, item_weight in self._calculations_by_from[concept]:
+            if item in self._calculations_by_from and item not in path:
+                self._expand_calculation(item, weight * item_weight, path, leaves)
+            else:
+                leaves[item] = leaves.get(item, 0) + weight * item_weight
+        return leaves
+
+    def _load_entrypoint(self, entrypoint):
+        """
+        Loads the concepts and relationships of an entrypoint if entrypoints are loaded on demand and the
+        entrypoint has not been loaded yet.
+        """
+        if self._tl is None or entrypoint in self._concepts_by_entrypoint or entrypoint not in self._pre_files:
+            return
+        with self._lock:
+            if self._tl is None or entrypoint in self._concepts_by_entrypoint:
+                return
+            concepts = self._tl._load_concepts_file(self._pre_files[entrypoint])
+            self._reduce_unused_semantic_data(concepts)
+            if entrypoint in self._def_files:
+                self._relationships_by_entrypoint[entrypoint] = self._tl._load_relationships_file(
+                    self._def_files[entrypoint])
+            # Published last since it marks the entrypoint as loaded.
+            self._concepts_by_entrypoint[entrypoint] = concepts
+
+    def _load_all_entrypoints(self):
+        """
+        Loads every entrypoint that has not been loaded yet if entrypoints are loaded on demand.  The
+        result is the same as a full load.
+        """
+        if self._tl is None:
+            return
+        with self._lock:
+            if self._tl is None:
+                return
+            tl = self._tl
+            concepts_by_entrypoint = {}
+            for entrypoint, pathname in self._pre_files.items():
+                if entrypoint in self._concepts_by_entrypoint:
+                    concepts_by_entrypoint[entrypoint] = self._concepts_by_entrypoint[entrypoint]
+                else:
+                    concepts_by_entrypoint[entrypoint] = tl._load_concepts_file(pathname)
+            relationships_by_entrypoint = {}
+            for entrypoint, pathname in self._def_files.items():
+                if entrypoint in self._relationships_by_entrypoint:
+                    relationships_by_entrypoint[entrypoint] = self._relationships_by_entrypoint[entrypoint]
+                else:
+                    relationships_by_entrypoint[entrypoint] = tl._load_relationships_file(pathname)
+
+            self._elements = tl._load_entrypoints_concept_details()[1]
+            self._relationships_by_entrypoint = relationships_by_entrypoint
+            self._concepts_by_entrypoint = concepts_by_entrypoint
+            self._reduce_unused_semantic_data()
+            self._deferred_element_files = []
+            self._tl = None
+
+    def export_tables(self, pathname, taxonomy_hash=None):
+        """
+        Writes the semantic data to a compact table file that other processes can attach to (see
+        taxonomy_tables).  Entrypoints loaded on demand are all loaded first.
+
+        Args:
+            pathname (str): table file to write.
+            taxonomy_hash (str): default None.  Hash of the taxonomy files, recorded in the table file.
+        """
+        from oblib import taxonomy_tables
+        taxonomy_tables.write_semantic_tables(self, pathname, taxonomy_hash)
 
     def get_all_concepts(self, details=False):
         """
@@ -691,6 +1005,7 @@ class TaxonomySemantic(object):
             list of concept names if details=False
             dict of concept details if details=True
         """
+        self._load_all_entrypoints()
         if not details:
             return list(self._concepts_details.keys())
         else:
@@ -703,6 +1018,7 @@ class TaxonomySemantic(object):
         Returns:
              list of type names (strings).
         """
+        self._load_all_entrypoints()
         type_names = set()  # use set to eliminate duplicates
         for e in self._concepts_details:
             type_names.add(self._concepts_details[e].type_name)
@@ -721,9 +1037,47 @@ class TaxonomySemantic(object):
 
         if concept in self._concepts_details:
             return True
+        elif self._tl is not None:
+            # The concept may belong to an entrypoint that has not been loaded yet, only its own details
+            # are loaded.
+            if concept not in self._get_all_concept_ids():
+                return False
+            with self._lock:
+                if self._tl is not None:
+                    if concept not in self._elements:
+                        self._load_deferred_elements()
+                    self._reduce_unused_semantic_data([concept])
+            return concept in self._concepts_details
         else:
             return False
 
+    def _load_deferred_elements(self):
+        """
+        Loads the elements of every concept of the taxonomy from the deferred element files, once, so that
+        looking up concepts one at a time does not search the files again for each of them.
+        """
+        for pathname in self._deferred_element_files:
+            self._elements.update(self._tl._load_elements_file(pathname, self._get_all_concept_ids()))
+        self._deferred_element_files = []
+
+    def _get_all_concept_ids(self):
+        """
+        Used to look up concepts without loading every entrypoint when entrypoints are loaded on demand.
+
+        Returns:
+            A frozenset of the concepts of the "All" entrypoint, a superset of the concepts of every other
+            entrypoint.
+        """
+        if self._all_concept_ids is None:
+            with self._lock:
+                if self._all_concept_ids is None:
+                    if "All" in self._concepts_by_entrypoint:
+                        concepts = self._concepts_by_entrypoint["All"]
+                    else:
+                        concepts = self._tl._load_concepts_file(self._pre_files["All"])
+                    self._all_concept_ids = frozenset(concepts)
+        return self._all_concept_ids
+
     def is_entrypoint(self, entrypoint):
         """
         Validate if an entrypoint type is present in the Taxonomy.
@@ -736,6 +1090,8 @@ class TaxonomySemantic(object):
         """
         if entrypoint in self._concepts_by_entrypoint:
             return True
+        elif self._tl is not None and entrypoint in self._pre_files:
+            return True
         else:
             return False
 
@@ -757,6 +1113,7 @@ class TaxonomySemantic(object):
                 primary key is name from concepts, value is dict of concept
                 details
         """
+        self._load_entrypoint(entrypoint)
         concepts = []
         if entrypoint in self._concepts_by_entrypoint:
             concepts = self._concepts_by_entrypoint[entrypoint]
@@ -773,18 +1130,92 @@ class TaxonomySemantic(object):
                 return concepts, ci
         return concepts
 
-    def get_entrypoint_relationships(self, entrypoint):
+    def _get_entrypoint_masks(self):
+        """
+        Returns the entrypoint bit order and the concept to entrypoint bitset index, building them the
+        first time (which loads every entrypoint if entrypoints are loaded on demand).
+        """
+        if self._entrypoint_masks is None:
+            entrypoint_bits = sorted(self.get_all_entrypoints())
+            entrypoint_masks = {}
+            for i, entrypoint in enumerate(entrypoint_bits):
+                bit = 1 << i
+                for concept in self.get_entrypoint_concepts(entrypoint):
+                    entrypoint_masks[concept] = entrypoint_masks.get(concept, 0) | bit
+            self._entrypoint_bits = entrypoint_bits
+            self._entrypoint_masks = entrypoint_masks
+        return self._entrypoint_bits, self._entrypoint_masks
+
+    def get_concept_entrypoints(self, concept):
+        """
+        Used to find the entrypoints a concept belongs to.
+
+        Args:
+            concept (str): concept name.
+
+        Returns:
+            A set of entrypoint names, empty if the concept is not in any entrypoint.
+        """
+        entrypoint_bits, entrypoint_masks = self._get_entrypoint_masks()
+        mask = entrypoint_masks.get(concept, 0)
+        return set(entrypoint for i, entrypoint in enumerate(entrypoint_bits) if mask >> i & 1)
+
+    def find_entrypoints_for_concepts(self, concepts, include_all=False):
+        """
+        Used to find the entrypoints that can hold a set of concepts, for instance the concepts of the facts
+        of a document.
+
+        Args:
+            concepts (list): concept names, duplicates are ignored.
+            include_all (boolean): default False.  If True the "All" entrypoint, which contains every
+                concept, is a candidate as well.
+
+        Returns:
+            A tuple (exact, candidates).  exact is a sorted list of the entrypoints that contain every
+            concept.  candidates is a list of (entrypoint, count) tuples for every entrypoint that contains
+            at least one of the concepts, where count is the number of concepts it contains, sorted from
+            the best coverage down and then by name.
+        """
+        entrypoint_bits, entrypoint_masks = self._get_entrypoint_masks()
+        concepts = set(concepts)
+        excluded = 0
+        if not include_all and "All" in entrypoint_bits:
+            excluded = 1 << entrypoint_bits.index("All")
+
+        exact = ~excluded if concepts else 0
+        counts = {}
+        for concept in concepts:
+            mask = entrypoint_masks.get(concept, 0) & ~excluded
+            exact &= mask
+            while mask:
+                low = mask & -mask
+                counts[low] = counts.get(low, 0) + 1
+                mask ^= low
+
+        candidates = sorted(((entrypoint_bits[low.bit_length() - 1], count) for low, count in counts.items()),
+                            key=lambda candidate: (-candidate[1], candidate[0]))
+        exact = [entrypoint for i, entrypoint in enumerate(entrypoint_bits) if exact >> i & 1]
+        return exact, candidates
+
+    def get_entrypoint_relationships(self, entrypoint, role=None):
         """
         Used to find the relationships for an entrypoint.
 
         Args:
             Entrypoint (string): Entrypoint name to lookup relationships for.
+            role (RelationshipRole): default None.  If given only relationships with this role are returned.
 
         Returns:
              A list of all relationships in an entry point.  Iif the concept exists but has no
              relationships an empty list is returned.
         """
 
+        if role is not None:
+            index = self._get_relationship_index(entrypoint)
+            if index is None:
+                return None
+            return index[0].get(role, [])
+        self._load_entrypoint(entrypoint)
         if entrypoint in self._concepts_by_entrypoint:
             if entrypoint in self._relationships_by_entrypoint:
                 return self._relationships_by_entrypoint[entrypoint]
@@ -793,6 +1224,73 @@ class TaxonomySemantic(object):
         else:
             return None
 
+    def _get_relationship_index(self, entrypoint):
+        """
+        Returns the relationship indexes of an entrypoint, building them the first time.
+
+        The indexes are a tuple of three dicts: relationships by role, by (role, from_) and by
+        (role, to).  The last two also hold every relationship under (None, from_) and (None, to).
+        Each list keeps the order of get_entrypoint_relationships.
+
+        Args:
+            entrypoint (str): entrypoint name.
+
+        Returns:
+            The indexes, or None if the entrypoint does not exist.
+        """
+        index = self._relationship_indexes.get(entrypoint)
+        if index is None:
+            relationships = self.get_entrypoint_relationships(entrypoint)
+            if relationships is None:
+                return None
+            by_role = {}
+            by_from = {}
+            by_to = {}
+            for relationship in relationships:
+                by_role.setdefault(relationship.role, []).append(relationship)
+                for role in (relationship.role, None):
+                    by_from.setdefault((role, relationship.from_), []).append(relationship)
+                    by_to.setdefault((role, relationship.to), []).append(relationship)
+            index = (by_role, by_from, by_to)
+            self._relationship_indexes[entrypoint] = index
+        return index
+
+    def get_relationships_from(self, entrypoint, concept, role=None):
+        """
+        Used to find the relationships of an entrypoint that start at a concept.
+
+        Args:
+            entrypoint (str): entrypoint name.
+            concept (str): concept name, the from_ of the relationships.
+            role (RelationshipRole): default None.  If given only relationships with this role are returned.
+
+        Returns:
+            A list of relationships in entrypoint order, empty if there are none.  None if the entrypoint
+            does not exist.
+        """
+        index = self._get_relationship_index(entrypoint)
+        if index is None:
+            return None
+        return index[1].get((role, concept), [])
+
+    def get_relationships_to(self, entrypoint, concept, role=None):
+        """
+        Used to find the relationships of an entrypoint that end at a concept.
+
+        Args:
+            entrypoint (str): entrypoint name.
+            concept (str): concept name, the to of the relationships.
+            role (RelationshipRole): default None.  If given only relationships with this role are returned.
+
+        Returns:
+            A list of relationships in entrypoint order, empty if there are none.  None if the entrypoint
+            does not exist.
+        """
+        index = self._get_relationship_index(entrypoint)
+        if index is None:
+            return None
+        return index[2].get((role, concept), [])
+
     def get_all_entrypoints(self, details=False):
         """
         Used to access  a list of all entry points (data, documents, and processes) in the Taxonomy.
@@ -809,10 +1307,14 @@ class TaxonomySemantic(object):
                 details (only returned if details=True
         """
 
+        if self._tl is not None:
+            entrypoints = list(self._pre_files)
+        else:
+            entrypoints = list(self._concepts_by_entrypoint)
         if details:
-            return list(self._concepts_by_entrypoint), self._entrypoints
+            return entrypoints, self._entrypoints
         else:
-            return list(self._concepts_by_entrypoint)
+            return entrypoints
 
     def get_entrypoint_details(self, entrypoint):
         """
@@ -864,11 +1366,27 @@ class TaxonomySemantic(object):
         if not self.is_concept(concept):
             return None
 
-        data = []
-        for calculation in self._calculations:
-            if concept == calculation.from_:
-                data.append([calculation.to, int(calculation.weight)])
-        return data
+        return [[item, weight] for item, weight in self._calculations_by_from.get(concept, [])]
+
+    def get_concept_calculation_closure(self, concept):
+        """
+        Return the full expansion of a calculated concept down to concepts that are not calculated
+        themselves.
+
+        Args:
+             concept: str
+                concept name
+
+        Returns:
+            An array of arrays in the same format as get_concept_calculation, where the weight of each
+            leaf is the product of the weights along the calculation chain (summed if the leaf is reached
+            through several chains).  If the concept is not a calcuated field an empty array is returned.
+            If the concept name is not valid None will be returned.
+        """
+        if not self.is_concept(concept):
+            return None
+
+        return [[item, weight] for item, weight in self._calculation_closures.get(concept, ())]
 
     def get_concept_calculated_usage(self, concept):
         """
@@ -885,11 +1403,7 @@ class TaxonomySemantic(object):
         """
         if not self.is_concept(concept):
             return None
-        data = []
-        for calculation in self._calculations:
-            if concept == calculation.to:
-                data.append(calculation.from_)
-        return data
+        return list(self._calculations_by_to.get(concept, []))
 
 
 class Taxonomy(object):
@@ -904,19 +1418,258 @@ class Taxonomy(object):
     required to fulfill the method results.
     """
 
-    def __init__(self):
-        """Taxonomy constructor."""
+    # Maps the name of each component attribute to the class that loads it.
+    _COMPONENTS = {
+        "semantic": TaxonomySemantic,
+        "types": TaxonomyTypes,
+        "units": TaxonomyUnits,
+        "numeric_types": TaxonomyNumericTypes,
+        "generic_roles": TaxonomyGenericRoles,
+        "ref_parts": TaxonomyRefParts,
+        "documentation": TaxonomyDocumentation
+    }
+
+    def __init__(self, use_cache=None, lazy=True, parallel=False, taxonomy_dir=None, lazy_entrypoints=False,
+                 backend="sax", tables_dir=None, cache_dir=None):
+        """
+        Taxonomy constructor.
+
+        Most users should call getTaxonomy() instead which returns an instance shared by the whole
+        process.
+
+        Args:
+            use_cache (boolean): default None.  If True each component is read from the precompiled
+                snapshot (see taxonomy_cache) when a current image exists, otherwise it is parsed and an
+                image is written for later loads.  If False the taxonomy XML files are always parsed.  If
+                None the snapshot is only used when cache_dir is given or the OBLIB_CACHE_DIR environment
+                variable is set, since images are pickles that must be kept in a trusted location.
+            lazy (boolean): default True.  If True each component (semantic, types, units, etc.) is
+                loaded the first time it is accessed so that only the components in use are paid for.
+                If False all components are loaded by the constructor.
+            parallel (boolean): default False.  If True the taxonomy files are parsed in a pool of
+                worker processes (see TaxonomyLoader).  Only used when a component is parsed rather than
+                read from the cache.
+            taxonomy_dir (str): directory containing the taxonomy, defaults to
+                constants.SOLAR_TAXONOMY_DIR.
+            lazy_entrypoints (boolean): default False.  If True the semantic component loads the
+                concepts and relationships of each entrypoint on first access (see TaxonomySemantic).
+                The semantic component is then always parsed rather than read from the cache.
+            backend (str): default "sax".  XML parser used to read the taxonomy files, "sax" or the
+                faster "expat" (see TaxonomyLoader).
+            tables_dir (str): default None.  If given the semantic and units components are attached to
+                the table files written to this directory by export_tables, which is much faster than
+                parsing and shares memory between processes (see taxonomy_tables).  Table files written
+                from other taxonomy files are stale and ignored, the components are then loaded as usual.
+            cache_dir (str): default None.  Directory of the snapshot images, defaults to
+                constants.TAXONOMY_CACHE_DIR (see TaxonomyCache).
+        """
 
         from oblib import taxonomy_loader
-        tl = taxonomy_loader.TaxonomyLoader()
+        self._tl = taxonomy_loader.TaxonomyLoader(taxonomy_dir, parallel=parallel, backend=backend)
+
+        if use_cache is None:
+            use_cache = cache_dir is not None or constants.TAXONOMY_CACHE_DIR is not None
+        self._cache = None
+        if use_cache:
+            from oblib import taxonomy_cache
+            self._cache = taxonomy_cache.TaxonomyCache(taxonomy_dir, cache_dir)
+
+        self._lazy_entrypoints = lazy_entrypoints
+        self._tables_dir = tables_dir
+        # TaxonomyTables attached by the components, released by close().
+        self._tables = []
+        self._taxonomy_hash = None
+        self._lock = threading.RLock()
+        self._components = {}
+        self._load_times = {}
+        # Memoized unit names allowed for each concept type name (see get_concept_units).
+        self._units_by_type_name = {}
+        # OBInstance templates by entrypoint (see get_instance_template).
+        self._instance_templates = {}
+
+        if not lazy:
+            for name in self._COMPONENTS:
+                self._get_component(name)
+
+    @property
+    def semantic(self):
+        """TaxonomySemantic, loaded on first access."""
+        return self._get_component("semantic")
+
+    @property
+    def types(self):
+        """TaxonomyTypes, loaded on first access."""
+        return self._get_component("types")
+
+    @property
+    def units(self):
+        """TaxonomyUnits, loaded on first access."""
+        return self._get_component("units")
+
+    @property
+    def numeric_types(self):
+        """TaxonomyNumericTypes, loaded on first access."""
+        return self._get_component("numeric_types")
+
+    @property
+    def generic_roles(self):
+        """TaxonomyGenericRoles, loaded on first access."""
+        return self._get_component("generic_roles")
+
+    @property
+    def ref_parts(self):
+        """TaxonomyRefParts, loaded on first access."""
+        return self._get_component("ref_parts")
+
+    @property
+    def documentation(self):
+        """TaxonomyDocumentation, loaded on first access."""
+        return self._get_component("documentation")
+
+    def _get_component(self, name):
+        """
+        Returns a component, loading it if this is the first access.  Loading is serialized by a lock so
+        that concurrent first accesses from several threads load the component only once.
+        """
 
-        self.semantic = TaxonomySemantic(tl)
-        self.types = TaxonomyTypes(tl)
-        self.units = TaxonomyUnits(tl)
-        self.numeric_types = TaxonomyNumericTypes(tl)
-        self.generic_roles = TaxonomyGenericRoles(tl)
-        self.ref_parts = TaxonomyRefParts(tl)
-        self.documentation = TaxonomyDocumentation(tl)
+        component = self._components.get(name)
+        if component is None:
+            with self._lock:
+                component = self._components.get(name)
+                if component is None:
+                    start = time.time()
+                    component = self._load_component(name, self._COMPONENTS[name])
+                    self._load_times[name] = time.time() - start
+                    self._components[name] = component
+        return component
+
+    def _load_component(self, name, component_class):
+        """
+        Reads a component from the snapshot cache, falling back to a full parse if the image is missing,
+        stale or corrupt.
+        """
+
+        if self._tables_dir is not None and name in ("semantic", "units"):
+            from oblib import taxonomy_tables
+            filename = taxonomy_tables.SEMANTIC_FILENAME if name == "semantic" else taxonomy_tables.UNITS_FILENAME
+            tables = taxonomy_tables.TaxonomyTables(os.path.join(self._tables_dir, filename))
+            if tables.taxonomy_hash == self._get_taxonomy_hash():
+                self._tables.append(tables)
+                return component_class(None, tables=tables)
+            # The tables were written from other taxonomy files, for instance before an upgrade, so they
+            # are stale.
+            tables.close()
+
+        if name == "semantic" and self._lazy_entrypoints:
+            # A partially loaded component is neither read from nor written to the cache.
+            return TaxonomySemantic(self._tl, lazy_entrypoints=True)
+
+        component = None
+        if self._cache is not None:
+            component = self._cache.load(name)
+            if not isinstance(component, component_class):
+                component = None
+        if component is None:
+            component = component_class(self._tl)
+            if self._cache is not None:
+                self._cache.save(name, component)
+        return component
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the table files attached by the components when the Taxonomy was created with a
+        tables_dir.  The semantic and units components can no longer be used afterwards.  Has no effect
+        otherwise.
+        """
+
+        with self._lock:
+            for tables in self._tables:
+                tables.close()
+            self._tables = []
+
+    def get_load_times(self):
+        """
+        Used to access the time spent loading each component.
+
+        Returns:
+            A dict with the component name (semantic, types, units, etc.) as key and the load time in
+            seconds as value.  Components that have not been accessed yet are not present.
+        """
+
+        with self._lock:
+            return dict(self._load_times)
+
+    def export_tables(self, tables_dir):
+        """
+        Writes the semantic and units components to table files that other processes can attach to with
+        Taxonomy(tables_dir=tables_dir).  The files record the hash of the taxonomy files, a Taxonomy
+        attaching to files written from other taxonomy files parses its own files instead.
+
+        Args:
+            tables_dir (str): directory to write the table files to, created if needed.
+        """
+        from oblib import taxonomy_tables
+        if not os.path.isdir(tables_dir):
+            os.makedirs(tables_dir)
+        taxonomy_hash = self._get_taxonomy_hash()
+        self.semantic.export_tables(os.path.join(tables_dir, taxonomy_tables.SEMANTIC_FILENAME), taxonomy_hash)
+        self.units.export_tables(os.path.join(tables_dir, taxonomy_tables.UNITS_FILENAME), taxonomy_hash)
+
+    def _get_taxonomy_hash(self):
+        """
+        Returns:
+            The hash of the taxonomy files (see taxonomy_cache.hash_taxonomy_dir), computed once.
+        """
+
+        if self._taxonomy_hash is None:
+            from oblib import taxonomy_cache
+            self._taxonomy_hash = taxonomy_cache.hash_taxonomy_dir(self._tl._taxonomy_dir)
+        return self._taxonomy_hash
+
+    def get_memory_usage(self):
+        """
+        Used to access an estimate of the memory used by each component.
+
+        Returns:
+            A dict with the component name (semantic, types, units, etc.) as key and the approximate size
+            in bytes as value.  Components that have not been accessed yet are not present.
+        """
+
+        with self._lock:
+            components = dict(self._components)
+        return {name: util.get_size(component) for name, component in components.items()}
+
+    def get_instance_template(self, entrypoint):
+        """
+        Returns the schema template shared by the OBInstances of an entrypoint (concept tree, tables,
+        axes, domains and line items), building it the first time.  This is what makes creating an
+        OBInstance cheap, the template must not be modified.
+
+        Args:
+            entrypoint (str): entrypoint name.
+
+        Returns:
+            data_model.OBInstanceTemplate
+
+        Raises:
+            OBNotFoundError if the entrypoint is not found.
+        """
+
+        template = self._instance_templates.get(entrypoint)
+        if template is None:
+            with self._lock:
+                template = self._instance_templates.get(entrypoint)
+                if template is None:
+                    from oblib import data_model
+                    template = data_model.OBInstanceTemplate(entrypoint, self)
+                    self._instance_templates[entrypoint] = template
+        return template
 
     def get_concept_units(self, concept):
         """
@@ -935,16 +1688,117 @@ class Taxonomy(object):
         """
 
         details = self.semantic.get_concept_details(concept)
-        if details.type_name.startswith("num:") or details.type_name.startswith("num-us:"):
-            if details.type_name in ["num:percentItemType"]:
-                return ["Pure"]
+        units = self._get_type_units(details.type_name)
+        if units is None:
+            return None
+        return list(units)
+
+    def get_entrypoint_concepts_units(self, entrypoint):
+        """
+        Bulk version of get_concept_units for all concepts of an entrypoint.
+
+        Args:
+            entrypoint : str
+                entrypoint name
+
+        Returns:
+            dict with the concepts of the entrypoint as keys and the result of get_concept_units for each
+            concept as values, or None if the entrypoint is not found.
+        """
+
+        if not self.semantic.is_entrypoint(entrypoint):
+            return None
+        concepts, details = self.semantic.get_entrypoint_concepts(entrypoint, details=True)
+        concepts_units = {}
+        for concept in concepts:
+            if concept in details:
+                units = self._get_type_units(details[concept].type_name)
+                concepts_units[concept] = list(units) if units is not None else None
+        return concepts_units
+
+    def _get_type_units(self, type_name):
+        """
+        Returns the unit names allowed for a concept type as a tuple, or None if the type does not support
+        units.  A unit is allowed if its item type is the type name without namespace, which is the rule
+        used by OBInstance._is_valid_unit.  The result is memoized per type name.
+        """
+
+        if type_name in self._units_by_type_name:
+            return self._units_by_type_name[type_name]
+        if type_name.startswith("num:") or type_name.startswith("num-us:"):
+            if type_name in ["num:percentItemType"]:
+                units = ("Pure",)
             else:
-                u = []
-                for unit in self.units.get_all_units():
-                    ud = self.units.get_unit(unit)
-                    if details.type_name.lower().find(ud.item_type.lower()) != -1:
-                        u.append(ud.unit_name)
-                return u
+                item_type = type_name.split(":")[-1]
+                units = tuple(unit.unit_name for unit in self.units.get_item_type_units(item_type))
         else:
-            return None
+            units = None
+        self._units_by_type_name[type_name] = units
+        return units
+
+
+_taxonomies = {}
+_taxonomies_lock = threading.Lock()
+
+
+def getTaxonomy(taxonomy_dir=None, version=None):
+    """
+    Used to access the process wide Taxonomy.
+
+    One Taxonomy is created per taxonomy directory and version the first time it is requested and the
+    same instance is returned by every later call, from any thread.  The instance is shared so callers
+    must treat it (and everything returned by it) as read-only.
+
+    Args:
+        taxonomy_dir (str): directory containing the taxonomy, defaults to constants.SOLAR_TAXONOMY_DIR.
+        version (str): taxonomy version, defaults to constants.TAXONOMY_VERSION which is the only
+            version this release of the library can load.
+
+    Returns:
+        The shared Taxonomy.
+
+    Raises:
+        OBNotFoundError if the version is not supported.
+    """
+
+    if taxonomy_dir is None:
+        taxonomy_dir = constants.SOLAR_TAXONOMY_DIR
+    if version is None:
+        version = constants.TAXONOMY_VERSION
+    if version != constants.TAXONOMY_VERSION:
+        raise ob.OBNotFoundError("Taxonomy version {} is not supported, expected {}".format(
+            version, constants.TAXONOMY_VERSION))
+
+    key = (os.path.realpath(taxonomy_dir), version)
+    with _taxonomies_lock:
+        tax = _taxonomies.get(key)
+        if tax is None:
+            tax = Taxonomy(taxonomy_dir=key[0])
+            _taxonomies[key] = tax
+    return tax
+
+
+def get_taxonomy_stats():
+    """
+    Used to access load time and memory statistics of the Taxonomies created by getTaxonomy().
+
+    Returns:
+        A dict with (taxonomy directory, version) as key and a dict as value containing "load_times" (see
+        Taxonomy.get_load_times), "memory" (see Taxonomy.get_memory_usage), "total_load_time" in seconds
+        and "total_memory" in bytes.
+    """
 
+    with _taxonomies_lock:
+        taxonomies = dict(_taxonomies)
+
+    stats = {}
+    for key, tax in taxonomies.items():
+        load_times = tax.get_load_times()
+        memory = tax.get_memory_usage()
+        stats[key] = {
+            "load_times": load_times,
+            "memory": memory,
+            "total_load_time": sum(load_times.values()),
+            "total_memory": sum(memory.values())
+        }
+    return stats
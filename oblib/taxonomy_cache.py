@@ -0,0 +1,193 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handles the precompiled on-disk snapshot of the Orange Button Taxonomy.
+
+Parsing the taxonomy XML files is by far the most expensive part of creating a Taxonomy.  After the first
+full parse each taxonomy component (semantic, types, units, etc.) is written to a binary image and later
+loads read the image back instead of parsing the XML again.
+
+Images are stored in a directory named after a key which is a hash of every file under the taxonomy
+directory.  Editing, adding or removing a taxonomy file therefore changes the key and the old images are
+simply no longer used.  An image that cannot be read (truncated write, different library version, etc.) is
+treated as a cache miss and the caller falls back to a full parse.
+
+Please note that images are Python pickles.  Only point the cache directory at a location that is not
+writable by untrusted users.  For this reason Taxonomy only uses the cache when asked to, either with the
+OBLIB_CACHE_DIR environment variable or with its use_cache and cache_dir arguments.
+"""
+
+import hashlib
+import os
+import pickle
+import re
+import shutil
+import sys
+import tempfile
+
+from oblib import constants
+
+
+# Increase whenever the in-memory layout of the taxonomy classes changes so that images written by
+# older versions of the library are not read back.
+CACHE_FORMAT_VERSION = 9
+
+_IMAGE_EXTENSION = ".pickle"
+
+_KEY_REGEX = re.compile("^[0-9a-f]{40}$")
+
+
+def hash_taxonomy_dir(taxonomy_dir=None):
+    """
+    Used to identify the files of a taxonomy.
+
+    Args:
+        taxonomy_dir (str): directory containing the taxonomy, defaults to constants.SOLAR_TAXONOMY_DIR.
+
+    Returns:
+        A string containing the hex digest of the SHA-1 hash of the relative path and contents of every file
+        under the taxonomy directory.  Hidden files and directories such as .git are skipped.
+    """
+
+    if taxonomy_dir is None:
+        taxonomy_dir = constants.SOLAR_TAXONOMY_DIR
+    h = hashlib.sha1()
+    for root, dirs, files in os.walk(taxonomy_dir):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for filename in sorted(files):
+            if filename.startswith("."):
+                continue
+            pathname = os.path.join(root, filename)
+            h.update(os.path.relpath(pathname, taxonomy_dir).replace(os.sep, "/").encode("utf-8"))
+            with open(pathname, "rb") as infile:
+                for chunk in iter(lambda: infile.read(1 << 20), b""):
+                    h.update(chunk)
+    return h.hexdigest()
+
+
+class TaxonomyCache(object):
+    """
+    Reads and writes snapshot images of Taxonomy components.
+
+    Args:
+        taxonomy_dir (str): directory containing the taxonomy, defaults to constants.SOLAR_TAXONOMY_DIR.
+        cache_dir (str): directory holding the images, defaults to constants.TAXONOMY_CACHE_DIR or to
+            constants.DEFAULT_TAXONOMY_CACHE_DIR if OBLIB_CACHE_DIR is not set.
+    """
+
+    def __init__(self, taxonomy_dir=None, cache_dir=None):
+        """Taxonomy cache constructor."""
+
+        if taxonomy_dir is None:
+            taxonomy_dir = constants.SOLAR_TAXONOMY_DIR
+        if cache_dir is None:
+            cache_dir = constants.TAXONOMY_CACHE_DIR or constants.DEFAULT_TAXONOMY_CACHE_DIR
+        self._taxonomy_dir = taxonomy_dir
+        self._cache_dir = cache_dir
+        self._key = None
+
+    def key(self):
+        """
+        Used to access the cache key for the taxonomy directory.
+
+        The key is a hash of the taxonomy directory (see hash_taxonomy_dir), the cache format version and
+        the Python major version.  It is computed once per TaxonomyCache.
+
+        Returns:
+            A string containing the hex digest of the key.
+        """
+
+        if self._key is None:
+            h = hashlib.sha1()
+            h.update("{}:{}:{}".format(CACHE_FORMAT_VERSION, sys.version_info[0],
+                                       hash_taxonomy_dir(self._taxonomy_dir)).encode("utf-8"))
+            self._key = h.hexdigest()
+        return self._key
+
+    def _image_pathname(self, component):
+        return os.path.join(self._cache_dir, self.key(), component + _IMAGE_EXTENSION)
+
+    def load(self, component):
+        """
+        Reads a component image back.
+
+        Args:
+            component (str): name of the component, for example "semantic" or "units".
+
+        Returns:
+            The component object or None if there is no usable image.  Stale images are never found since
+            they are stored under a different key, corrupt images are removed.
+        """
+
+        pathname = self._image_pathname(component)
+        try:
+            with open(pathname, "rb") as infile:
+                return pickle.load(infile)
+        except (IOError, OSError):
+            return None
+        except Exception:
+            # Anything else means the image is corrupt or was written by an incompatible version.
+            self._remove(pathname)
+            return None
+
+    def save(self, component, obj):
+        """
+        Writes a component image.  Failures (for instance a read-only cache directory) are ignored since
+        the cache is only an optimization.
+
+        Args:
+            component (str): name of the component, for example "semantic" or "units".
+            obj (object): component to write.
+
+        Returns:
+            True if the image was written, False otherwise.
+        """
+
+        pathname = self._image_pathname(component)
+        temp_name = None
+        try:
+            dirname = os.path.dirname(pathname)
+            if not os.path.isdir(dirname):
+                os.makedirs(dirname)
+            # Write to a temporary file and rename so that a concurrent reader never sees a partial image.
+            fd, temp_name = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+            with os.fdopen(fd, "wb") as outfile:
+                pickle.dump(obj, outfile, pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_name, pathname)
+            return True
+        except Exception:
+            if temp_name is not None:
+                self._remove(temp_name)
+            return False
+
+    def invalidate(self):
+        """
+        Removes all images from the cache directory, including images for other keys.  The next load of
+        the Taxonomy performs a full parse and writes new images.
+        """
+
+        if not os.path.isdir(self._cache_dir):
+            return
+        for name in os.listdir(self._cache_dir):
+            pathname = os.path.join(self._cache_dir, name)
+            # Only remove directories named like a key in case the cache directory is shared.
+            if os.path.isdir(pathname) and _KEY_REGEX.match(name):
+                shutil.rmtree(pathname, ignore_errors=True)
+
+    def _remove(self, pathname):
+        try:
+            os.remove(pathname)
+        except (IOError, OSError):
+            pass
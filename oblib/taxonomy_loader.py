@@ -14,6 +14,8 @@
 
 """Handles Loading of Orange Button Taxonomy.  No external functionality exposed."""
 
+import concurrent.futures
+import xml.parsers.expat
 import xml.sax
 import os
 import sys
@@ -21,13 +23,34 @@ import sys
 from oblib import constants, util, taxonomy
 
 
+def _load_file(args):
+    """
+    Calls a TaxonomyLoader _load_*_file method.  Used by the parallel load mode to parse a single file in
+    a worker process, which is why it is a module level function.
+
+    Args:
+        args (tuple): method name, taxonomy directory, backend and pathname of the file to parse.
+
+    Returns:
+        The result of the _load_*_file method.
+    """
+    method_name, taxonomy_dir, backend, pathname = args
+    return getattr(TaxonomyLoader(taxonomy_dir, backend=backend), method_name)(pathname)
+
+
+# Concept names, type names, orders and weights repeat across thousands of elements, relationships and
+# calculations, so the handlers sys.intern() them and all records share a single copy of each string.
+
+
 class _TaxonomyUnitsHandler(xml.sax.ContentHandler):
     """Loads Taxonomy Units from the units type registry file."""
 
     def __init__(self):
         self._units = {}
+        self._content = ""
 
     def startElement(self, name, attrs):
+        self._content = ""
         if name == "unit":
             for item in attrs.items():
                 if item[0] == "id":
@@ -40,7 +63,8 @@ class _TaxonomyUnitsHandler(xml.sax.ContentHandler):
                     self._curr.append(item[1])
 
     def characters(self, content):
-        self._content = content
+        # Text may be delivered in several pieces (for instance around entity references).
+        self._content += content
 
     def endElement(self, name):
         if name == "unitId":
@@ -49,9 +73,9 @@ class _TaxonomyUnitsHandler(xml.sax.ContentHandler):
         elif name == "unitName":
             self._curr.unit_name = self._content
         elif name == "nsUnit":
-            self._curr.ns_unit = self._content
+            self._curr.ns_unit = sys.intern(self._content)
         elif name == "itemType":
-            self._curr.item_type = self._content
+            self._curr.item_type = sys.intern(self._content)
         elif name == "itemTypeDate":
             self._curr.item_type_date = util.convert_taxonomy_xsd_date(self._content)
         elif name == "symbol":
@@ -141,18 +165,22 @@ class _TaxonomyGenericRolesHandler(xml.sax.ContentHandler):
         """Generic role handler constructor."""
         self._generic_roles = []
         self._process = False
+        self._content = ""
 
     def startElement(self, name, attrs):
         if name == "link:definition":
             self._process = True
+            self._content = ""
 
     def endElement(self, name):
         if name == "link:definition":
             self._process = False
+            if self._content:
+                self._generic_roles.append(self._content)
 
     def characters(self, content):
         if self._process:
-            self._generic_roles.append(content)
+            self._content += content
 
     def roles(self):
         return self._generic_roles
@@ -184,10 +212,13 @@ class _TaxonomyDocumentationHandler(xml.sax.ContentHandler):
                     role = item[1]
         if concept is not None and role == constants.ROLE_DOCUMENTATION:
             self._awaiting_text_for_concept = concept
+            self._text = ""
 
     def characters(self, chars):
         if self._awaiting_text_for_concept is not None:
-            self._documentation[ self._awaiting_text_for_concept] = chars
+            # Text may be delivered in several pieces (for instance around entity references).
+            self._text += chars
+            self._documentation[self._awaiting_text_for_concept] = self._text
 
     def endElement(self, name):
         self._awaiting_text_for_concept = None
@@ -208,8 +239,10 @@ class _EntrypointsHandler(xml.sax.ContentHandler):
     def __init__(self):
         self._entrypoints = {}
         self._curr = None
+        self._content = ""
 
     def startElement(self, name, attrs):
+        self._content = ""
         if name == "tp:entryPoint":
             self._curr = taxonomy.Entrypoint()
 
@@ -219,7 +252,7 @@ class _EntrypointsHandler(xml.sax.ContentHandler):
                     self._curr._path = item[1]
 
     def characters(self, content):
-        self._content = content
+        self._content += content
 
     def endElement(self, name):
         if name == "tp:entryPoint":
@@ -250,11 +283,13 @@ class _ElementsHandler(xml.sax.ContentHandler):
     This extracts the metadata for each concept name, such as the datatype
     of the concept, whether it's nillable, etc.
     As a SAX parser, it streams the XML, and startElement() is called
-    once for each element in the file.
+    once for each element in the file.  If ids is given only the elements
+    with those ids are kept.
     """
 
-    def __init__(self):
+    def __init__(self, ids=None):
         self._elements = {}
+        self._ids = ids
 
     def startElement(self, name, attrs):
         if name == "xs:element":
@@ -271,9 +306,9 @@ class _ElementsHandler(xml.sax.ContentHandler):
                     # in the id field as
                     # solar_InverterPowerLevel10PercentMember_1. We want
                     # to replace the first underscore but not the second.
-                    element.id = item[1].replace("_", ":", 1)
+                    element.id = sys.intern(item[1].replace("_", ":", 1))
                 elif item[0] == "name":
-                    element.name = item[1]
+                    element.name = sys.intern(item[1])
                 elif item[0] == "nillable":
                     element.nillable = util.convert_taxonomy_xsd_bool(item[1])
                 elif item[0] == "solar:periodIndependent":
@@ -281,12 +316,13 @@ class _ElementsHandler(xml.sax.ContentHandler):
                 elif item[0] == "substitutionGroup":
                     element.substitution_group = taxonomy.SubstitutionGroup(item[1])
                 elif item[0] == "type":
-                    element.type_name = item[1]
+                    element.type_name = sys.intern(item[1])
                 elif item[0] == "xbrldt:typedDomainRef":
-                    element.typed_domain_ref = item[1]
+                    element.typed_domain_ref = sys.intern(item[1])
                 elif item[0] == "xbrli:periodType":
                     element.period_type = taxonomy.PeriodType(item[1])
-            self._elements[element.id] = element
+            if self._ids is None or element.id in self._ids:
+                self._elements[element.id] = element
 
     def elements(self):
         return self._elements
@@ -308,7 +344,7 @@ class _TaxonomySemanticHandler(xml.sax.ContentHandler):
         if name == "loc":
             for item in attrs.items():
                 if item[0] == "xlink:label":
-                    concept = item[1].replace("_", ":", 1)
+                    concept = sys.intern(item[1].replace("_", ":", 1))
                     self._concepts.append(concept)
 
     def concepts(self):
@@ -336,11 +372,11 @@ class _TaxonomyRelationshipHandler(xml.sax.ContentHandler):
                 if item[0] == "xlink:arcrole":
                     relationship.role = taxonomy.RelationshipRole(item[1].split("/")[-1])
                 if item[0] == "xlink:from":
-                    relationship.from_ = item[1].replace("_", ":", 1)
+                    relationship.from_ = sys.intern(item[1].replace("_", ":", 1))
                 if item[0] == "xlink:to":
-                    relationship.to = item[1].replace("_", ":", 1)
+                    relationship.to = sys.intern(item[1].replace("_", ":", 1))
                 if item[0] == "order":
-                    relationship.order = item[1]
+                    relationship.order = sys.intern(item[1])
             self._relationships.append(relationship)
             # Question TBD: do we need to remember which document definition
             # this relationship came from? would the same concepts ever have
@@ -371,13 +407,13 @@ class _TaxonomyCalculationHandler(xml.sax.ContentHandler):
                 if item[0] == "xlink:arcrole":
                     calculation.role = taxonomy.CalculationRole(item[1].split("/")[-1])
                 if item[0] == "xlink:from":
-                    calculation.from_ = item[1].replace("_", ":", 1)
+                    calculation.from_ = sys.intern(item[1].replace("_", ":", 1))
                 if item[0] == "xlink:to":
-                    calculation.to = item[1].replace("_", ":", 1)
+                    calculation.to = sys.intern(item[1].replace("_", ":", 1))
                 if item[0] == "order":
-                    calculation.order = item[1]
+                    calculation.order = sys.intern(item[1])
                 if item[0] == "weight":
-                    calculation.weight = item[1]
+                    calculation.weight = sys.intern(item[1])
             self._calculations.append(calculation)
             # Question TBD: do we need to remember which document definition
             # this calculation came from? would the same concepts ever have
@@ -387,32 +423,466 @@ class _TaxonomyCalculationHandler(xml.sax.ContentHandler):
         return self._calculations
 
 
+# Enum members by value, looked up by the expat handlers instead of calling the enum classes.
+_SUBSTITUTION_GROUPS = {e.value: e for e in taxonomy.SubstitutionGroup}
+_PERIOD_TYPES = {e.value: e for e in taxonomy.PeriodType}
+_RELATIONSHIP_ROLES = {e.value: e for e in taxonomy.RelationshipRole}
+
+_xsd_bools = {}
+
+
+def _xsd_bool(value):
+    """Memoized util.convert_taxonomy_xsd_bool, the taxonomy only uses a handful of spellings."""
+    b = _xsd_bools.get(value)
+    if b is None:
+        b = _xsd_bools[value] = util.convert_taxonomy_xsd_bool(value)
+    return b
+
+
+class _ExpatHandler(object):
+    """
+    Base class for the handlers of the "expat" loader backend.
+
+    Each handler produces the same result as the xml.sax handler of the same file type but is called
+    by pyexpat directly with the attributes in a dict, so attributes are looked up instead of looping
+    over all of them, and character data is delivered in one piece.
+    """
+
+    start_element = None
+    end_element = None
+    character_data = None
+
+    def parse(self, pathname):
+        parser = xml.parsers.expat.ParserCreate()
+        parser.buffer_text = True
+        parser.buffer_size = 1 << 16
+        if self.start_element is not None:
+            parser.StartElementHandler = self.start_element
+        if self.end_element is not None:
+            parser.EndElementHandler = self.end_element
+        if self.character_data is not None:
+            parser.CharacterDataHandler = self.character_data
+        with open(pathname, "rb") as infile:
+            parser.ParseFile(infile)
+        return self
+
+
+class _ExpatUnitsHandler(_ExpatHandler):
+    """Loads Taxonomy Units from the units type registry file."""
+
+    _FIELDS = {
+        "unitName": "unit_name",
+        "nsUnit": "ns_unit",
+        "itemType": "item_type",
+        "symbol": "symbol",
+        "definition": "definition"
+    }
+
+    # Fields shared by many units.
+    _INTERNED = {"ns_unit", "item_type"}
+
+    def __init__(self):
+        self._units = {}
+        self._curr = None
+        self._content = ""
+
+    def start_element(self, name, attrs):
+        self._content = ""
+        if name == "unit":
+            if "id" in attrs:
+                self._curr = taxonomy.Unit()
+                self._curr.id = attrs["id"]
+
+    def character_data(self, content):
+        self._content += content
+
+    def end_element(self, name):
+        field = self._FIELDS.get(name)
+        if field is not None:
+            if field in self._INTERNED:
+                self._content = sys.intern(self._content)
+            setattr(self._curr, field, self._content)
+        elif name == "unitId":
+            self._curr.unit_id = self._content
+            self._units[self._content] = self._curr
+        elif name == "itemTypeDate":
+            self._curr.item_type_date = util.convert_taxonomy_xsd_date(self._content)
+        elif name == "baseStandard":
+            self._curr.base_standard = taxonomy.BaseStandard(self._content)
+        elif name == "status":
+            self._curr.status = taxonomy.UnitStatus(self._content)
+        elif name == "versionDate":
+            self._curr.version_date = util.convert_taxonomy_xsd_date(self._content)
+
+    def units(self):
+        return self._units
+
+
+class _ExpatTypesHandler(_ExpatHandler):
+    """Loads Taxonomy Types from the solar types xsd file."""
+
+    def __init__(self):
+        self._types = {}
+        self._curr = None
+
+    def start_element(self, name, attrs):
+        if name == "complexType":
+            if "name" in attrs:
+                self._curr = []
+                name = attrs["name"]
+                if ":" not in name:
+                    name = "solar-types:" + name
+                self._types[name] = self._curr
+        elif name == "xs:enumeration":
+            if "value" in attrs:
+                self._curr.append(attrs["value"])
+
+    def types(self):
+        return self._types
+
+
+class _ExpatNumericHandler(_ExpatHandler):
+    """Loads Taxonomy Numeric Types from the numeric us xsd file."""
+
+    def __init__(self):
+        self._numeric_types = []
+
+    def start_element(self, name, attrs):
+        if name == "complexType":
+            if "name" in attrs:
+                name = attrs["name"]
+                if ":" not in name:
+                    name = "num-us:" + name
+                self._numeric_types.append(name)
+
+    def numeric_types(self):
+        return self._numeric_types
+
+
+class _ExpatRefPartsHandler(_ExpatHandler):
+    """Loads Taxonomy Ref Parts from the ref parts xsd file."""
+
+    def __init__(self):
+        self._ref_parts = []
+
+    def start_element(self, name, attrs):
+        if name == "xs:element":
+            if "name" in attrs:
+                self._ref_parts.append(attrs["name"])
+
+    def ref_parts(self):
+        return self._ref_parts
+
+
+class _ExpatGenericRolesHandler(_ExpatHandler):
+    """Loads Taxonomy Generic Roles from the generic roles xsd file."""
+
+    def __init__(self):
+        self._generic_roles = []
+        self._process = False
+        self._content = ""
+
+    def start_element(self, name, attrs):
+        if name == "link:definition":
+            self._process = True
+            self._content = ""
+
+    def end_element(self, name):
+        if name == "link:definition":
+            self._process = False
+            if self._content:
+                self._generic_roles.append(self._content)
+
+    def character_data(self, content):
+        if self._process:
+            self._content += content
+
+    def roles(self):
+        return self._generic_roles
+
+
+class _ExpatDocumentationHandler(_ExpatHandler):
+    """Loads Taxonomy Docstrings from Labels file"""
+
+    def __init__(self):
+        self._documentation = {}
+        self._awaiting_text_for_concept = None
+
+    def start_element(self, name, attrs):
+        # See _TaxonomyDocumentationHandler for why the xlink:label attribute is used.
+        if name == "label" and "xlink:label" in attrs and attrs.get("xlink:role") == constants.ROLE_DOCUMENTATION:
+            self._awaiting_text_for_concept = attrs["xlink:label"].replace("label_solar_", "solar:")
+            self._text = ""
+
+    def character_data(self, chars):
+        if self._awaiting_text_for_concept is not None:
+            self._text += chars
+            self._documentation[self._awaiting_text_for_concept] = self._text
+
+    def end_element(self, name):
+        self._awaiting_text_for_concept = None
+
+    def docstrings(self):
+        return self._documentation
+
+
+class _ExpatEntrypointsHandler(_ExpatHandler):
+    """Reads the base entrypoints definitions (see _EntrypointsHandler)."""
+
+    def __init__(self):
+        self._entrypoints = {}
+        self._curr = None
+        self._content = ""
+
+    def start_element(self, name, attrs):
+        self._content = ""
+        if name == "tp:entryPoint":
+            self._curr = taxonomy.Entrypoint()
+        elif name == "tp:entryPointDocument":
+            if "href" in attrs:
+                self._curr._path = attrs["href"]
+
+    def character_data(self, content):
+        self._content += content
+
+    def end_element(self, name):
+        if name == "tp:entryPoint":
+            # For now do not save the Full Solar Entry Point (this is hardcoded in the software as ALL).
+            if self._curr.full_name != "Full Solar Entry Point":
+                self._entrypoints[self._curr.name] = self._curr
+        if name == "tp:name":
+            # Split this up unless this is a top level name as well which can be skipped.
+            if self._curr:
+                self._curr.full_name = self._content
+                if self._curr.full_name != "Full Solar Entry Point":
+                    parts = self._content.split(" - ")
+                    self._curr.number = int(parts[0])
+                    self._curr.entrypoint_type = taxonomy.EntrypointType(parts[1])
+                    self._curr.name = parts[2].replace(" ", "").replace(",", "")
+        elif name == "tp:description":
+            # There is a top level description as well which can be skipped.
+            if self._curr:
+                self._curr.description = self._content
+
+    def entrypoints(self):
+        return self._entrypoints
+
+
+class _ExpatElementsHandler(_ExpatHandler):
+    """
+    Reads the element xsds (see _ElementsHandler).  If ids is given only the elements with those ids
+    are kept.
+    """
+
+    def __init__(self, ids=None):
+        self._elements = {}
+        self._ids = ids
+
+    def start_element(self, name, attrs):
+        if name == "xs:element":
+            element_id = attrs.get("id")
+            if element_id is not None:
+                # Turn the first underscore (only the first) into a colon.
+                element_id = sys.intern(element_id.replace("_", ":", 1))
+            if self._ids is not None and element_id not in self._ids:
+                return
+            element = taxonomy.ConceptDetails()
+            element.id = element_id
+            value = attrs.get("abstract")
+            if value is not None:
+                element.abstract = _xsd_bool(value)
+            value = attrs.get("name")
+            if value is not None:
+                element.name = sys.intern(value)
+            value = attrs.get("nillable")
+            if value is not None:
+                element.nillable = _xsd_bool(value)
+            value = attrs.get("solar:periodIndependent")
+            if value is not None:
+                element.period_independent = _xsd_bool(value)
+            value = attrs.get("substitutionGroup")
+            if value is not None:
+                element.substitution_group = _SUBSTITUTION_GROUPS.get(value) or taxonomy.SubstitutionGroup(value)
+            value = attrs.get("type")
+            if value is not None:
+                element.type_name = sys.intern(value)
+            value = attrs.get("xbrldt:typedDomainRef")
+            if value is not None:
+                element.typed_domain_ref = sys.intern(value)
+            value = attrs.get("xbrli:periodType")
+            if value is not None:
+                element.period_type = _PERIOD_TYPES.get(value) or taxonomy.PeriodType(value)
+            self._elements[element_id] = element
+
+    def elements(self):
+        return self._elements
+
+
+class _ExpatSemanticHandler(_ExpatHandler):
+    """Reads the list of concept names from a presentation file (see _TaxonomySemanticHandler)."""
+
+    def __init__(self):
+        self._concepts = []
+
+    def start_element(self, name, attrs):
+        if name == "loc":
+            if "xlink:label" in attrs:
+                self._concepts.append(sys.intern(attrs["xlink:label"].replace("_", ":", 1)))
+
+    def concepts(self):
+        return self._concepts
+
+
+class _ExpatRelationshipHandler(_ExpatHandler):
+    """Reads the relationships from a definition file (see _TaxonomyRelationshipHandler)."""
+
+    def __init__(self):
+        self._relationships = []
+
+    def start_element(self, name, attrs):
+        if name == "definitionArc":
+            relationship = taxonomy.Relationship()
+            if "xlink:arcrole" in attrs:
+                role = attrs["xlink:arcrole"].split("/")[-1]
+                relationship.role = _RELATIONSHIP_ROLES.get(role) or taxonomy.RelationshipRole(role)
+            if "xlink:from" in attrs:
+                relationship.from_ = sys.intern(attrs["xlink:from"].replace("_", ":", 1))
+            if "xlink:to" in attrs:
+                relationship.to = sys.intern(attrs["xlink:to"].replace("_", ":", 1))
+            if "order" in attrs:
+                relationship.order = sys.intern(attrs["order"])
+            self._relationships.append(relationship)
+
+    def relationships(self):
+        return self._relationships
+
+
+class _ExpatCalculationHandler(_ExpatHandler):
+    """Reads the calculations from the calculation file (see _TaxonomyCalculationHandler)."""
+
+    def __init__(self):
+        self._calculations = []
+
+    def start_element(self, name, attrs):
+        if name == "calculationArc":
+            calculation = taxonomy.Calculation()
+            if "xlink:arcrole" in attrs:
+                calculation.role = taxonomy.CalculationRole(attrs["xlink:arcrole"].split("/")[-1])
+            if "xlink:from" in attrs:
+                calculation.from_ = sys.intern(attrs["xlink:from"].replace("_", ":", 1))
+            if "xlink:to" in attrs:
+                calculation.to = sys.intern(attrs["xlink:to"].replace("_", ":", 1))
+            if "order" in attrs:
+                calculation.order = sys.intern(attrs["order"])
+            if "weight" in attrs:
+                calculation.weight = sys.intern(attrs["weight"])
+            self._calculations.append(calculation)
+
+    def calculations(self):
+        return self._calculations
+
+
 class TaxonomyLoader(object):
 
     """
     Class for Taxonomy loading.
 
     Use this class to load the Taxonomy
+
+    Args:
+        taxonomy_dir (str): directory containing the taxonomy, defaults to constants.SOLAR_TAXONOMY_DIR.
+        parallel (boolean): default False.  If True the independent taxonomy files (presentation and
+            definition linkbases of each entrypoint, element xsds) are parsed in a pool of worker
+            processes and the results are merged.
+        max_workers (int): maximum number of worker processes in parallel mode, defaults to the number
+            of processors.
+        backend (str): default "sax".  XML parser used to read the taxonomy files, one of BACKENDS.
+            "sax" uses the xml.sax handlers, "expat" drives pyexpat directly with dict attribute lookups
+            which is faster and gives identical results.
     """
 
-    def __init__(self):
+    BACKENDS = ["sax", "expat"]
+
+    def __init__(self, taxonomy_dir=None, parallel=False, max_workers=None, backend="sax"):
         """Taxonomy Loader constructor."""
-        pass
+        if taxonomy_dir is None:
+            taxonomy_dir = constants.SOLAR_TAXONOMY_DIR
+        if backend not in self.BACKENDS:
+            raise ValueError("Unknown taxonomy loader backend {}, expected one of {}".format(
+                backend, ", ".join(self.BACKENDS)))
+        self._taxonomy_dir = taxonomy_dir
+        self._parallel = parallel
+        self._max_workers = max_workers
+        self._backend = backend
 
 
     def load(self):
         """"Load and return a Taxonomy."""
         pass
 
-    def _load_numeric_types_file(self, pathname):
-        tax = _TaxonomyNumericHandler()
+    def _parse(self, handler, pathname, encoding=None):
+        """Parses a file with a xml.sax handler, the file is closed afterwards."""
         parser = xml.sax.make_parser()
-        parser.setContentHandler(tax)
-        parser.parse(open(pathname))
-        return tax.numeric_types()
+        parser.setContentHandler(handler)
+        if encoding is None or sys.version_info[0] < 3:
+            with open(pathname, 'r') as infile:
+                parser.parse(infile)
+        else:
+            with open(pathname, 'r', encoding=encoding) as infile:
+                parser.parse(infile)
+        return handler
+
+    def _load_files(self, method_name, pathnames):
+        """
+        Calls the named _load_*_file method for each pathname, in worker processes when running in
+        parallel mode.
+
+        Returns:
+            A list of results in the same order as pathnames.
+        """
+        if self._parallel and len(pathnames) > 1:
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self._max_workers) as executor:
+                # Send several files per task since most linkbases are small.
+                chunksize = max(1, len(pathnames) // ((self._max_workers or os.cpu_count() or 1) * 4))
+                return list(executor.map(_load_file, [(method_name, self._taxonomy_dir, self._backend, pathname)
+                                                        for pathname in pathnames],
+                                         chunksize=chunksize))
+        method = getattr(self, method_name)
+        return [method(pathname) for pathname in pathnames]
+
+    def _entrypoint_files(self, kind):
+        """
+        Finds the linkbase files for all entrypoints.
+
+        Args:
+            kind (str): "pre." for presentation linkbases or "def." for definition linkbases.
+
+        Returns:
+            A list of (entrypoint name, pathname) tuples.  The "All" entrypoint is last.
+        """
+        files = []
+        for dirname in ["data", "documents", "process"]:
+            for filename in os.listdir(os.path.join(self._taxonomy_dir, dirname)):
+                if kind in filename:
+                    concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
+                    files.append((concept_name, os.path.join(self._taxonomy_dir, dirname, filename)))
+
+        # load from "/core/" for the "All" entrypoint:
+        if kind == "pre.":
+            files.append(("All", os.path.join(self._taxonomy_dir, "core",
+                                              constants.SOLAR_ALL_PRE_XML)))
+        else:
+            files.append(("All", os.path.join(self._taxonomy_dir, "core",
+                                              constants.TAXONOMY_ALL_FILENAME)))
+        return files
+
+    def _load_numeric_types_file(self, pathname):
+        if self._backend == "expat":
+            return _ExpatNumericHandler().parse(pathname).numeric_types()
+        return self._parse(_TaxonomyNumericHandler(), pathname).numeric_types()
 
     def _load_numeric_types(self):
-        pathname = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core")
+        pathname = os.path.join(self._taxonomy_dir, "core")
         for filename in os.listdir(pathname):
             if 'numeric' in filename:
                 numeric_types = self._load_numeric_types_file(os.path.join(
@@ -420,14 +890,12 @@ class TaxonomyLoader(object):
         return numeric_types
 
     def _load_generic_roles_file(self, pathname):
-        tax = _TaxonomyGenericRolesHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(tax)
-        parser.parse(open(pathname))
-        return tax.roles()
+        if self._backend == "expat":
+            return _ExpatGenericRolesHandler().parse(pathname).roles()
+        return self._parse(_TaxonomyGenericRolesHandler(), pathname).roles()
 
     def _load_generic_roles(self):
-        pathname = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core")
+        pathname = os.path.join(self._taxonomy_dir, "core")
         for filename in os.listdir(pathname):
             if 'gen-roles' in filename:
                 generic_roles = self._load_generic_roles_file(os.path.join(
@@ -435,170 +903,105 @@ class TaxonomyLoader(object):
         return generic_roles
 
     def _load_ref_parts_file(self, pathname):
-        tax = _TaxonomyRefPartsHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(tax)
-        parser.parse(open(pathname))
-        return tax.ref_parts()
+        if self._backend == "expat":
+            return _ExpatRefPartsHandler().parse(pathname).ref_parts()
+        return self._parse(_TaxonomyRefPartsHandler(), pathname).ref_parts()
 
     def _load_ref_parts(self):
-        pathname = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core")
+        pathname = os.path.join(self._taxonomy_dir, "core")
         for filename in os.listdir(pathname):
             if 'ref-parts' in filename:
                 ref_parts = self._load_ref_parts_file(os.path.join(pathname,
                                                                    filename))
         return ref_parts
 
+    def _load_documentation_file(self, pathname):
+        if self._backend == "expat":
+            return _ExpatDocumentationHandler().parse(pathname).docstrings()
+        return self._parse(_TaxonomyDocumentationHandler(), pathname).docstrings()
+
     def _load_documentation(self):
         label_file = constants.SOLAR_LAB_XML
-        filename = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core", label_file)
-
-        taxonomy = _TaxonomyDocumentationHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        parser.parse(open(filename))
-        return taxonomy._documentation
+        return self._load_documentation_file(os.path.join(self._taxonomy_dir, "core", label_file))
 
     def _load_types_file(self, pathname):
-        taxonomy = _TaxonomyTypesHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        parser.parse(open(pathname))
-        return taxonomy.types()
+        if self._backend == "expat":
+            return _ExpatTypesHandler().parse(pathname).types()
+        return self._parse(_TaxonomyTypesHandler(), pathname).types()
 
     def _load_types(self):
-        pathname = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core")
+        pathname = os.path.join(self._taxonomy_dir, "core")
         for filename in os.listdir(pathname):
             if 'types' in filename:
                 types = self._load_types_file(os.path.join(pathname, filename))
         return types
 
     def _load_units_file(self, fn):
-        taxonomy = _TaxonomyUnitsHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        if sys.version_info[0] < 3:
-            # python 2.x
-            with open(fn, 'r') as infile:
-                parser.parse(infile)
-        else:
-            with open(fn, 'r', encoding='utf8') as infile:
-                parser.parse(infile)
-        return taxonomy.units()
+        if self._backend == "expat":
+            return _ExpatUnitsHandler().parse(fn).units()
+        return self._parse(_TaxonomyUnitsHandler(), fn, encoding='utf8').units()
 
     def _load_units(self):
-        pathname = os.path.join(constants.SOLAR_TAXONOMY_DIR, "external")
+        pathname = os.path.join(self._taxonomy_dir, "external")
         filename = "utr.xml"
         units = self._load_units_file(os.path.join(pathname, filename))
         return units
 
-    def _load_entrypoints_file(selfs, pathname):
-        eh = _EntrypointsHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(eh)
-        parser.parse(open(pathname))
-        return eh.entrypoints()
+    def _load_entrypoints_file(self, pathname):
+        if self._backend == "expat":
+            return _ExpatEntrypointsHandler().parse(pathname).entrypoints()
+        return self._parse(_EntrypointsHandler(), pathname).entrypoints()
 
-    def _load_elements_file(self, pathname):
-        eh = _ElementsHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(eh)
-        parser.parse(open(pathname))
-        return eh.elements()
+    def _load_elements_file(self, pathname, ids=None):
+        if self._backend == "expat":
+            return _ExpatElementsHandler(ids).parse(pathname).elements()
+        return self._parse(_ElementsHandler(ids), pathname).elements()
+
+    def _load_entrypoints(self):
+        return self._load_entrypoints_file(os.path.join(
+            self._taxonomy_dir, "META-INF", "taxonomyPackage.xml"))
+
+    def _element_files(self):
+        """Returns the pathnames of the element xsds (solar, us-gaap and dei)."""
+        return [os.path.join(self._taxonomy_dir, "core", constants.SOLAR_XSD),
+                os.path.join(self._taxonomy_dir, "external", constants.US_GAAP_XSD),
+                os.path.join(self._taxonomy_dir, "external", constants.DEI_XSD)]
 
     def _load_entrypoints_concept_details(self):
-        entrypoints = self._load_entrypoints_file(os.path.join(
-            constants.SOLAR_TAXONOMY_DIR, "META-INF", "taxonomyPackage.xml"))
-
-        elements = self._load_elements_file(os.path.join(
-            constants.SOLAR_TAXONOMY_DIR, "core",
-            constants.SOLAR_XSD))
-        elements.update(self._load_elements_file(os.path.join(
-            constants.SOLAR_TAXONOMY_DIR, "external",
-            constants.US_GAAP_XSD)))
-        elements.update(self._load_elements_file(os.path.join(
-            constants.SOLAR_TAXONOMY_DIR, "external",
-            constants.DEI_XSD)))
+        entrypoints = self._load_entrypoints()
+
+        elements = {}
+        for e in self._load_files("_load_elements_file", self._element_files()):
+            elements.update(e)
         return entrypoints, elements
 
     def _load_concepts_file(self, pathname):
-        taxonomy = _TaxonomySemanticHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        parser.parse(open(pathname))
-        return taxonomy.concepts()
+        if self._backend == "expat":
+            return _ExpatSemanticHandler().parse(pathname).concepts()
+        return self._parse(_TaxonomySemanticHandler(), pathname).concepts()
 
     def _load_concepts(self):
         """Return a dict of available concepts."""
 
-        concepts = {}
-
-        for filename in os.listdir(
-                os.path.join(constants.SOLAR_TAXONOMY_DIR, "data")):
-            # if 'def.' in filename:
-            if 'pre.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                concepts[concept_name] = self._load_concepts_file(
-                    os.path.join(constants.SOLAR_TAXONOMY_DIR,
-                                 "data", filename))
-        for filename in os.listdir(
-                os.path.join(constants.SOLAR_TAXONOMY_DIR, "documents")):
-            # if 'def.' in filename:
-            if 'pre.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                concepts[concept_name] = self._load_concepts_file(
-                    os.path.join(constants.SOLAR_TAXONOMY_DIR,
-                                 "documents", filename))
-
-        for filename in os.listdir(
-                os.path.join(constants.SOLAR_TAXONOMY_DIR, "process")):
-            # if 'def.' in filename:
-            if 'pre.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                concepts[concept_name] = self._load_concepts_file(
-                    os.path.join(constants.SOLAR_TAXONOMY_DIR,
-                                 "process", filename))
+        files = self._entrypoint_files("pre.")
+        concepts = self._load_files("_load_concepts_file", [pathname for _, pathname in files])
+        return dict(zip([concept_name for concept_name, _ in files], concepts))
 
-        # load from "/core/" for the "All" entrypoint:
-        concepts["All"] = self._load_concepts_file(
-            os.path.join(constants.SOLAR_TAXONOMY_DIR, "core",
-                         constants.SOLAR_ALL_PRE_XML))
-        return concepts
-
-    def _load_relationships_file(self, fn):
-        taxonomy = _TaxonomyRelationshipHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        parser.parse(open(os.path.join(constants.SOLAR_TAXONOMY_DIR, fn)))
-        return taxonomy.relationships()
+    def _load_relationships_file(self, pathname):
+        if self._backend == "expat":
+            return _ExpatRelationshipHandler().parse(pathname).relationships()
+        return self._parse(_TaxonomyRelationshipHandler(), pathname).relationships()
 
     def _load_relationships(self):
-        relationships = {}
-        for filename in os.listdir(os.path.join(constants.SOLAR_TAXONOMY_DIR, "data")):
-            if 'def.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                relationships[concept_name] = self._load_relationships_file(os.path.join("data", filename))
-
-        for filename in os.listdir(os.path.join(constants.SOLAR_TAXONOMY_DIR, "documents")):
-            if 'def.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                relationships[concept_name] = self._load_relationships_file(os.path.join("documents", filename))
-
-        for filename in os.listdir(os.path.join(constants.SOLAR_TAXONOMY_DIR, "process")):
-            if 'def.' in filename:
-                concept_name = filename[filename.find("solar-") + 6:filename.find("_2020")]
-                relationships[concept_name] = self._load_relationships_file(os.path.join("process", filename))
+        files = self._entrypoint_files("def.")
+        relationships = self._load_files("_load_relationships_file", [pathname for _, pathname in files])
+        return dict(zip([concept_name for concept_name, _ in files], relationships))
 
-        # load from "/core/" for the "All" entrypoint:
-        relationships["All"] = self._load_relationships_file(
-            os.path.join(constants.SOLAR_TAXONOMY_DIR, "core",
-                         constants.TAXONOMY_ALL_FILENAME))
-
-        return relationships
+    def _load_calculations_file(self, pathname):
+        if self._backend == "expat":
+            return _ExpatCalculationHandler().parse(pathname).calculations()
+        return self._parse(_TaxonomyCalculationHandler(), pathname).calculations()
 
     def _load_calculations(self):
-        taxonomy = _TaxonomyCalculationHandler()
-        parser = xml.sax.make_parser()
-        parser.setContentHandler(taxonomy)
-        parser.parse(open(os.path.join(constants.SOLAR_TAXONOMY_DIR, "core", constants.SOLAR_CALCULATION_XML)))
-        return taxonomy.calculations()
+        return self._load_calculations_file(os.path.join(self._taxonomy_dir, "core",
+                                                         constants.SOLAR_CALCULATION_XML))
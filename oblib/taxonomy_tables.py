@@ -0,0 +1,541 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Handles the compact read-only table files of the semantic and units Taxonomy components.
+
+A table file holds a string table and sections of fixed-width records (concept details, relationships,
+units, etc.) that refer to strings by index.  Processes attach to the file with a read-only memory map
+instead of parsing the taxonomy XML files, so the operating system shares the pages between every
+process attached to the same file.  Records are decoded when they are accessed: the TaxonomySemantic
+and TaxonomyUnits objects of an attached file hold read-only Mapping and Sequence views in place of
+their usual dicts and lists.
+
+Typical usage:
+::
+    tax = taxonomy.Taxonomy()
+    tax.export_tables("/var/lib/oblib")                 # once, for instance at deployment
+    tax = taxonomy.Taxonomy(tables_dir="/var/lib/oblib")  # in each worker process
+::
+"""
+
+import collections.abc
+import mmap
+import os
+import struct
+import tempfile
+
+from oblib import taxonomy, util
+
+
+# Increase whenever the layout of the table files changes.
+TABLES_FORMAT_VERSION = 2
+
+SEMANTIC_FILENAME = "semantic.obt"
+UNITS_FILENAME = "units.obt"
+
+_MAGIC = b"OBTABLES"
+
+# Magic, format version, number of sections and SHA-1 hash of the taxonomy files the tables were written
+# from (see taxonomy_cache.hash_taxonomy_dir), all zeros if unknown.
+_HEADER = struct.Struct("<8sII20s")
+
+# Section name, record format, offset, number of records.
+_SECTION = struct.Struct("<32s32sQI")
+
+# String index used for None.
+_NONE = 0xFFFFFFFF
+
+# Offset and length of a string in the "string_data" section.
+_STRING_FORMAT = "<II"
+
+# Record formats.  The first field of keyed records is the key.
+_CONCEPT_FORMAT = "<IIIIIBBBBB"     # key, id, name, type_name, typed_domain_ref, abstract, nillable,
+                                    # period_independent, substitution_group, period_type
+_ENTRYPOINT_FORMAT = "<IIIIBII"     # key, name, full_name, number, entrypoint_type, description, path
+_LIST_FORMAT = "<III"               # name, offset and count of the items of a list
+_INDEX_FORMAT = "<I"
+_KEY_INDEX_FORMAT = "<II"           # key, record number; sorted by the UTF-8 encoding of the key
+_RELATIONSHIP_FORMAT = "<BIII"      # role, from_, to, order
+_CALCULATION_FORMAT = "<BIIII"      # role, from_, to, order, weight
+_UNIT_FORMAT = "<IIIIIIIIIBBI"      # key, id, unit_id, unit_name, ns_unit, item_type, item_type_date,
+                                    # symbol, definition, base_standard, status, version_date
+
+
+def _encode_bool(value):
+    if value is None:
+        return 0
+    return 2 if value else 1
+
+
+def _decode_bool(code):
+    if code == 0:
+        return None
+    return code == 2
+
+
+def _encode_enum(value, enum_class):
+    if value is None:
+        return 0
+    return list(enum_class).index(value) + 1
+
+
+def _decode_enum(code, members):
+    if code == 0:
+        return None
+    return members[code - 1]
+
+
+class _TablesWriter(object):
+    """Collects strings and record sections and writes them to a table file."""
+
+    def __init__(self):
+        self._strings = {}
+        self._string_data = []
+        self._string_records = []
+        self._string_offset = 0
+        self._sections = []
+
+    def string(self, s):
+        """Returns the index of a string (or None) in the string table."""
+
+        if s is None:
+            return _NONE
+        index = self._strings.get(s)
+        if index is None:
+            data = s.encode("utf-8")
+            index = len(self._string_records)
+            self._strings[s] = index
+            self._string_records.append((self._string_offset, len(data)))
+            self._string_data.append(data)
+            self._string_offset += len(data)
+        return index
+
+    def date(self, d):
+        return self.string(None if d is None else d.isoformat())
+
+    def add_section(self, name, record_format, records):
+        self._sections.append((name, record_format, records))
+
+    def add_keyed_section(self, name, record_format, records, keys):
+        """Adds a section and an "<name>_index" section listing the records sorted by key."""
+
+        self.add_section(name, record_format, records)
+        order = sorted(range(len(keys)), key=lambda i: keys[i].encode("utf-8"))
+        self.add_section(name + "_index", _KEY_INDEX_FORMAT, [(self.string(keys[i]), i) for i in order])
+
+    def write(self, pathname, taxonomy_hash=None):
+        sections = list(self._sections)
+        sections.append(("strings", _STRING_FORMAT, self._string_records))
+        sections.append(("string_data", "<B", None))
+
+        blobs = []
+        for name, record_format, records in sections:
+            if records is None:
+                blobs.append(b"".join(self._string_data))
+            else:
+                s = struct.Struct(record_format)
+                blobs.append(b"".join(s.pack(*record) for record in records))
+
+        offset = _HEADER.size + _SECTION.size * len(sections)
+        directory = []
+        for (name, record_format, records), blob in zip(sections, blobs):
+            # Keep records aligned on 8 bytes.
+            offset += -offset % 8
+            count = len(blob) if records is None else len(records)
+            directory.append(_SECTION.pack(name.encode("ascii"), record_format.encode("ascii"), offset, count))
+            offset += len(blob)
+
+        dirname = os.path.dirname(os.path.abspath(pathname))
+        fd, temp_name = tempfile.mkstemp(dir=dirname, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as outfile:
+                outfile.write(_HEADER.pack(_MAGIC, TABLES_FORMAT_VERSION, len(sections),
+                                           bytes.fromhex(taxonomy_hash) if taxonomy_hash else b""))
+                for entry in directory:
+                    outfile.write(entry)
+                for blob in blobs:
+                    outfile.write(b"\0" * (-outfile.tell() % 8))
+                    outfile.write(blob)
+            # Rename so that processes attaching concurrently never see a partial file.
+            os.replace(temp_name, pathname)
+        except Exception:
+            os.remove(temp_name)
+            raise
+
+
+class TaxonomyTables(object):
+    """
+    A table file attached with a read-only memory map.  The map is released by close(), or on leaving a
+    with statement:
+    ::
+        with TaxonomyTables(pathname) as tables:
+            tables.find("units", "kWh")
+    ::
+
+    Args:
+        pathname (str): table file written by write_semantic_tables or write_units_tables.
+
+    Attributes:
+        taxonomy_hash (str): hash of the taxonomy files the tables were written from (see
+            taxonomy_cache.hash_taxonomy_dir), None if it was not recorded.
+
+    Raises:
+        ValueError if the file is not a table file of the current format version.
+    """
+
+    def __init__(self, pathname):
+        """Taxonomy tables constructor."""
+
+        with open(pathname, "rb") as infile:
+            self._mm = mmap.mmap(infile.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header(pathname)
+        except Exception:
+            self.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        Releases the memory map.  The records of the tables and of the views of the tables can no longer
+        be read afterwards.  Calling close() again has no effect.
+        """
+        self._mm.close()
+
+    @property
+    def closed(self):
+        """True if the tables were closed."""
+        return self._mm.closed
+
+    def _read_header(self, pathname):
+        """Reads the header and the section table of the file."""
+
+        if len(self._mm) < _HEADER.size:
+            raise ValueError("{} is not a taxonomy tables file".format(pathname))
+        magic, version, count, taxonomy_hash = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            raise ValueError("{} is not a taxonomy tables file".format(pathname))
+        if version != TABLES_FORMAT_VERSION:
+            raise ValueError("{} has tables format version {}, expected {}".format(
+                pathname, version, TABLES_FORMAT_VERSION))
+        self.taxonomy_hash = taxonomy_hash.hex() if taxonomy_hash.strip(b"\0") else None
+
+        self._sections = {}
+        for i in range(count):
+            name, record_format, offset, records = _SECTION.unpack_from(self._mm, _HEADER.size + i * _SECTION.size)
+            s = struct.Struct(record_format.rstrip(b"\0").decode("ascii"))
+            self._sections[name.rstrip(b"\0").decode("ascii")] = (s, offset, records)
+        self._string_struct, self._strings_offset, _ = self._sections["strings"]
+        self._string_data_offset = self._sections["string_data"][1]
+
+    def count(self, section):
+        """Returns the number of records in a section."""
+        return self._sections[section][2]
+
+    def record(self, section, i):
+        """Returns record i of a section as a tuple."""
+        s, offset, count = self._sections[section]
+        if i < 0 or i >= count:
+            raise IndexError(i)
+        return s.unpack_from(self._mm, offset + i * s.size)
+
+    def _string_bytes(self, index):
+        start, length = self._string_struct.unpack_from(self._mm,
+                                                        self._strings_offset + index * self._string_struct.size)
+        start += self._string_data_offset
+        return self._mm[start:start + length]
+
+    def string(self, index):
+        """Returns a string of the string table, None for the None index."""
+        if index == _NONE:
+            return None
+        return self._string_bytes(index).decode("utf-8")
+
+    def find(self, section, key):
+        """
+        Finds a record of a keyed section by binary search of its index section.  Keys are compared in
+        their UTF-8 encoding so that no string is decoded.
+
+        Returns:
+            The record number or None if the key is not found.
+        """
+        s, offset, count = self._sections[section + "_index"]
+        key = key.encode("utf-8")
+        lo = 0
+        hi = count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            string_index, record = s.unpack_from(self._mm, offset + mid * s.size)
+            found = self._string_bytes(string_index)
+            if found < key:
+                lo = mid + 1
+            elif found > key:
+                hi = mid
+            else:
+                return record
+        return None
+
+
+class RecordMapping(collections.abc.Mapping):
+    """
+    Read-only dict view of a keyed section.  Iteration follows the order of the original dict, values
+    are decoded on access.
+    """
+
+    def __init__(self, tables, section, decode):
+        self._tables = tables
+        self._section = section
+        self._decode = decode
+
+    def __getitem__(self, key):
+        if not isinstance(key, str):
+            raise KeyError(key)
+        i = self._tables.find(self._section, key)
+        if i is None:
+            raise KeyError(key)
+        return self._decode(self._tables.record(self._section, i))
+
+    def __contains__(self, key):
+        return isinstance(key, str) and self._tables.find(self._section, key) is not None
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._tables.string(self._tables.record(self._section, i)[0])
+
+    def __len__(self):
+        return self._tables.count(self._section)
+
+
+class RecordSequence(collections.abc.Sequence):
+    """Read-only list view of a range of records of a section, values are decoded on access."""
+
+    def __init__(self, tables, section, decode, offset=0, count=None):
+        self._tables = tables
+        self._section = section
+        self._decode = decode
+        self._offset = offset
+        self._count = tables.count(section) if count is None else count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if i < 0 or i >= self._count:
+            raise IndexError(i)
+        return self._decode(self._tables.record(self._section, self._offset + i))
+
+    def __len__(self):
+        return self._count
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, RecordSequence)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def __repr__(self):
+        return repr(list(self))
+
+
+def write_semantic_tables(semantic, pathname, taxonomy_hash=None):
+    """
+    Writes the data of a TaxonomySemantic (entrypoints, concept details, concepts and relationships of
+    each entrypoint, calculations) to a table file.
+
+    Args:
+        semantic (TaxonomySemantic): component to write, entrypoints loaded on demand are all loaded.
+        pathname (str): table file to write.
+        taxonomy_hash (str): hash of the taxonomy files the component was loaded from, recorded in the
+            file (see TaxonomyTables).
+    """
+
+    w = _TablesWriter()
+
+    concepts_details = semantic.get_all_concepts(details=True)
+    keys = list(concepts_details)
+    w.add_keyed_section("concepts", _CONCEPT_FORMAT, [
+        (w.string(key), w.string(d.id), w.string(d.name), w.string(d.type_name), w.string(d.typed_domain_ref),
+         _encode_bool(d.abstract), _encode_bool(d.nillable), _encode_bool(d.period_independent),
+         _encode_enum(d.substitution_group, taxonomy.SubstitutionGroup),
+         _encode_enum(d.period_type, taxonomy.PeriodType))
+        for key, d in concepts_details.items()], keys)
+
+    entrypoint_names, entrypoints = semantic.get_all_entrypoints(details=True)
+    w.add_section("entrypoints", _ENTRYPOINT_FORMAT, [
+        (w.string(key), w.string(e.name), w.string(e.full_name), 0 if e.number is None else e.number + 1,
+         _encode_enum(e.entrypoint_type, taxonomy.EntrypointType), w.string(e.description), w.string(e._path))
+        for key, e in entrypoints.items()])
+
+    lists = []
+    items = []
+    for entrypoint in entrypoint_names:
+        concepts = semantic.get_entrypoint_concepts(entrypoint)
+        lists.append((w.string(entrypoint), len(items), len(concepts)))
+        items.extend((w.string(concept),) for concept in concepts)
+    w.add_section("entrypoint_concepts", _LIST_FORMAT, lists)
+    w.add_section("concept_lists", _INDEX_FORMAT, items)
+
+    lists = []
+    items = []
+    for entrypoint, relationships in semantic._relationships_by_entrypoint.items():
+        lists.append((w.string(entrypoint), len(items), len(relationships)))
+        items.extend((_encode_enum(r.role, taxonomy.RelationshipRole), w.string(r.from_), w.string(r.to),
+                      w.string(r.order)) for r in relationships)
+    w.add_section("entrypoint_relationships", _LIST_FORMAT, lists)
+    w.add_section("relationships", _RELATIONSHIP_FORMAT, items)
+
+    w.add_section("calculations", _CALCULATION_FORMAT, [
+        (_encode_enum(c.role, taxonomy.CalculationRole), w.string(c.from_), w.string(c.to), w.string(c.order),
+         w.string(c.weight))
+        for c in semantic._calculations])
+
+    w.write(pathname, taxonomy_hash)
+
+
+def write_units_tables(units, pathname, taxonomy_hash=None):
+    """
+    Writes the data of a TaxonomyUnits to a table file.
+
+    Args:
+        units (TaxonomyUnits): component to write.
+        pathname (str): table file to write.
+        taxonomy_hash (str): hash of the taxonomy files the component was loaded from, recorded in the
+            file (see TaxonomyTables).
+    """
+
+    w = _TablesWriter()
+    all_units = units.get_all_units()
+    w.add_keyed_section("units", _UNIT_FORMAT, [
+        (w.string(key), w.string(u.id), w.string(u.unit_id), w.string(u.unit_name), w.string(u.ns_unit),
+         w.string(u.item_type), w.date(u.item_type_date), w.string(u.symbol), w.string(u.definition),
+         _encode_enum(u.base_standard, taxonomy.BaseStandard), _encode_enum(u.status, taxonomy.UnitStatus),
+         w.date(u.version_date))
+        for key, u in all_units.items()], list(all_units))
+    w.write(pathname, taxonomy_hash)
+
+
+def semantic_views(tables):
+    """
+    Creates the views used by a TaxonomySemantic attached to a table file.
+
+    Returns:
+        A tuple of entrypoints details (dict), concepts details (RecordMapping), concepts by entrypoint
+        (dict of RecordSequence), relationships by entrypoint (dict of RecordSequence) and calculations
+        (RecordSequence).
+    """
+
+    string = tables.string
+    substitution_groups = list(taxonomy.SubstitutionGroup)
+    period_types = list(taxonomy.PeriodType)
+    entrypoint_types = list(taxonomy.EntrypointType)
+    relationship_roles = list(taxonomy.RelationshipRole)
+    calculation_roles = list(taxonomy.CalculationRole)
+
+    def decode_concept(record):
+        d = taxonomy.ConceptDetails()
+        d.id = string(record[1])
+        d.name = string(record[2])
+        d.type_name = string(record[3])
+        d.typed_domain_ref = string(record[4])
+        d.abstract = _decode_bool(record[5])
+        d.nillable = _decode_bool(record[6])
+        d.period_independent = _decode_bool(record[7])
+        d.substitution_group = _decode_enum(record[8], substitution_groups)
+        d.period_type = _decode_enum(record[9], period_types)
+        return d
+
+    def decode_relationship(record):
+        r = taxonomy.Relationship()
+        r.role = _decode_enum(record[0], relationship_roles)
+        r.from_ = string(record[1])
+        r.to = string(record[2])
+        r.order = string(record[3])
+        return r
+
+    def decode_calculation(record):
+        c = taxonomy.Calculation()
+        c.role = _decode_enum(record[0], calculation_roles)
+        c.from_ = string(record[1])
+        c.to = string(record[2])
+        c.order = string(record[3])
+        c.weight = string(record[4])
+        return c
+
+    # The entrypoint dicts are small, only their lists are left in the file.
+    entrypoints = {}
+    for i in range(tables.count("entrypoints")):
+        record = tables.record("entrypoints", i)
+        e = taxonomy.Entrypoint()
+        e.name = string(record[1])
+        e.full_name = string(record[2])
+        e.number = None if record[3] == 0 else record[3] - 1
+        e.entrypoint_type = _decode_enum(record[4], entrypoint_types)
+        e.description = string(record[5])
+        e._path = string(record[6])
+        entrypoints[string(record[0])] = e
+
+    concepts_by_entrypoint = {}
+    for i in range(tables.count("entrypoint_concepts")):
+        name, offset, count = tables.record("entrypoint_concepts", i)
+        concepts_by_entrypoint[string(name)] = RecordSequence(tables, "concept_lists", lambda r: string(r[0]),
+                                                              offset, count)
+
+    relationships_by_entrypoint = {}
+    for i in range(tables.count("entrypoint_relationships")):
+        name, offset, count = tables.record("entrypoint_relationships", i)
+        relationships_by_entrypoint[string(name)] = RecordSequence(tables, "relationships", decode_relationship,
+                                                                   offset, count)
+
+    return (entrypoints, RecordMapping(tables, "concepts", decode_concept), concepts_by_entrypoint,
+            relationships_by_entrypoint, RecordSequence(tables, "calculations", decode_calculation))
+
+
+def units_view(tables):
+    """
+    Creates the view used by a TaxonomyUnits attached to a table file.
+
+    Returns:
+        A RecordMapping of units by unit_id.
+    """
+
+    string = tables.string
+    base_standards = list(taxonomy.BaseStandard)
+    statuses = list(taxonomy.UnitStatus)
+
+    def decode_unit(record):
+        u = taxonomy.Unit()
+        u.id = string(record[1])
+        u.unit_id = string(record[2])
+        u.unit_name = string(record[3])
+        u.ns_unit = string(record[4])
+        u.item_type = string(record[5])
+        u.item_type_date = util.convert_taxonomy_xsd_date(string(record[6])) if record[6] != _NONE else None
+        u.symbol = string(record[7])
+        u.definition = string(record[8])
+        u.base_standard = _decode_enum(record[9], base_standards)
+        u.status = _decode_enum(record[10], statuses)
+        u.version_date = util.convert_taxonomy_xsd_date(string(record[11])) if record[11] != _NONE else None
+        return u
+
+    return RecordMapping(tables, "units", decode_unit)
@@ -12,15 +12,16 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import concurrent.futures
 import unittest
 import json
 from datetime import datetime, date
 from lxml import etree
 from six import string_types
-from oblib import data_model, taxonomy, ob
+from oblib import data_model, fact_store, identifier, taxonomy, ob
 import pytest
 
-tax = taxonomy.Taxonomy()
+tax = taxonomy.getTaxonomy()
 
 @pytest.mark.skip(reason="not currently being maintained")
 class TestDataModelEntrypoint(unittest.TestCase):
@@ -1026,3 +1027,288 @@ class TestDataModelEntrypoint(unittest.TestCase):
          'solar:EnergyContractYearlyRateAxis': '1',
          'unit_name': 'USD'}
         doc.set('solar:EnergyCharge', '10500.26', **kwargs)
+
+
+class TestOBInstanceTemplate(unittest.TestCase):
+
+    def test_table_schema(self):
+        template = tax.get_instance_template("CutSheet")
+        schema = template.get_table_schema("solar:CutSheetDetailsTable")
+        self.assertIsInstance(schema, data_model.TableSchema)
+        self.assertEqual(frozenset(["solar:CutSheetDetailsLineItems"]), schema.line_items)
+        self.assertEqual({"solar:ProdIDAxis": "solar:ProdIDDomain",
+                          "solar:TestCondAxis": "solar:TestCondDomain"}, schema.domains)
+        self.assertEqual(frozenset(), schema.domain_members["solar:ProdIDAxis"])
+        self.assertEqual(frozenset(["solar:CustomTestCondMember", "solar:NomOpCondMember",
+                                    "solar:PVUSATestCondMember", "solar:STCMember"]),
+                         schema.domain_members["solar:TestCondAxis"])
+        self.assertEqual(frozenset(["solar:ProdIDAxis"]), schema.required_axes)
+
+        schema = template.get_table_schema(data_model.UNTABLE)
+        self.assertEqual({}, schema.axes)
+        self.assertEqual(frozenset(), schema.line_items)
+
+    def test_axis_domain_members(self):
+        # Axes shared by several tables do not collect duplicate members.
+        for entrypoint in ["CutSheet", "MonthlyOperatingReport", "All"]:
+            template = tax.get_instance_template(entrypoint)
+            for table_name in template.get_table_names():
+                for axis in template.get_table_schema(table_name).axes.values():
+                    self.assertEqual(len(set(axis.domainMembers)), len(axis.domainMembers))
+
+    def test_get_concept_table_map(self):
+        doc = data_model.OBInstance("CutSheet", tax)
+        table_map = doc.get_concept_table_map()
+        self.assertTrue(set(doc.get_all_writable_concepts()).issubset(table_map))
+        self.assertEqual("solar:CutSheetDetailsTable", table_map["solar:DeviceCost"])
+        self.assertEqual(data_model.UNTABLE, table_map["solar:CutSheetDetailsLineItems"])
+        for concept_name in ["solar:DeviceCost", "solar:CutSheetDetailsLineItems"]:
+            self.assertEqual(table_map[concept_name], doc.get_table_for_concept(concept_name).get_name())
+
+        # Modifying the returned map does not change the shared template.
+        table_map["solar:DeviceCost"] = data_model.UNTABLE
+        self.assertEqual("solar:CutSheetDetailsTable", doc.get_concept_table_map()["solar:DeviceCost"])
+
+        # The concept tree of the "All" entrypoint has a cycle through solar:TypeOfDevice.
+        table_map = tax.get_instance_template("All").get_concept_table_map()
+        self.assertIn("solar:TypeOfDevice", table_map)
+
+    def test_get_table_concepts(self):
+        template = tax.get_instance_template("CutSheet")
+        table_map = template.get_concept_table_map()
+        for table_name in template.get_table_names() + [data_model.UNTABLE]:
+            self.assertEqual(sorted(concept_name for concept_name in table_map
+                                    if table_map[concept_name] == table_name),
+                             sorted(template.get_table_concepts(table_name)))
+        self.assertIn("solar:DeviceCost", template.get_table_concepts("solar:CutSheetDetailsTable"))
+        self.assertEqual([], template.get_table_concepts("solar:NotATable"))
+
+    def test_hypercube(self):
+        doc = data_model.OBInstance("CutSheet", tax)
+        table = doc.get_table("solar:CutSheetDetailsTable")
+        self.assertTrue(table.has_line_item("solar:CutSheetDetailsLineItems"))
+        self.assertFalse(table.has_line_item("solar:InverterPowerLevelLineItems"))
+        self.assertTrue(table.is_typed_dimension("solar:TestCondAxis"))
+        self.assertEqual("solar:TestCondDomain", table.get_domain("solar:TestCondAxis"))
+        self.assertTrue(table.is_axis_value_within_domain("solar:TestCondAxis", "solar:STCMember"))
+        self.assertFalse(table.is_axis_value_within_domain("solar:TestCondAxis", "solar:NotAMember"))
+        self.assertTrue(table.is_axis_value_within_domain("solar:ProdIDAxis", "Anything"))
+        with self.assertRaises(KeyError):
+            table.get_domain("solar:NotAnAxis")
+
+        table._is_valid_context(data_model.Context(
+            instant=datetime.now(), ProdIDAxis="ABCD", TestCondAxis="solar:STCMember"))
+        with self.assertRaises(ob.OBContextError):
+            table._is_valid_context(data_model.Context(instant=datetime.now(), TestCondAxis="solar:STCMember"))
+        with self.assertRaises(ob.OBContextError):
+            table._is_valid_context(data_model.Context(
+                instant=datetime.now(), ProdIDAxis="ABCD", TestCondAxis="solar:NotAMember"))
+
+
+class TestContext(unittest.TestCase):
+
+    def test_get_key(self):
+        context1 = data_model.Context(entity="ACME", duration={"start": date(2018, 1, 1), "end": date(2018, 2, 1)},
+                                      ProdIDAxis="A", TestCondAxis="solar:STCMember")
+        context2 = data_model.Context(entity="ACME", TestCondAxis="solar:STCMember", ProdIDAxis="A",
+                                      duration={"end": date(2018, 2, 1), "start": date(2018, 1, 1)})
+        context3 = data_model.Context(entity="ACME", duration="forever", ProdIDAxis="A",
+                                      TestCondAxis="solar:STCMember")
+        self.assertTrue(context1.equals_context(context2))
+        self.assertEqual(context1.get_key(), context2.get_key())
+        self.assertFalse(context1.equals_context(context3))
+        self.assertNotEqual(context1.get_key(), context3.get_key())
+        self.assertNotEqual(data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A").get_key(),
+                            data_model.Context(instant=datetime(2018, 1, 1)).get_key())
+
+    def test_store_context(self):
+        doc = data_model.OBInstance("CutSheet", tax)
+        table = doc.get_table("solar:CutSheetDetailsTable")
+        context1 = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A")
+        context2 = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A")
+        context3 = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="B")
+        self.assertIs(context1, table.store_context(context1))
+        self.assertIs(context1, table.store_context(context2))
+        self.assertIs(context3, table.store_context(context3))
+        self.assertEqual(["solar:CutSheetDetailsTable_0", "solar:CutSheetDetailsTable_1"],
+                         [c.get_id() for c in table.contexts])
+        self.assertIs(context1, table.lookup_context(context2))
+        self.assertIsNone(table.lookup_context(data_model.Context(instant=datetime(2018, 1, 2), ProdIDAxis="A")))
+
+        # Contexts with values that cannot be hashed are still deduplicated.
+        context4 = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis=bytearray(b"C"))
+        context5 = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis=bytearray(b"C"))
+        self.assertIs(context4, table.store_context(context4))
+        self.assertIs(context4, table.store_context(context5))
+        self.assertIs(context4, table.lookup_context(context5))
+
+
+class TestFact(unittest.TestCase):
+
+    def test_id(self):
+        fact = data_model.Fact("solar:MeasEnergy", None, "kWh", 100)
+        self.assertFalse(hasattr(fact, "__dict__"))
+        self.assertIsNone(fact._id)
+        fact_id = fact.id
+        self.assertTrue(identifier.validate(fact_id))
+        self.assertEqual(fact_id, fact.id)
+
+        fact.set_id("test")
+        self.assertEqual("test", fact.id)
+        self.assertEqual("test", data_model.Fact("solar:MeasEnergy", None, "kWh", 100, id="test").id)
+
+
+class TestOBInstance(unittest.TestCase):
+
+    def test_set_many(self):
+        doc = data_model.OBInstance("MonthlyOperatingReport", tax)
+        duration = {"start": date(2018, 1, 1), "end": date(2018, 2, 1)}
+        context = data_model.Context(entity="ACME", duration=duration)
+        errors = doc.set_many([
+            ("solar:MeasEnergy", 100, {"unit_name": "kWh", "entity": "ACME", "duration": duration}),
+            ("solar:Curtail", 5, {"unit_name": "kWh", "context": context}),
+            ("solar:MeasEnergy", "ABC", {"unit_name": "kWh", "entity": "ACME", "duration": duration}),
+            ("solar:MeasEnergy", 100, {"unit_name": "kW", "entity": "ACME", "duration": duration}),
+            ("solar:NotAConcept", 100),
+            ("solar:Curtail", 5, {"unit_name": "kWh", "entity": "ACME", "instant": datetime(2018, 1, 1)}),
+            ("solar:OpRptAvailOfDoc", True, context)])
+        self.assertEqual([2, 3, 4, 5], [index for index, error in errors])
+        self.assertEqual([ob.OBTypeError, ob.OBUnitError, ob.OBConceptError, ob.OBContextError],
+                         [type(error) for index, error in errors])
+
+        # The facts are the same as with set() and share a single context.
+        self.assertEqual(100, doc.get("solar:MeasEnergy", context).value)
+        self.assertEqual(5, doc.get("solar:Curtail", context).value)
+        self.assertEqual(True, doc.get("solar:OpRptAvailOfDoc", context).value)
+        self.assertEqual(1, len(doc.get_table(data_model.UNTABLE).contexts))
+
+        # Errors raised for one record are raised again for the others with the same concept and context.
+        errors = doc.set_many([("solar:Curtail", 5, {"unit_name": "kWh", "entity": "ACME"}),
+                               ("solar:Curtail", 6, {"unit_name": "kWh", "entity": "ACME"})])
+        self.assertEqual([0, 1], [index for index, error in errors])
+        self.assertEqual(str(errors[0][1]), str(errors[1][1]))
+        self.assertEqual([], doc.set_many([]))
+
+        # The unit and more keyword args can follow the context or the kwargs.
+        errors = doc.set_many([
+            ("solar:ExpectEnergyAtTheRevenueMeter", 7, context, "kWh"),
+            ("solar:MeasEnergyWeatherAdj", 8, {"entity": "ACME", "duration": duration}, "kWh", {"decimals": 2}),
+            ("solar:MeasEnergy", 9, context, None, {"unit_name": "kWh"}),
+            ("solar:MeasEnergy", 10, context, "kWh", {}, None),
+            ("solar:MeasEnergy",)])
+        self.assertEqual([3, 4], [index for index, error in errors])
+        self.assertEqual([ob.OBError, ob.OBError], [type(error) for index, error in errors])
+        self.assertEqual("kWh", doc.get("solar:ExpectEnergyAtTheRevenueMeter", context).unit)
+        fact = doc.get("solar:MeasEnergyWeatherAdj", context)
+        self.assertEqual(("kWh", 2), (fact.unit, fact.decimals))
+        self.assertEqual(9, doc.get("solar:MeasEnergy", context).value)
+
+        # The last record wins whether the context is given as kwargs or as a Context.
+        errors = doc.set_many([
+            ("solar:MeasEnergy", 11, context, "kWh"),
+            ("solar:MeasEnergy", 12, {"entity": "ACME", "duration": duration}, "kWh"),
+            ("solar:Curtail", 13, {"entity": "ACME", "duration": duration}, "kWh"),
+            ("solar:Curtail", 14, context, "kWh")])
+        self.assertEqual([], errors)
+        self.assertEqual((12, 14), (doc.get("solar:MeasEnergy", context).value,
+                                    doc.get("solar:Curtail", context).value))
+        self.assertEqual(1, len(doc.get_table(data_model.UNTABLE).contexts))
+
+    def test_id_allocator(self):
+        duration = {"start": date(2018, 1, 1), "end": date(2018, 2, 1)}
+        exports = []
+        for i in range(2):
+            doc = data_model.OBInstance("MonthlyOperatingReport", tax, id_allocator="deterministic")
+            doc.set("solar:MeasEnergy", 100, unit_name="kWh", entity="ACME", duration=duration)
+            doc.set("solar:OpRptAvailOfDoc", True, entity="ACME", duration="forever", fact_id="ID1")
+            exports.append(doc.to_JSON_string())
+        self.assertEqual(exports[0], exports[1])
+
+        allocator = identifier.SequentialIdAllocator("9c189dd1-a4d3-4b3f-ba08-000000000000")
+        doc = data_model.OBInstance("MonthlyOperatingReport", tax, id_allocator=allocator)
+        doc.set("solar:MeasEnergy", 100, unit_name="kWh", entity="ACME", duration=duration)
+        doc.set("solar:Curtail", 5, unit_name="kWh", entity="ACME", duration=duration)
+        self.assertEqual(["9c189dd1-a4d3-4b3f-ba08-000000000000", "9c189dd1-a4d3-4b3f-ba08-000000000001"],
+                         [fact.id for fact in doc.get_all_facts()])
+        self.assertEqual("9c189dd1-a4d3-4b3f-ba08-000000000000",
+                         doc.get("solar:MeasEnergy", data_model.Context(entity="ACME", duration=duration)).id)
+
+        with self.assertRaises(ValueError):
+            data_model.OBInstance("MonthlyOperatingReport", tax, id_allocator="uuid1")
+
+    def test_validate(self):
+        duration = {"start": date(2018, 1, 1), "end": date(2018, 2, 1)}
+        doc = data_model.OBInstance("MonthlyOperatingReport", tax, dev_validation_off=True)
+        doc.set("solar:MeasEnergy", 100, unit_name="kWh", entity="ACME", duration=duration)
+        self.assertEqual([], doc.validate().get_errors())
+        doc.set("solar:Curtail", "ABC", unit_name="kWh", entity="ACME", duration=duration)
+        doc.set("solar:ExpectEnergyAtTheRevenueMeter", 5, unit_name="kW", entity="ACME", duration=duration)
+        errors = doc.validate().get_errors()
+        self.assertEqual([ob.OBTypeError, ob.OBUnitError], [type(error) for error in errors])
+        self.assertTrue(str(errors[0]).startswith("solar:Curtail in context NON_TABLE_CONCEPTS_0: "))
+
+        # Every error of a fact is found, not only the first one.
+        doc = data_model.OBInstance("CutSheet", tax, dev_validation_off=True)
+        context = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A", TestCondAxis="solar:STCMember")
+        doc.set("solar:DeviceCost", "abc", unit_name="kWh", context=context)
+        context.axes["TestCondAxis"] = "solar:NotAMember"
+        errors = doc.validate().get_errors()
+        self.assertEqual([ob.OBContextError, ob.OBUnitError, ob.OBTypeError], [type(error) for error in errors])
+        for error in errors:
+            self.assertTrue(str(error).startswith("solar:DeviceCost in context solar:CutSheetDetailsTable_0: "))
+
+        # Contexts changed after the facts were set are validated again.
+        doc = data_model.OBInstance("CutSheet", tax)
+        context = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A", TestCondAxis="solar:STCMember")
+        doc.set("solar:DeviceCost", 100, unit_name="USD", context=context)
+        self.assertEqual([], doc.validate(tables=["solar:CutSheetDetailsTable"]).get_errors())
+        context.axes["TestCondAxis"] = "solar:NotAMember"
+        errors = doc.validate().get_errors()
+        self.assertEqual([ob.OBContextError], [type(error) for error in errors])
+        self.assertEqual([], doc.validate(tables=[data_model.UNTABLE]).get_errors())
+        with self.assertRaises(ob.OBNotFoundError):
+            doc.validate(tables=["solar:NotATable"])
+
+    def test_is_valid(self):
+        duration = {"start": date(2018, 1, 1), "end": date(2018, 2, 1)}
+        for columnar in (False, True):
+            if columnar and fact_store.numpy is None:
+                continue
+            doc = data_model.OBInstance("MonthlyOperatingReport", tax, dev_validation_off=True, columnar=columnar)
+            self.assertTrue(doc.is_valid())
+            doc.set("solar:MeasEnergy", 100, unit_name="kWh", entity="ACME", duration=duration)
+            self.assertTrue(doc.is_valid())
+            doc.set("solar:MeasEnergy", 100, unit_name="kW", entity="ACME", duration="forever")
+            self.assertFalse(doc.is_valid())
+            with concurrent.futures.ThreadPoolExecutor(2) as executor:
+                self.assertFalse(doc.is_valid(executor=executor))
+
+    def test_is_complete(self):
+        # No concept of the taxonomy is required, so two are made required in a private Taxonomy rather
+        # than in the shared one.
+        private_tax = taxonomy.Taxonomy(use_cache=False)
+        for concept in ["solar:DeviceCost", "solar:OpRptAvailOfDoc"]:
+            private_tax.semantic.get_concept_details(concept).nillable = False
+
+        doc = data_model.OBInstance("MonthlyOperatingReport", private_tax)
+        self.assertFalse(doc.is_complete())
+        doc.set("solar:OpRptAvailOfDoc", True, entity="ACME", duration="forever")
+        self.assertTrue(doc.is_complete())
+
+        doc = data_model.OBInstance("CutSheet", private_tax)
+        self.assertTrue(doc.is_complete())
+        # solar:DeviceCost is required in the instant contexts of its table only.
+        doc.set("solar:TypeOfDevice", "ModuleMember", duration="forever", ProdIDAxis="A",
+                TestCondAxis="solar:STCMember")
+        self.assertTrue(doc.is_complete())
+        context = data_model.Context(instant=datetime(2018, 1, 1), ProdIDAxis="A", TestCondAxis="solar:STCMember")
+        doc.set("solar:ModuleAvailOfStringLevelData", True, context=context)
+        self.assertFalse(doc.is_complete())
+        errors = doc.validate().get_errors()
+        self.assertEqual([ob.OBValidationError], [type(error) for error in errors])
+        self.assertEqual("Missing fact of required concept solar:DeviceCost in context "
+                         "solar:CutSheetDetailsTable_1", str(errors[0]))
+        doc.set("solar:DeviceCost", 100, unit_name="USD", context=context)
+        self.assertTrue(doc.is_complete())
+        self.assertTrue(doc.is_valid())
+        self.assertTrue(tax.semantic.get_concept_details("solar:DeviceCost").nillable)
@@ -0,0 +1,110 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import unittest
+from datetime import date, datetime, timezone
+
+from oblib import data_model, fact_store, ob, taxonomy
+
+
+tax = taxonomy.getTaxonomy()
+
+
+@unittest.skipIf(fact_store.numpy is None, "NumPy is not installed")
+class TestFactStore(unittest.TestCase):
+
+    def test_columnar_fact_store(self):
+        doc = data_model.OBInstance("CutSheet", tax)
+        table = doc.get_table("solar:CutSheetDetailsTable")
+        store = fact_store.ColumnarFactStore()
+        context1 = data_model.Context(instant=datetime(2018, 1, 1, 12), ProdIDAxis="A",
+                                      TestCondAxis="solar:STCMember")
+        context2 = data_model.Context(instant=date(2018, 1, 1), ProdIDAxis="B")
+        store.add(table, "solar:DeviceCost", context1, "USD", 100, decimals=2)
+        store.add(table, "solar:DeviceCost", context2, "USD", 200.5)
+        store.add(table, "solar:TypeOfDevice", context2, None, "ModuleMember", fact_id="ID1")
+        store.add(table, "solar:DeviceCost", context1, "USD", 150)
+
+        self.assertEqual(["solar:CutSheetDetailsTable"], store.get_table_names())
+        self.assertEqual({"solar:DeviceCost", "solar:TypeOfDevice"}, store.get_concept_names())
+        contexts = store.get_contexts(table)
+        self.assertEqual(["solar:CutSheetDetailsTable_0", "solar:CutSheetDetailsTable_1"],
+                         [context.get_id() for context in contexts])
+        self.assertTrue(contexts[0].equals_context(context1))
+        self.assertTrue(contexts[1].equals_context(context2))
+        self.assertIsInstance(contexts[1].instant, date)
+
+        # The fact added again for the same concept and context replaces the first one.
+        facts = store.get_facts(table)
+        self.assertEqual([("solar:DeviceCost", 150, "solar:CutSheetDetailsTable_0"),
+                          ("solar:DeviceCost", 200.5, "solar:CutSheetDetailsTable_1"),
+                          ("solar:TypeOfDevice", "ModuleMember", "solar:CutSheetDetailsTable_1")],
+                         [(f.concept_name, f.value, f.context.get_id()) for f in facts])
+        self.assertIs(int, type(facts[0].value))
+        self.assertEqual("ID1", facts[2].id)
+        self.assertEqual([f.id for f in facts], [f.id for f in store.get_facts(table)])
+
+        fact = store.get(table, "solar:DeviceCost", data_model.Context(
+            instant=date(2018, 1, 1), ProdIDAxis="B"))
+        self.assertEqual(200.5, fact.value)
+        self.assertEqual("USD", fact.unit)
+        self.assertEqual("solar:CutSheetDetailsTable_1", fact.context.get_id())
+        self.assertIsNone(store.get(table, "solar:DeviceCost", data_model.Context(
+            instant=date(2018, 1, 1), ProdIDAxis="C")))
+        self.assertIsNone(store.get(table, "solar:ModuleNameplateCap", context1))
+
+        # Facts and contexts added after a read are found.
+        store.add(table, "solar:DeviceCost", context2, "USD", 250)
+        context3 = data_model.Context(instant=date(2018, 1, 2), ProdIDAxis="B")
+        store.add(table, "solar:TypeOfDevice", context3, None, "InverterMember")
+        self.assertEqual(250, store.get(table, "solar:DeviceCost", context2).value)
+        fact = store.get(table, "solar:TypeOfDevice", context3)
+        self.assertEqual("InverterMember", fact.value)
+        self.assertEqual("solar:CutSheetDetailsTable_2", fact.context.get_id())
+        self.assertIsNone(store.get(table, "solar:DeviceCost", context3))
+        # Replacing a fact overwrites its row instead of adding one.
+        self.assertEqual(2, len(store._groups[table.get_name()]["solar:DeviceCost"].attributes))
+        self.assertEqual({"USD"}, store.get_units(table))
+        self.assertEqual([("solar:DeviceCost", 150), ("solar:DeviceCost", 250),
+                          ("solar:TypeOfDevice", "ModuleMember"), ("solar:TypeOfDevice", "InverterMember")],
+                         [(f.concept_name, f.value) for f in store.get_facts(table)])
+
+        with self.assertRaises(ob.OBContextError):
+            store.add(table, "solar:DeviceCost", data_model.Context(
+                instant=datetime(2018, 1, 1, tzinfo=timezone.utc), ProdIDAxis="A"), "USD", 1)
+        with self.assertRaises(ob.OBError):
+            store.add(table, "solar:DeviceCost", context1, "USD", 1, decimals=2, precision=3)
+
+    def test_columnar_instance(self):
+        duration = {"start": datetime(2018, 1, 1), "end": datetime(2018, 2, 1)}
+        docs = []
+        for columnar in [False, True]:
+            doc = data_model.OBInstance("MonthlyOperatingReport", tax, columnar=columnar,
+                                        id_allocator="deterministic")
+            doc.set("solar:MeasEnergy", 100, unit_name="kWh", entity="ACME", duration=duration)
+            doc.set("solar:Curtail", 5, unit_name="kWh", entity="ACME", duration=duration)
+            doc.set("solar:MeasEnergy", 101, unit_name="kWh", decimals=1, entity="ACME", duration=duration)
+            doc.set("solar:OpRptAvailOfDoc", True, entity="ACME", duration="forever")
+            docs.append(doc)
+        doc, columnar_doc = docs
+
+        self.assertEqual({}, columnar_doc.facts)
+        context = data_model.Context(entity="ACME", duration=duration)
+        self.assertEqual(101, columnar_doc.get("solar:MeasEnergy", context).value)
+        self.assertIsNone(columnar_doc.get("solar:OpRptAvailOfDoc", context))
+        self.assertEqual(sorted((f.concept_name, f.value) for f in doc.get_all_facts()),
+                         sorted((f.concept_name, f.value) for f in columnar_doc.get_all_facts()))
+        self.assertEqual(json.loads(doc.to_JSON_string()), json.loads(columnar_doc.to_JSON_string()))
+        self.assertEqual(len(doc.to_XML_string()), len(columnar_doc.to_XML_string()))
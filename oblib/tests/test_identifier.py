@@ -13,7 +13,10 @@
 # limitations under the License.
 
 import unittest
-from oblib import identifier
+import uuid
+from datetime import date
+
+from oblib import data_model, identifier
 
 
 class TestIdentifier(unittest.TestCase):
@@ -40,3 +43,51 @@ class TestIdentifier(unittest.TestCase):
     def test_invalid_identifier_format(self):
         # Bad UUID format
         self.assertFalse(identifier.validate("dfasfdfsadfds"))
+
+    def test_id_allocators(self):
+        context = data_model.Context(entity="ACME", duration={"start": date(2018, 1, 1), "end": date(2018, 2, 1)},
+                                     ProdIDAxis="A", TestCondAxis="solar:STCMember")
+        same_context = data_model.Context(entity="ACME", TestCondAxis="solar:STCMember", ProdIDAxis="A",
+                                          duration={"start": date(2018, 1, 1), "end": date(2018, 2, 1)})
+        other_context = data_model.Context(entity="ACME", duration="forever", ProdIDAxis="A",
+                                           TestCondAxis="solar:STCMember")
+
+        allocator = identifier.RandomIdAllocator()
+        self.assertTrue(identifier.validate(allocator.allocate("solar:DeviceCost", context)))
+        self.assertNotEqual(allocator.allocate("solar:DeviceCost", context),
+                            allocator.allocate("solar:DeviceCost", context))
+
+        allocator = identifier.SequentialIdAllocator("9c189dd1-a4d3-4b3f-ba08-fffffffffffe")
+        self.assertEqual(["9c189dd1-a4d3-4b3f-ba08-fffffffffffe", "9c189dd1-a4d3-4b3f-ba08-ffffffffffff",
+                          "9c189dd1-a4d3-4b3f-ba08-000000000000"],
+                         [allocator.allocate("solar:DeviceCost", context) for i in range(3)])
+        self.assertTrue(identifier.validate(identifier.SequentialIdAllocator().allocate("solar:DeviceCost", context)))
+        with self.assertRaises(ValueError):
+            identifier.SequentialIdAllocator("dfasfdfsadfds")
+
+        allocator = identifier.DeterministicIdAllocator()
+        fact_id = allocator.allocate("solar:DeviceCost", context)
+        self.assertTrue(identifier.validate(fact_id))
+        self.assertEqual(fact_id, identifier.DeterministicIdAllocator().allocate("solar:DeviceCost", same_context))
+        self.assertNotEqual(fact_id, allocator.allocate("solar:DeviceCost", other_context))
+        self.assertNotEqual(fact_id, allocator.allocate("solar:ModuleNameplateCap", context))
+        self.assertNotEqual(fact_id, identifier.DeterministicIdAllocator(uuid.uuid4()).allocate(
+            "solar:DeviceCost", context))
+
+        # Contexts differing only by the type of a value get different IDs.
+        for value, other_value in [(1, "1"), (None, "None"), (date(2018, 1, 1), "2018-01-01")]:
+            self.assertNotEqual(
+                allocator.allocate("solar:DeviceCost", data_model.Context(
+                    instant=date(2018, 1, 1), entity="ACME", ProdIDAxis=value)),
+                allocator.allocate("solar:DeviceCost", data_model.Context(
+                    instant=date(2018, 1, 1), entity="ACME", ProdIDAxis=other_value)))
+        self.assertNotEqual(
+            allocator.allocate("solar:DeviceCost", data_model.Context(instant=date(2018, 1, 1), entity=None)),
+            allocator.allocate("solar:DeviceCost", data_model.Context(instant=date(2018, 1, 1), entity="None")))
+
+    def test_get_id_allocator(self):
+        self.assertIsInstance(identifier.get_id_allocator("random"), identifier.RandomIdAllocator)
+        self.assertIsInstance(identifier.get_id_allocator("sequential"), identifier.SequentialIdAllocator)
+        self.assertIsInstance(identifier.get_id_allocator("deterministic"), identifier.DeterministicIdAllocator)
+        with self.assertRaises(ValueError):
+            identifier.get_id_allocator("uuid1")
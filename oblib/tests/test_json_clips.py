@@ -19,7 +19,7 @@ import pytest
 from oblib import parser, taxonomy, ob
 
 
-taxonomy = taxonomy.Taxonomy()
+taxonomy = taxonomy.getTaxonomy()
 parser = parser.Parser(taxonomy)
 
 
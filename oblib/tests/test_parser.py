@@ -14,10 +14,10 @@
 
 import unittest
 from jsondiff import diff
-from oblib import parser, taxonomy
+from oblib import ob, parser, taxonomy
 
 
-taxonomy = taxonomy.Taxonomy()
+taxonomy = taxonomy.getTaxonomy()
 parser = parser.Parser(taxonomy)
 
 
@@ -61,6 +61,15 @@ class TestParser(unittest.TestCase):
         with self.assertRaises(Exception):
             parser.from_XML_string(TEST_XML, "System")
 
+    def test_entrypoint_name(self):
+        self.assertEqual("MonthlyOperatingReport", parser.from_JSON_string(TEST_JSON).entrypoint_name)
+        self.assertEqual("MonthlyOperatingReport",
+                         parser._entrypoint_name(["solar:OpRptLevel"]))
+        with self.assertRaises(ob.OBValidationError):
+            parser._entrypoint_name(["solar:NotAConcept"])
+        with self.assertRaises(ob.OBValidationError):
+            parser._entrypoint_name(["solar:MeasEnergy", "solar:ExpectEnergyAtTheRevenueMeter"])
+
     def test_files(self):
         # TODO:
         # Test validate XML
@@ -14,12 +14,14 @@
 
 import unittest
 import datetime
+import os
+import threading
 from six import string_types
 
-from oblib import taxonomy
+from oblib import constants, ob, taxonomy
 
 
-tax = taxonomy.Taxonomy()
+tax = taxonomy.getTaxonomy()
 
 
 class TestTaxonomy(unittest.TestCase):
@@ -33,6 +35,28 @@ class TestTaxonomy(unittest.TestCase):
     def test_relationship(self):
         self.assertIsInstance(taxonomy.Relationship(), taxonomy.Relationship)
 
+    def test_to_dict(self):
+        unit = tax.units.get_unit("kWh")
+        self.assertEqual("Kilowatt-Hours", unit.to_dict()["unit_name"])
+        self.assertEqual(set(taxonomy.Unit.__slots__), set(unit.to_dict()))
+        details = tax.semantic.get_concept_details("solar:ACDisconnectSwitchMember")
+        self.assertEqual("solar:ACDisconnectSwitchMember", details.to_dict()["id"])
+        entrypoint = tax.semantic.get_entrypoint_details("CutSheet")
+        self.assertEqual("CutSheet", entrypoint.to_dict()["name"])
+
+    def test_records(self):
+        # Records are slotted and the strings repeated between them are shared.
+        for record in [taxonomy.ConceptDetails(), taxonomy.Relationship(), taxonomy.Calculation(),
+                       taxonomy.Unit(), taxonomy.Entrypoint()]:
+            self.assertFalse(hasattr(record, "__dict__"))
+            with self.assertRaises(AttributeError):
+                record.not_an_attribute = None
+        t = taxonomy.Taxonomy(use_cache=False)
+        relationships = t.semantic.get_entrypoint_relationships("MonthlyOperatingReport")
+        details = t.semantic.get_concept_details(relationships[0].from_)
+        self.assertIs(details.id, relationships[0].from_)
+        self.assertEqual(len({r.to for r in relationships}), len({id(r.to) for r in relationships}))
+
     def test_taxonomy(self):
         self.assertIsInstance(tax, taxonomy.Taxonomy)
         self.assertIsInstance(tax.semantic, taxonomy.TaxonomySemantic)
@@ -43,6 +67,112 @@ class TestTaxonomy(unittest.TestCase):
         self.assertIsInstance(tax.ref_parts, taxonomy.TaxonomyRefParts)
         self.assertIsInstance(tax.documentation, taxonomy.TaxonomyDocumentation)
 
+    def test_lazy_loading(self):
+        t = taxonomy.Taxonomy()
+        self.assertEqual({}, t.get_load_times())
+        self.assertIsInstance(t.units, taxonomy.TaxonomyUnits)
+        self.assertEqual(["units"], list(t.get_load_times().keys()))
+        self.assertIs(t.units, t.units)
+
+        # Concurrent first accesses load the component only once.
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(t.types)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(8, len(found))
+        for types in found:
+            self.assertIs(found[0], types)
+
+    def test_get_load_times(self):
+        t = taxonomy.Taxonomy(lazy=False)
+        load_times = t.get_load_times()
+        self.assertEqual(set(["semantic", "types", "units", "numeric_types", "generic_roles",
+                              "ref_parts", "documentation"]), set(load_times.keys()))
+        for load_time in load_times.values():
+            self.assertGreaterEqual(load_time, 0)
+
+    def test_get_memory_usage(self):
+        t = taxonomy.Taxonomy()
+        self.assertEqual({}, t.get_memory_usage())
+        t.units
+        memory = t.get_memory_usage()
+        self.assertEqual(["units"], list(memory.keys()))
+        self.assertGreater(memory["units"], 0)
+
+    def test_getTaxonomy(self):
+        self.assertIs(tax, taxonomy.getTaxonomy())
+        self.assertIs(tax, taxonomy.getTaxonomy(version=constants.TAXONOMY_VERSION))
+        self.assertIs(tax, taxonomy.getTaxonomy(constants.SOLAR_TAXONOMY_DIR + os.sep))
+        with self.assertRaises(ob.OBNotFoundError):
+            taxonomy.getTaxonomy(version="2018-12-14")
+
+        # Concurrent first calls return the same instance.
+        found = []
+        threads = [threading.Thread(target=lambda: found.append(taxonomy.getTaxonomy())) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for t in found:
+            self.assertIs(tax, t)
+
+    def test_get_taxonomy_stats(self):
+        tax.units
+        stats = taxonomy.get_taxonomy_stats()[(os.path.realpath(constants.SOLAR_TAXONOMY_DIR),
+                                               constants.TAXONOMY_VERSION)]
+        self.assertIn("units", stats["load_times"])
+        self.assertGreater(stats["memory"]["units"], 0)
+        self.assertEqual(sum(stats["memory"].values()), stats["total_memory"])
+        self.assertEqual(sum(stats["load_times"].values()), stats["total_load_time"])
+
+    def test_parallel(self):
+        # A parallel parse produces the same semantic component as a serial parse.
+        t = taxonomy.Taxonomy(use_cache=False, parallel=True)
+        self.assertEqual(list(tax.semantic.get_all_entrypoints()), list(t.semantic.get_all_entrypoints()))
+        self.assertEqual(len(tax.semantic.get_all_concepts()), len(t.semantic.get_all_concepts()))
+        for entrypoint in ["MonthlyOperatingReport", "All"]:
+            self.assertEqual(tax.semantic.get_entrypoint_concepts(entrypoint),
+                             t.semantic.get_entrypoint_concepts(entrypoint))
+            self.assertEqual([r.to_dict() for r in tax.semantic.get_entrypoint_relationships(entrypoint)],
+                             [r.to_dict() for r in t.semantic.get_entrypoint_relationships(entrypoint)])
+
+
+    def test_backend(self):
+        # The expat backend gives the same results as the sax backend.
+        t = taxonomy.Taxonomy(use_cache=False, backend="expat")
+        self.assertEqual(tax.semantic.get_all_concepts(), t.semantic.get_all_concepts())
+        for concept in ["solar:ACDisconnectSwitchMember", "us-gaap:AccountsReceivableNet"]:
+            self.assertEqual(tax.semantic.get_concept_details(concept).to_dict(),
+                             t.semantic.get_concept_details(concept).to_dict())
+        for entrypoint in ["MonthlyOperatingReport", "All"]:
+            self.assertEqual(tax.semantic.get_entrypoint_concepts(entrypoint),
+                             t.semantic.get_entrypoint_concepts(entrypoint))
+            self.assertEqual([r.to_dict() for r in tax.semantic.get_entrypoint_relationships(entrypoint)],
+                             [r.to_dict() for r in t.semantic.get_entrypoint_relationships(entrypoint)])
+        self.assertEqual(tax.semantic.get_concept_calculation("us-gaap:Revenues"),
+                         t.semantic.get_concept_calculation("us-gaap:Revenues"))
+        self.assertEqual(tax.types.get_all_types(), t.types.get_all_types())
+        self.assertEqual({k: u.to_dict() for k, u in tax.units.get_all_units().items()},
+                         {k: u.to_dict() for k, u in t.units.get_all_units().items()})
+        self.assertEqual(tax.numeric_types.get_all_numeric_types(), t.numeric_types.get_all_numeric_types())
+        self.assertEqual(tax.generic_roles.get_all_generic_roles(), t.generic_roles.get_all_generic_roles())
+        self.assertEqual(tax.ref_parts.get_all_ref_parts(), t.ref_parts.get_all_ref_parts())
+        self.assertEqual(tax.documentation.get_all_concepts_documentation(),
+                         t.documentation.get_all_concepts_documentation())
+
+        with self.assertRaises(ValueError):
+            taxonomy.Taxonomy(backend="dom")
+
+    def test_relative_taxonomy_dir(self):
+        t = taxonomy.Taxonomy(taxonomy_dir=os.path.relpath(constants.SOLAR_TAXONOMY_DIR), use_cache=False)
+        for entrypoint in ["MonthlyOperatingReport", "All"]:
+            self.assertEqual(tax.semantic.get_entrypoint_concepts(entrypoint),
+                             t.semantic.get_entrypoint_concepts(entrypoint))
+            self.assertEqual([r.to_dict() for r in tax.semantic.get_entrypoint_relationships(entrypoint)],
+                             [r.to_dict() for r in t.semantic.get_entrypoint_relationships(entrypoint)])
+
 
 class TestTaxonomyNumericTypes(unittest.TestCase):
 
@@ -93,6 +223,10 @@ class TextTaxonomyDocumentation(unittest.TestCase):
     def test_get_all_concepts_documentation(self):
         self.assertEqual(tax.documentation.get_all_concepts_documentation()["solar:EntitySizeACPower"],
                              "Size of the entity in megawatts AC.")
+        # Text containing entity references is not truncated.
+        self.assertEqual(tax.documentation.get_all_concepts_documentation()["solar:FinContractForSystemLenInMon"],
+                         "Length of the financial contract in months between a homeowner and a residential solar "
+                         "company, or between a commercial building owner and a C&I solar company.")
         self.assertEqual(tax.documentation.get_all_concepts_documentation()["solar:FundDescAnalyst"],
                              "Name of analyst covering the fund.")
         self.assertEqual(tax.documentation.get_all_concepts_documentation()["solar:IncentivePBIEscalator"],
@@ -128,6 +262,41 @@ class TestTaxonomyTypes(unittest.TestCase):
         self.assertEqual(len(tax.types.get_type_enum("solar-types:feeStatusItemType")), 5)
         self.assertEqual(len(tax.types.get_type_enum("solar-types:financialTransactionItemType")), 26)
         self.assertIsNone(tax.types.get_type_enum("solar-types:fdsfdsadsf"))
+        self.assertEqual(("Wind", "Solar", "Solar Plus Storage"),
+                         tax.types.get_type_enum("solar-types:projectAssetTypeItemType"))
+
+    def test_get_type_enum_set(self):
+        self.assertEqual(frozenset(["Wind", "Solar", "Solar Plus Storage"]),
+                         tax.types.get_type_enum_set("solar-types:projectAssetTypeItemType"))
+        self.assertEqual(len(tax.types.get_type_enum_set("solar-types:financialTransactionItemType")), 26)
+        self.assertIsNone(tax.types.get_type_enum_set("solar-types:fdsfdsadsf"))
+
+    def test_is_type_enum_value(self):
+        self.assertTrue(tax.types.is_type_enum_value("solar-types:inverterItemType", "Central"))
+        self.assertFalse(tax.types.is_type_enum_value("solar-types:inverterItemType", "central"))
+        self.assertFalse(tax.types.is_type_enum_value("solar-types:inverterItemType", "Wind"))
+        self.assertFalse(tax.types.is_type_enum_value("solar-types:inverterItemType", ["Central"]))
+        self.assertFalse(tax.types.is_type_enum_value("solar-types:fdsfdsadsf", "Central"))
+
+    def test_get_types_for_enum_value(self):
+        self.assertEqual(["solar-types:inverterItemType"], tax.types.get_types_for_enum_value("Central"))
+        self.assertEqual(["solar-types:participantItemType", "solar-types:solarSystemCharacterItemType"],
+                         sorted(tax.types.get_types_for_enum_value("Utility")))
+        self.assertEqual([], tax.types.get_types_for_enum_value("central"))
+
+        # The result is a copy of the index.
+        tax.types.get_types_for_enum_value("Central").append("solar-types:fdsfdsadsf")
+        self.assertEqual(["solar-types:inverterItemType"], tax.types.get_types_for_enum_value("Central"))
+
+    def test_find_type_enum_value(self):
+        self.assertEqual("Central", tax.types.find_type_enum_value("solar-types:inverterItemType", "Central"))
+        self.assertEqual("Central", tax.types.find_type_enum_value("solar-types:inverterItemType", " central "))
+        self.assertEqual("Solar Plus Storage",
+                         tax.types.find_type_enum_value("solar-types:projectAssetTypeItemType",
+                                                        "SOLAR PLUS STORAGE"))
+        self.assertIsNone(tax.types.find_type_enum_value("solar-types:inverterItemType", "Wind"))
+        self.assertIsNone(tax.types.find_type_enum_value("solar-types:inverterItemType", 52))
+        self.assertIsNone(tax.types.find_type_enum_value("solar-types:fdsfdsadsf", "Central"))
 
 
 class TestTaxonomyUnits(unittest.TestCase):
@@ -196,6 +365,22 @@ class TestTaxonomyUnits(unittest.TestCase):
         unit3 = tax.units.get_unit("Volt-ampere-hours")
         self.assertEqual(unit, unit3)
 
+    def test_get_units(self):
+        units = tax.units.get_units(["VAh", "u00291", "Volt-ampere-hours", "VAhh"])
+        self.assertEqual([tax.units.get_unit("VAh")] * 3 + [None], units)
+        units = tax.units.get_units(["VAh", "u00291"], "id")
+        self.assertEqual([None, tax.units.get_unit("VAh")], units)
+        self.assertEqual([], tax.units.get_units([]))
+        with self.assertRaises(ValueError):
+            tax.units.get_units(["VAh"], "symbol")
+
+    def test_get_item_type_units(self):
+        units = tax.units.get_item_type_units("energyItemType")
+        self.assertIn(tax.units.get_unit("VAh"), units)
+        self.assertIn(tax.units.get_unit("kWh"), units)
+        self.assertEqual([u for u in tax.units.get_all_units().values() if u.item_type == "energyItemType"], units)
+        self.assertEqual([], tax.units.get_item_type_units("notAnItemType"))
+
     def test_get_all_units(self):
         units = tax.units.get_all_units()
         self.assertIsInstance(units, dict)
@@ -204,6 +389,42 @@ class TestTaxonomyUnits(unittest.TestCase):
 
 class TestTaxonomySemantic(unittest.TestCase):
 
+    def test_lazy_entrypoints(self):
+        semantic = taxonomy.Taxonomy(lazy_entrypoints=True).semantic
+        self.assertEqual(tax.semantic.get_all_entrypoints(), semantic.get_all_entrypoints())
+        self.assertTrue(semantic.is_entrypoint("Fund"))
+        self.assertFalse(semantic.is_entrypoint("Fnd"))
+        self.assertEqual({}, semantic._concepts_by_entrypoint)
+
+        # Only the entrypoints in use are loaded, including the US-GAAP concepts they use.
+        concepts, details = semantic.get_entrypoint_concepts("MonthlyOperatingReport", details=True)
+        expected_concepts, expected_details = tax.semantic.get_entrypoint_concepts("MonthlyOperatingReport",
+                                                                                   details=True)
+        self.assertEqual(expected_concepts, concepts)
+        self.assertEqual({c: d.to_dict() for c, d in expected_details.items()},
+                         {c: d.to_dict() for c, d in details.items()})
+        self.assertIn("us-gaap:AccountsReceivableNet", details)
+        self.assertEqual([r.to_dict() for r in tax.semantic.get_entrypoint_relationships("MonthlyOperatingReport")],
+                         [r.to_dict() for r in semantic.get_entrypoint_relationships("MonthlyOperatingReport")])
+        self.assertTrue(semantic.is_concept("us-gaap:AccountsReceivableNet"))
+        self.assertEqual(["MonthlyOperatingReport"], list(semantic._concepts_by_entrypoint))
+        self.assertEqual(set(concepts), set(semantic._concepts_details))
+
+        # Looking up a concept of another entrypoint, or a concept that does not exist, only loads the
+        # details of the concept.
+        self.assertFalse(semantic.is_concept("solar:NotAConcept"))
+        self.assertIsNone(semantic.get_concept_details("solar:NotAConcept"))
+        self.assertTrue(semantic.is_concept("us-gaap:SaleLeasebackTransactionLeaseTerms"))
+        self.assertEqual(tax.semantic.get_concept_details("solar:InverterStyle").to_dict(),
+                         semantic.get_concept_details("solar:InverterStyle").to_dict())
+        self.assertEqual(["MonthlyOperatingReport"], list(semantic._concepts_by_entrypoint))
+
+        # Methods needing every entrypoint load everything, the result is the same as a full load.
+        self.assertEqual(tax.semantic.get_all_concepts(), semantic.get_all_concepts())
+        self.assertEqual(tax.semantic.get_all_entrypoints(), semantic.get_all_entrypoints())
+        self.assertEqual(tax.semantic.get_entrypoint_concepts("Fund"), semantic.get_entrypoint_concepts("Fund"))
+        self.assertFalse(semantic.is_concept("solar:NotAConcept"))
+
     def test_concept_details(self):
 
         # Data type checks
@@ -355,6 +576,64 @@ class TestTaxonomySemantic(unittest.TestCase):
         self.assertEqual(len(tax.semantic.get_entrypoint_relationships("Utility")), 7)
         self.assertEqual(85, len(tax.semantic.get_entrypoint_relationships("MonthlyOperatingReport")))
         self.assertEqual(299, len(tax.semantic.get_entrypoint_relationships("CutSheet")))
+        relationships = tax.semantic.get_entrypoint_relationships(
+            "MonthlyOperatingReport", taxonomy.RelationshipRole.domain_member)
+        self.assertEqual([r for r in tax.semantic.get_entrypoint_relationships("MonthlyOperatingReport")
+                          if r.role == taxonomy.RelationshipRole.domain_member], relationships)
+        self.assertIsNone(tax.semantic.get_entrypoint_relationships("Arggh", taxonomy.RelationshipRole.domain_member))
+
+    def test_get_relationships_from(self):
+        relationships = tax.semantic.get_entrypoint_relationships("MonthlyOperatingReport")
+        for concept in set(r.from_ for r in relationships):
+            self.assertEqual([r for r in relationships if r.from_ == concept],
+                             tax.semantic.get_relationships_from("MonthlyOperatingReport", concept))
+        axes = tax.semantic.get_relationships_from("MonthlyOperatingReport", "solar:AcctRecvAgingTable",
+                                                   taxonomy.RelationshipRole.hypercube_dimension)
+        self.assertTrue(len(axes) > 0)
+        for r in axes:
+            self.assertEqual(taxonomy.RelationshipRole.hypercube_dimension, r.role)
+        self.assertEqual([], tax.semantic.get_relationships_from("MonthlyOperatingReport", "solar:NotAConcept"))
+        self.assertIsNone(tax.semantic.get_relationships_from("Arggh", "solar:AcctRecvAgingTable"))
+
+    def test_get_relationships_to(self):
+        relationships = tax.semantic.get_entrypoint_relationships("CutSheet")
+        for concept in set(r.to for r in relationships):
+            self.assertEqual([r for r in relationships if r.to == concept],
+                             tax.semantic.get_relationships_to("CutSheet", concept))
+            for role in taxonomy.RelationshipRole:
+                self.assertEqual([r for r in relationships if r.to == concept and r.role == role],
+                                 tax.semantic.get_relationships_to("CutSheet", concept, role))
+        self.assertEqual([], tax.semantic.get_relationships_to("CutSheet", "solar:NotAConcept"))
+        self.assertIsNone(tax.semantic.get_relationships_to("Arggh", "solar:ProductIdentifierTable"))
+
+    def test_get_concept_entrypoints(self):
+        entrypoints = tax.semantic.get_concept_entrypoints("solar:MeasEnergy")
+        self.assertEqual(set(["All", "IECRECertificate", "MonthlyOperatingReport", "SystemProduction"]), entrypoints)
+        for entrypoint in entrypoints:
+            self.assertIn("solar:MeasEnergy", tax.semantic.get_entrypoint_concepts(entrypoint))
+        self.assertEqual(set(), tax.semantic.get_concept_entrypoints("solar:NotAConcept"))
+
+    def test_find_entrypoints_for_concepts(self):
+        concepts = ["solar:MeasEnergy", "solar:ExpectEnergyAtTheRevenueMeter"]
+        exact, candidates = tax.semantic.find_entrypoints_for_concepts(concepts)
+        self.assertEqual(["IECRECertificate", "MonthlyOperatingReport", "SystemProduction"], exact)
+        self.assertEqual([(e, 2) for e in exact], candidates[:3])
+
+        concepts = tax.semantic.get_entrypoint_concepts("CutSheet")
+        exact, candidates = tax.semantic.find_entrypoints_for_concepts(concepts)
+        self.assertEqual(["CutSheet"], exact)
+        self.assertEqual(("CutSheet", len(set(concepts))), candidates[0])
+        for entrypoint, count in candidates:
+            self.assertEqual(len(set(concepts) & set(tax.semantic.get_entrypoint_concepts(entrypoint))), count)
+        self.assertNotIn("All", [entrypoint for entrypoint, count in candidates])
+        exact, candidates = tax.semantic.find_entrypoints_for_concepts(concepts, include_all=True)
+        self.assertEqual(["All", "CutSheet"], exact)
+
+        exact, candidates = tax.semantic.find_entrypoints_for_concepts(concepts + ["solar:NotAConcept"])
+        self.assertEqual([], exact)
+        self.assertEqual(("CutSheet", len(set(concepts))), candidates[0])
+        self.assertEqual(([], []), tax.semantic.find_entrypoints_for_concepts([]))
+        self.assertEqual(([], []), tax.semantic.find_entrypoints_for_concepts(["solar:NotAConcept"]))
 
     def test_is_concept(self):
         self.assertTrue(tax.semantic.is_concept("solar:EnvImpactRptExpDate"))
@@ -378,6 +657,22 @@ class TestTaxonomySemantic(unittest.TestCase):
         self.assertEqual("us-gaap:AccumulatedDepreciationDepletionAndAmortizationPropertyPlantAndEquipment", calcs[1][0])
         self.assertEqual(-1, calcs[1][1])
 
+    def test_get_concept_calculation_closure(self):
+        self.assertIsNone(tax.semantic.get_concept_calculation_closure("solar:notaconcept"))
+        self.assertEqual([], tax.semantic.get_concept_calculation_closure("solar:Curtail"))
+        self.assertEqual(tax.semantic.get_concept_calculation("us-gaap:PropertyPlantAndEquipmentNet"),
+                         tax.semantic.get_concept_calculation_closure("us-gaap:PropertyPlantAndEquipmentNet"))
+        closure = dict(tax.semantic.get_concept_calculation_closure("us-gaap:Assets"))
+        self.assertNotIn("us-gaap:AssetsNoncurrent", closure)
+        self.assertNotIn("us-gaap:PropertyPlantAndEquipmentNet", closure)
+        self.assertEqual(1, closure["us-gaap:PropertyPlantAndEquipmentGross"])
+        self.assertEqual(-1, closure["us-gaap:AccumulatedDepreciationDepletionAndAmortizationPropertyPlantAndEquipment"])
+        closure = dict(tax.semantic.get_concept_calculation_closure("us-gaap:NetIncomeLoss"))
+        self.assertEqual(1, closure["solar:PBIRevenue"])
+        self.assertEqual(-1, closure["us-gaap:UtilitiesCosts"])
+        for concept in closure:
+            self.assertEqual([], tax.semantic.get_concept_calculation(concept))
+
     def test_get_concept_calculated_usage(self):
         self.assertIsNone(tax.semantic.get_concept_calculated_usage("solar:notaconcept"))
         self.assertEqual(0, len(tax.semantic.get_concept_calculated_usage("solar:Curtail")))
@@ -385,6 +680,29 @@ class TestTaxonomySemantic(unittest.TestCase):
         self.assertEqual(1, len(calc))
         self.assertEqual("us-gaap:StockholdersEquity", calc[0])
 
+    def test_get_instance_template(self):
+        from oblib import data_model
+        template = tax.get_instance_template("MonthlyOperatingReport")
+        self.assertIsInstance(template, data_model.OBInstanceTemplate)
+        self.assertIs(template, tax.get_instance_template("MonthlyOperatingReport"))
+        self.assertEqual(["solar:AcctRecvAgingTable", "solar:OpRptCashDistributionTable"],
+                         sorted(template.get_table_names()))
+        with self.assertRaises(ob.OBNotFoundError):
+            tax.get_instance_template("Arggh")
+
+        # Documents share the template but not their contexts.
+        doc1 = data_model.OBInstance("MonthlyOperatingReport", tax)
+        doc2 = data_model.OBInstance("MonthlyOperatingReport", tax)
+        self.assertIs(doc1.get_concept("solar:MeasEnergy"), doc2.get_concept("solar:MeasEnergy"))
+        self.assertEqual(template.get_table_names(), doc1.get_table_names())
+        table1 = doc1.get_table("solar:AcctRecvAgingTable")
+        table2 = doc2.get_table("solar:AcctRecvAgingTable")
+        self.assertIsNot(table1, table2)
+        self.assertEqual(table1.get_axes(), table2.get_axes())
+        doc1.set("solar:MeasEnergy", 10, unit_name="kWh", entity="ACME", duration="forever")
+        self.assertEqual([], doc2.get_all_facts())
+        self.assertNotIn(data_model.UNTABLE, doc2.get_table_names())
+
     def test_get_concept_units(self):
         units = tax.get_concept_units("solar:Albedo")
         self.assertEqual(1, len(units))
@@ -397,6 +715,17 @@ class TestTaxonomySemantic(unittest.TestCase):
         self.assertEqual(
             ["Acre", "Square Foot", "Square Mile", "Square Yard", "Hectare", "Square km", "Square metre"].sort(),
             units.sort())
+        # The returned list is a copy of the memoized units.
+        units.append("Furlong")
+        self.assertEqual(7, len(tax.get_concept_units("solar:ArrayTotalModuleArea")))
+
+    def test_get_entrypoint_concepts_units(self):
+        self.assertIsNone(tax.get_entrypoint_concepts_units("Arggh"))
+        concepts_units = tax.get_entrypoint_concepts_units("MonthlyOperatingReport")
+        self.assertEqual(set(tax.semantic.get_entrypoint_concepts("MonthlyOperatingReport")), set(concepts_units))
+        for concept, units in concepts_units.items():
+            self.assertEqual(tax.get_concept_units(concept), units)
+        self.assertIn("Kilowatt-Hours", concepts_units["solar:MeasEnergy"])
 
     def test_unrequired_concepts_removed(self):
         """
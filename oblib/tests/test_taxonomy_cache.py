@@ -0,0 +1,106 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from oblib import constants, taxonomy, taxonomy_cache, taxonomy_loader
+
+
+class TestTaxonomyCache(unittest.TestCase):
+
+    def setUp(self):
+        self.taxonomy_dir = tempfile.mkdtemp()
+        self.cache_dir = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.taxonomy_dir, "core"))
+        with open(os.path.join(self.taxonomy_dir, "core", "a.xsd"), "w") as outfile:
+            outfile.write("<a/>")
+
+    def tearDown(self):
+        shutil.rmtree(self.taxonomy_dir)
+        shutil.rmtree(self.cache_dir)
+
+    def test_key(self):
+        key = taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir).key()
+        self.assertEqual(40, len(key))
+        self.assertEqual(key, taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir).key())
+
+        # Hidden files such as .git contents do not change the key.
+        os.mkdir(os.path.join(self.taxonomy_dir, ".git"))
+        with open(os.path.join(self.taxonomy_dir, ".git", "HEAD"), "w") as outfile:
+            outfile.write("ref")
+        self.assertEqual(key, taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir).key())
+
+        # Any change to a taxonomy file changes the key.
+        with open(os.path.join(self.taxonomy_dir, "core", "a.xsd"), "w") as outfile:
+            outfile.write("<b/>")
+        self.assertNotEqual(key, taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir).key())
+
+    def test_load(self):
+        cache = taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir)
+        self.assertIsNone(cache.load("types"))
+
+        types = taxonomy.TaxonomyTypes(taxonomy_loader.TaxonomyLoader())
+        self.assertTrue(cache.save("types", types))
+        loaded = cache.load("types")
+        self.assertIsInstance(loaded, taxonomy.TaxonomyTypes)
+        self.assertEqual(types.get_all_types(), loaded.get_all_types())
+
+        # Stale image: a taxonomy change means the image is no longer found.
+        with open(os.path.join(self.taxonomy_dir, "core", "b.xsd"), "w") as outfile:
+            outfile.write("<b/>")
+        self.assertIsNone(taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir).load("types"))
+
+    def test_load_corrupt(self):
+        cache = taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir)
+        self.assertTrue(cache.save("units", [1, 2, 3]))
+        pathname = os.path.join(self.cache_dir, cache.key(), "units.pickle")
+        with open(pathname, "wb") as outfile:
+            outfile.write(b"\x80\x04not a pickle")
+        self.assertIsNone(cache.load("units"))
+        self.assertFalse(os.path.exists(pathname))
+
+    def test_save(self):
+        cache = taxonomy_cache.TaxonomyCache(self.taxonomy_dir, os.path.join(self.cache_dir, "new", "dir"))
+        self.assertTrue(cache.save("ref_parts", ["Publisher"]))
+        self.assertEqual(["Publisher"], cache.load("ref_parts"))
+
+    def test_invalidate(self):
+        cache = taxonomy_cache.TaxonomyCache(self.taxonomy_dir, self.cache_dir)
+        cache.save("ref_parts", ["Publisher"])
+        os.mkdir(os.path.join(self.cache_dir, "unrelated"))
+        cache.invalidate()
+        self.assertIsNone(cache.load("ref_parts"))
+        self.assertTrue(os.path.isdir(os.path.join(self.cache_dir, "unrelated")))
+
+    def test_taxonomy_cache_dir(self):
+        # The cache is not used unless asked for.
+        taxonomy_cache_dir = constants.TAXONOMY_CACHE_DIR
+        try:
+            constants.TAXONOMY_CACHE_DIR = None
+            self.assertIsNone(taxonomy.Taxonomy()._cache)
+            constants.TAXONOMY_CACHE_DIR = self.cache_dir
+            self.assertIsNotNone(taxonomy.Taxonomy()._cache)
+        finally:
+            constants.TAXONOMY_CACHE_DIR = taxonomy_cache_dir
+        self.assertIsNone(taxonomy.Taxonomy(use_cache=False, cache_dir=self.cache_dir)._cache)
+
+        # The images are written to and read back from cache_dir.
+        types = taxonomy.Taxonomy(cache_dir=self.cache_dir).types
+        self.assertEqual(1, len(os.listdir(self.cache_dir)))
+        cached = taxonomy.Taxonomy(cache_dir=self.cache_dir)
+        self.assertIsNotNone(cached._cache.load("types"))
+        self.assertEqual(types.get_all_types(), cached.types.get_all_types())
@@ -0,0 +1,132 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from oblib import ob, taxonomy, taxonomy_cache, taxonomy_tables
+
+
+tax = taxonomy.getTaxonomy()
+
+
+class TestTaxonomyTables(unittest.TestCase):
+
+    def setUp(self):
+        self.tables_dir = tempfile.mkdtemp()
+        tax.export_tables(self.tables_dir)
+        self.attached = taxonomy.Taxonomy(tables_dir=self.tables_dir)
+
+    def tearDown(self):
+        self.attached.close()
+        shutil.rmtree(self.tables_dir)
+
+    def test_taxonomy_tables(self):
+        pathname = os.path.join(self.tables_dir, taxonomy_tables.UNITS_FILENAME)
+        with taxonomy_tables.TaxonomyTables(pathname) as tables:
+            self.assertEqual(len(tax.units.get_all_units()), tables.count("units"))
+            self.assertIsNotNone(tables.find("units", "kWh"))
+            self.assertIsNone(tables.find("units", "kWhh"))
+            self.assertFalse(tables.closed)
+            self.assertEqual(taxonomy_cache.hash_taxonomy_dir(), tables.taxonomy_hash)
+        self.assertTrue(tables.closed)
+        with self.assertRaises(ValueError):
+            tables.find("units", "kWh")
+        tables.close()
+
+        pathname = os.path.join(self.tables_dir, "bad.obt")
+        with open(pathname, "wb") as outfile:
+            outfile.write(b"not a tables file")
+        with self.assertRaises(ValueError):
+            taxonomy_tables.TaxonomyTables(pathname)
+
+    def test_write_semantic_tables(self):
+        semantic = self.attached.semantic
+        self.assertIsInstance(semantic.get_all_concepts(details=True), taxonomy_tables.RecordMapping)
+
+        self.assertEqual(tax.semantic.get_all_concepts(), semantic.get_all_concepts())
+        self.assertEqual(tax.semantic.get_all_entrypoints(), semantic.get_all_entrypoints())
+        self.assertEqual(sorted(tax.semantic.get_all_type_names()), sorted(semantic.get_all_type_names()))
+        for concept in ["solar:ACDisconnectSwitchMember", "us-gaap:AccountsReceivableNet",
+                        "dei:LegalEntityIdentifier"]:
+            self.assertTrue(semantic.is_concept(concept))
+            self.assertEqual(tax.semantic.get_concept_details(concept).to_dict(),
+                             semantic.get_concept_details(concept).to_dict())
+        self.assertFalse(semantic.is_concept("solar:NotAConcept"))
+        self.assertIsNone(semantic.get_concept_details("solar:NotAConcept"))
+
+        for entrypoint in ["MonthlyOperatingReport", "CutSheet", "All"]:
+            self.assertEqual(tax.semantic.get_entrypoint_concepts(entrypoint),
+                             semantic.get_entrypoint_concepts(entrypoint))
+            self.assertEqual([r.to_dict() for r in tax.semantic.get_entrypoint_relationships(entrypoint)],
+                             [r.to_dict() for r in semantic.get_entrypoint_relationships(entrypoint)])
+        for entrypoint in ["MonthlyOperatingReport", "CutSheet"]:
+            self.assertEqual(tax.semantic.get_entrypoint_details(entrypoint).to_dict(),
+                             semantic.get_entrypoint_details(entrypoint).to_dict())
+        self.assertEqual(tax.semantic.get_concept_calculation("us-gaap:Revenues"),
+                         semantic.get_concept_calculation("us-gaap:Revenues"))
+        self.assertEqual(tax.semantic.get_concept_calculated_usage("solar:PBIRevenue"),
+                         semantic.get_concept_calculated_usage("solar:PBIRevenue"))
+
+    def test_write_units_tables(self):
+        units = self.attached.units
+        self.assertEqual(list(tax.units.get_all_units()), list(units.get_all_units()))
+        for unit_id in tax.units.get_all_units():
+            self.assertEqual(tax.units.get_unit(unit_id).to_dict(), units.get_unit(unit_id).to_dict())
+        self.assertTrue(units.is_unit("Kilowatt-Hours", "unit_name"))
+        self.assertEqual("kWh", units.get_unit("u00016", "id").unit_id)
+        with self.assertRaises(ob.OBNotFoundError):
+            units.get_unit("kWhh")
+
+    def test_record_sequence(self):
+        concepts = self.attached.semantic.get_entrypoint_concepts("MonthlyOperatingReport")
+        self.assertIsInstance(concepts, taxonomy_tables.RecordSequence)
+        expected = tax.semantic.get_entrypoint_concepts("MonthlyOperatingReport")
+        self.assertEqual(len(expected), len(concepts))
+        self.assertEqual(expected[-1], concepts[-1])
+        self.assertEqual(expected[2:5], concepts[2:5])
+        self.assertIn(expected[3], concepts)
+        with self.assertRaises(IndexError):
+            concepts[len(expected)]
+
+    def test_close(self):
+        units = self.attached.units
+        self.assertTrue(units.is_unit("kWh"))
+        self.attached.close()
+        with self.assertRaises(ValueError):
+            units.is_unit("kWh")
+        self.attached.close()
+
+        with taxonomy.Taxonomy(tables_dir=self.tables_dir) as attached:
+            semantic = attached.semantic
+            self.assertTrue(semantic.is_concept("solar:ACDisconnectSwitchMember"))
+        with self.assertRaises(ValueError):
+            semantic.is_concept("solar:ACDisconnectSwitchMember")
+
+    def test_stale_tables(self):
+        # Tables written from other taxonomy files are not attached, the components are parsed instead.
+        pathname = os.path.join(self.tables_dir, taxonomy_tables.UNITS_FILENAME)
+        taxonomy_tables.write_units_tables(tax.units, pathname, "0123456789abcdef0123456789abcdef01234567")
+        with taxonomy_tables.TaxonomyTables(pathname) as tables:
+            self.assertEqual("0123456789abcdef0123456789abcdef01234567", tables.taxonomy_hash)
+        with taxonomy.Taxonomy(tables_dir=self.tables_dir, use_cache=False) as stale:
+            self.assertIsInstance(stale.units.get_all_units(), dict)
+            self.assertEqual(list(tax.units.get_all_units()), list(stale.units.get_all_units()))
+            self.assertIsInstance(stale.semantic.get_all_concepts(details=True), taxonomy_tables.RecordMapping)
+
+        taxonomy_tables.write_units_tables(tax.units, pathname)
+        with taxonomy_tables.TaxonomyTables(pathname) as tables:
+            self.assertIsNone(tables.taxonomy_hash)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import datetime
+import sys
 import unittest
 from oblib import util
 
@@ -42,3 +43,11 @@ class TestUtil(unittest.TestCase):
         self.assertNotEqual(util.convert_taxonomy_xsd_date("2017-02-15"), d)
         self.assertNotEqual(util.convert_taxonomy_xsd_date("2017-03-14"), d)
         self.assertNotEqual(util.convert_taxonomy_xsd_date("2018-02-14"), d)
+
+    def test_get_size(self):
+        s = "a string"
+        self.assertEqual(util.get_size(s), sys.getsizeof(s))
+        self.assertGreater(util.get_size([s]), util.get_size(s))
+        # Shared objects are counted once.
+        self.assertEqual(util.get_size([s, s]) - sys.getsizeof([s, s]), sys.getsizeof(s))
+        self.assertGreater(util.get_size({"key": [1, 2, 3]}), util.get_size({"key": []}))
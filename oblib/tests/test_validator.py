@@ -13,9 +13,15 @@
 # limitations under the License.
 
 import unittest
-from oblib import identifier, taxonomy, validator
+from datetime import date
+from oblib import identifier, ob, taxonomy, validator
 
-tax = taxonomy.Taxonomy()
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+tax = taxonomy.getTaxonomy()
 validator = validator.Validator(tax)
 
 
@@ -56,6 +62,94 @@ class TestValidator(unittest.TestCase):
         self.assertEqual(1, len(validator.validate_concept_value(concept, "Arf")[1]))
         self.assertEqual(0, len(validator.validate_concept_value(concept, identifier.identifier())[1]))
 
+    def test_get_validation_plan(self):
+        concept = taxonomy.ConceptDetails()
+        concept.id = "solar:InverterType"
+        concept.type_name = "solar-types:inverterItemType"
+        concept.nillable = True
+        plan = validator.get_validation_plan(concept)
+        self.assertIs(plan, validator.get_validation_plan(concept))
+        self.assertIs(tax.types.get_type_enum_set(concept.type_name), plan.enum)
+        self.assertTrue(plan.nillable)
+        self.assertFalse(plan.identifier)
+        self.assertEqual([], plan.validate("Central")[1])
+        self.assertEqual(1, len(plan.validate("Arf")[1]))
+        self.assertEqual(1, len(plan.validate(["Central"])[1]))
+        self.assertEqual(("central", ["Value 'central' is not found in enum list for type "
+                                      "'solar-types:inverterItemType'. Did you mean 'Central'?"]),
+                         plan.validate("central"))
+
+        # Changing the concept details compiles a new plan.
+        concept.id = "solar:DeviceIdentifier"
+        concept.type_name = "xbrli:integerItemType"
+        plan = validator.get_validation_plan(concept)
+        self.assertIsNone(plan.enum)
+        self.assertTrue(plan.identifier)
+        self.assertEqual((52, ["'solar:DeviceIdentifier' is not valid identifier."]),
+                         plan.validate("52"))
+
+        concept.type_name = "xbrli:unknownItemType"
+        with self.assertRaises(ob.OBValidationError):
+            validator.get_validation_plan(concept)
+
+    @unittest.skipIf(numpy is None, "NumPy is not installed")
+    def test_validate_many(self):
+        concept = taxonomy.ConceptDetails()
+        concept.id = "SomeId"
+        concept.nillable = False
+
+        concept.type_name = "xbrli:booleanItemType"
+        values, errors, messages = validator.validate_many(concept, ["true", "0", "Arf", "N"])
+        self.assertEqual([True, False, False], values[[0, 1, 3]].tolist())
+        self.assertEqual([False, False, True, False], errors.tolist())
+        self.assertEqual({2: ["'Arf' is not a valid boolean value."]}, messages)
+
+        concept.type_name = "xbrli:integerItemType"
+        values, errors, messages = validator.validate_many(concept, numpy.array(["52", " -7", "1_000"]))
+        self.assertEqual([52, -7, 1000], values.tolist())
+        self.assertFalse(errors.any())
+        values, errors, messages = validator.validate_many(concept, ["52", "5.5", 3, None, 10 ** 20])
+        self.assertEqual([False, True, False, True, False], errors.tolist())
+        self.assertEqual(52, values[0])
+        self.assertEqual(10 ** 20, values[4])
+        self.assertEqual([1, 3], sorted(messages))
+        self.assertEqual(2, len(messages[3]))
+
+        concept.type_name = "xbrli:decimalItemType"
+        values, errors, messages = validator.validate_many(concept, ["1.5", "inf", "1e3"])
+        self.assertEqual([1.5, float("inf"), 1000.0], values.tolist())
+        self.assertFalse(errors.any())
+        # Floats and booleans are not valid decimal values.
+        values, errors, messages = validator.validate_many(concept, [1.5, 2.0])
+        self.assertEqual([True, True], errors.tolist())
+
+        concept.type_name = "xbrli:dateItemType"
+        values, errors, messages = validator.validate_many(
+            concept, ["2019-01-01", "2019-1-2", "2019-01", "0000-01-01"])
+        self.assertEqual([date(2019, 1, 1), date(2019, 1, 2)], values[:2].tolist())
+        self.assertEqual([False, False, True, True], errors.tolist())
+        values, errors, messages = validator.validate_many(concept, [date(2019, 1, 1), date(2019, 2, 1)])
+        self.assertEqual([date(2019, 1, 1), date(2019, 2, 1)], values.tolist())
+        self.assertFalse(errors.any())
+
+        concept.type_name = "solar-types:inverterItemType"
+        values, errors, messages = validator.validate_many(concept, ["Central", "central", "String"])
+        self.assertEqual([False, True, False], errors.tolist())
+        self.assertEqual([1], list(messages))
+
+        # Results are the same as validating the values one at a time.
+        concept.type_name = "xbrli:integerItemType"
+        column = [True, 7, "8", "Arf", 1.5, None]
+        values, errors, messages = validator.validate_many(concept, column)
+        for index, value in enumerate(column):
+            converted, value_errors = validator.validate_concept_value(concept, value)
+            self.assertEqual(value_errors, messages.get(index, []))
+            if not value_errors:
+                self.assertEqual(converted, values[index])
+
+        with self.assertRaises(ValueError):
+            validator.validate_many(concept, numpy.zeros((2, 2)))
+
     def test_get_validator_method_name(self):
         type_name = "xbrli:booleanItemType"
         method_name_expected = "_xbrli_boolean_item_type_validator"
@@ -18,6 +18,7 @@ exported as part of the module so if a method has an external signature place it
 """
 
 import datetime
+import sys
 
 
 def convert_taxonomy_xsd_bool(inp):
@@ -79,3 +80,42 @@ def convert_json_datetime(inp):
         return datetime.datetime.strptime(inp, "%Y-%m-%dT%H:%M:%S").date()
     except ValueError:
         return None
+
+
+def get_size(obj):
+    """
+    Returns an estimate of the memory used by an object and everything reachable from it (dict and
+    sequence contents, instance attributes and slots).  Objects reachable by several paths, such as
+    interned strings, are counted once.
+
+    Args:
+        obj (object): object to measure.
+
+    Returns:
+        The approximate size in bytes.
+    """
+
+    seen = set()
+    size = 0
+    pending = [obj]
+    while pending:
+        o = pending.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        if isinstance(o, dict):
+            pending.extend(o.keys())
+            pending.extend(o.values())
+        elif isinstance(o, (list, tuple, set, frozenset)):
+            pending.extend(o)
+        if hasattr(o, "__dict__"):
+            pending.append(o.__dict__)
+        for cls in type(o).__mro__:
+            slots = getattr(cls, "__slots__", ())
+            if isinstance(slots, str):
+                slots = (slots,)
+            for slot in slots:
+                if hasattr(o, slot):
+                    pending.append(getattr(o, slot))
+    return size
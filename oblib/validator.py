@@ -14,16 +14,28 @@
 
 """Validation functions."""
 
+import functools
 import re
 from datetime import date, datetime
 from oblib import identifier, ob
 import validators
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 BOOLEAN_TRUE = ['true', 't', 'y', '1']
 BOOLEAN_FALSE = ['false', 'f', 'n', '0']
 BOOLEAN_VALUES = BOOLEAN_TRUE + BOOLEAN_FALSE
 
+# Exact float powers of ten, up to the number of digits of a plain number.
+_POWERS_OF_TEN = [float("1e{}".format(exponent)) for exponent in range(19)]
+
+# NumPy dtypes of the arrays of values of a single Python type.
+_ARRAY_DTYPES = {bool: "bool", int: "int64", float: "float64", str: "str", date: "datetime64[D]"}
+
 
 # TODO: There are several main improvements at this point in time:
 #
@@ -41,6 +53,432 @@ BOOLEAN_VALUES = BOOLEAN_TRUE + BOOLEAN_FALSE
 #     This may require a different function signature.
 
 
+class ValidationPlan(object):
+    """
+    Validation of the values of one concept, compiled once from its ConceptDetails.
+
+    Attributes:
+        concept_id: str
+            ID of the concept.
+        type_name: str
+            XBRL data type of the concept.
+        method: callable
+            Validator taking a value and returning a tuple (value, list of str),
+            None if the type is not a str and values are not type checked.
+        enum: frozenset
+            Enumerated values of the type, None if the type is not an enumeration.
+        enum_lookup: callable
+            Lookup of the enumerated value of the type matching a value ignoring
+            case, None if the type is not an enumeration.
+        nillable: boolean
+            True if the concept can be set to None.
+        identifier: boolean
+            True if values must be valid identifiers.
+        batch: callable
+            Vectorized counterpart of method taking a NumPy array of values,
+            None if values are validated one at a time.
+    """
+
+    __slots__ = ("concept_id", "type_name", "method", "enum", "enum_lookup", "nillable", "identifier",
+                 "batch")
+
+    def __init__(self, concept_id, type_name, method, enum, nillable, identifier):
+        """Plan constructor."""
+        self.concept_id = concept_id
+        self.type_name = type_name
+        self.method = method
+        self.enum = enum
+        self.enum_lookup = None
+        self.nillable = nillable
+        self.identifier = identifier
+        self.batch = None
+
+    def validate(self, value):
+        """
+        Validate a value of the concept.
+
+        Args:
+            value (*): value to be validated.
+
+        Returns:
+            A tuple (*, list of str) containing original or converted value
+            and list of errors (can be empty).
+        """
+        errors = []
+        if value is None and not self.nillable:
+            errors.append("'{}' is not allowed to be nillable (null)."
+                          .format(self.concept_id))
+        result = (value, []) if self.method is None else self.method(value)
+        if self.identifier and not identifier.validate(value):
+            errors.append("'{}' is not valid identifier.".format(self.concept_id))
+        errors += result[1]
+        return result[0], errors
+
+    def validate_many(self, values):
+        """
+        Validate a column of values of the concept.
+
+        Args:
+            values (list or NumPy array): values to be validated.
+
+        Returns:
+            A tuple (NumPy array, NumPy array of bool, dict) containing the
+            original or converted values, True for the values in error and the
+            list of errors of each value in error keyed by its index.
+        """
+        array = _as_array(values)
+        converted = None
+        valid = numpy.zeros(len(array), dtype=bool)
+        if self.batch is not None and not self.identifier:
+            for rows, typed in _split_by_type(array):
+                checked = self.batch(typed)
+                if checked is None:
+                    continue
+                if rows is None:
+                    converted, valid = checked
+                    continue
+                if converted is None:
+                    converted = numpy.empty(len(array), dtype=checked[0].dtype)
+                elif converted.dtype != checked[0].dtype:
+                    converted = converted.astype(object)
+                converted[rows] = checked[0]
+                valid[rows] = checked[1]
+        if converted is None:
+            converted = numpy.empty(len(array), dtype=object)
+
+        # Values which could not be validated with NumPy and values in error,
+        # for their error messages, are validated one at a time.
+        errors = {}
+        for index in numpy.flatnonzero(~valid):
+            value = array[index]
+            if isinstance(value, numpy.generic):
+                value = value.item()
+            value, value_errors = self.validate(value)
+            if value_errors:
+                errors[int(index)] = value_errors
+                continue
+            valid[index] = True
+            if converted.dtype != object and converted.dtype != _ARRAY_DTYPES.get(type(value)):
+                converted = converted.astype(object)
+            try:
+                converted[index] = value
+            except OverflowError:
+                converted = converted.astype(object)
+                converted[index] = value
+        return converted, ~valid, errors
+
+    def _validate_enum(self, value):
+        """
+        Validate a value against the enumeration of the type.
+
+        Args:
+            value (*): value to be validated.
+
+        Returns:
+            A Tuple (*, list of str) containing original value and list of errors (if any)
+        """
+        try:
+            found = value in self.enum
+        except TypeError:
+            # Unhashable values can't be enumerated values.
+            found = False
+        if not found:
+            error = "Value '{}' is not found in enum list for type '{}'.".format(value, self.type_name)
+            suggestion = self.enum_lookup(value) if self.enum_lookup else None
+            if suggestion is not None:
+                error += " Did you mean '{}'?".format(suggestion)
+            return value, [error]
+        return value, []
+
+    def _validate_enums(self, array):
+        """
+        Vectorized _validate_enum.
+
+        Args:
+            array (NumPy array): values to be validated.
+
+        Returns:
+            A tuple (NumPy array, NumPy array of bool) containing the values and
+            True for the valid values, None if the values can't be vectorized.
+        """
+        if array.dtype.kind != "U":
+            return None
+        return array.copy(), numpy.isin(array, list(self.enum))
+
+
+def _as_array(values):
+    """
+    Convert a column of values to a NumPy array.
+
+    Args:
+        values (list or NumPy array): values.
+
+    Returns:
+        A NumPy array of the values, typed if all the values are of the same
+        Python type, of object dtype otherwise.
+    """
+    if isinstance(values, numpy.ndarray):
+        if values.ndim != 1:
+            raise ValueError("Values must be a one dimensional array, got {} dimensions."
+                             .format(values.ndim))
+        return values
+    values = list(values)
+    types = set(map(type, values))
+    if len(types) == 1:
+        dtype = _ARRAY_DTYPES.get(types.pop())
+        if dtype is not None:
+            try:
+                return numpy.array(values, dtype=dtype)
+            except OverflowError:
+                pass
+    return numpy.fromiter(values, dtype=object, count=len(values))
+
+
+def _split_by_type(array):
+    """
+    Split an array of values by Python type.
+
+    Args:
+        array (NumPy array): values.
+
+    Returns:
+        A list of tuples (NumPy array of int, NumPy array) containing the
+        indexes of the values of a type and a typed array of these values, the
+        indexes are None for an array which is already typed.  Values of other
+        types than those of _ARRAY_DTYPES are left out.
+    """
+    if array.dtype.kind != "O":
+        return [(None, array)]
+    indexes = {}
+    for index, value in enumerate(array):
+        indexes.setdefault(type(value), []).append(index)
+    groups = []
+    for value_type, rows in indexes.items():
+        dtype = _ARRAY_DTYPES.get(value_type)
+        if dtype is None:
+            continue
+        rows = numpy.array(rows)
+        try:
+            groups.append((rows, numpy.array(array[rows].tolist(), dtype=dtype)))
+        except OverflowError:
+            pass
+    return groups
+
+
+def _codepoints(array):
+    """
+    Args:
+        array (NumPy array of str): values.
+
+    Returns:
+        A two dimensional NumPy array of the code points of each value, padded
+        with zeros.
+    """
+    array = numpy.ascontiguousarray(array)
+    return array.view(numpy.uint32).reshape(len(array), array.dtype.itemsize // 4)
+
+
+def _parse_numbers(array, fraction):
+    """
+    Parse the strings of plain numbers, an optional sign followed by up to 18
+    ASCII digits and, if fraction is True, an optional decimal point.
+
+    Args:
+        array (NumPy array of str): values.
+        fraction (boolean): True to parse a decimal point.
+
+    Returns:
+        A tuple of NumPy arrays (bool, int64, int64, bool) containing True for
+        the values which are plain numbers, their digits as an integer, their
+        number of digits after the decimal point and True if they are negative.
+    """
+    size = len(array)
+    matched = numpy.ones(size, dtype=bool)
+    ended = numpy.zeros(size, dtype=bool)
+    numbers = numpy.zeros(size, dtype="int64")
+    digits = numpy.zeros(size, dtype="int64")
+    fraction_digits = numpy.zeros(size, dtype="int64")
+    points = numpy.zeros(size, dtype="int64")
+    # The characters of the values are read one position at a time, for all
+    # the values at once.
+    codes = numpy.ascontiguousarray(_codepoints(array).T)
+    for position, position_codes in enumerate(codes):
+        digit = (position_codes >= ord("0")) & (position_codes <= ord("9"))
+        padding = position_codes == 0
+        allowed = digit | padding
+        if position == 0:
+            allowed |= (position_codes == ord("+")) | (position_codes == ord("-"))
+        if fraction:
+            point = position_codes == ord(".")
+            allowed |= point
+            fraction_digits += digit & (points > 0)
+            points += point
+        matched &= allowed & (padding | ~ended)
+        ended |= padding
+        numbers = numpy.where(digit, numbers * 10 + position_codes - ord("0"), numbers)
+        digits += digit
+    matched &= (digits > 0) & (digits <= 18) & (points <= 1)
+    numbers = numpy.where(matched, numbers, 0)
+    fraction_digits = numpy.where(matched, fraction_digits, 0)
+    negative = codes[0] == ord("-") if len(codes) else numpy.zeros(size, dtype=bool)
+    return matched, numbers, fraction_digits, negative
+
+
+def _validate_booleans(array):
+    """
+    Vectorized Validator._xbrli_boolean_item_type_validator.
+
+    Args:
+        array (NumPy array): values to be validated.
+
+    Returns:
+        A tuple (NumPy array, NumPy array of bool) containing the converted
+        values and True for the valid values, None if the values can't be
+        vectorized.
+    """
+    kind = array.dtype.kind
+    if kind == "b":
+        return array.copy(), numpy.ones(len(array), dtype=bool)
+    elif kind in "iu":
+        return array == 1, (array == 0) | (array == 1)
+    elif kind == "U":
+        converted = numpy.isin(array, BOOLEAN_TRUE)
+        valid = numpy.isin(array, BOOLEAN_VALUES)
+        # Only values which are not already lower case are converted.
+        other = ~valid
+        if other.any():
+            lower = numpy.char.lower(array[other])
+            converted[other] = numpy.isin(lower, BOOLEAN_TRUE)
+            valid[other] = numpy.isin(lower, BOOLEAN_VALUES)
+        return converted, valid
+    return None
+
+
+def _validate_integers(array):
+    """
+    Vectorized Validator._xbrli_integer_item_type_validator.
+
+    Strings other than plain integers, such as " 52" or "1_000", are left to
+    the validator.
+
+    Args:
+        array (NumPy array): values to be validated.
+
+    Returns:
+        A tuple (NumPy array, NumPy array of bool) containing the converted
+        values and True for the valid values, None if the values can't be
+        vectorized.
+    """
+    kind = array.dtype.kind
+    if kind in "iu":
+        return array.copy(), numpy.ones(len(array), dtype=bool)
+    elif kind == "b":
+        return array.astype("int64"), numpy.ones(len(array), dtype=bool)
+    elif kind == "U":
+        valid, numbers, fraction_digits, negative = _parse_numbers(array, False)
+        return numpy.where(negative, -numbers, numbers), valid
+    return None
+
+
+def _validate_decimals(array):
+    """
+    Vectorized Validator._xbrli_decimal_item_type_validator and
+    Validator._xbrli_monetary_item_type_validator.
+
+    Strings other than plain decimals, such as "1e3" or "inf", are left to the
+    validator.
+
+    Args:
+        array (NumPy array): values to be validated.
+
+    Returns:
+        A tuple (NumPy array, NumPy array of bool) containing the converted
+        values and True for the valid values, None if the values can't be
+        vectorized.
+    """
+    kind = array.dtype.kind
+    if kind in "iu":
+        return array.copy(), numpy.ones(len(array), dtype=bool)
+    elif kind == "U":
+        valid, numbers, fraction_digits, negative = _parse_numbers(array, True)
+        # Numbers of up to 15 digits and their power of ten are exact floats,
+        # so their quotient is the correctly rounded value returned by float().
+        exact = valid & (numbers < 10 ** 15)
+        converted = numbers / numpy.array(_POWERS_OF_TEN)[fraction_digits]
+        converted = numpy.copysign(converted, numpy.where(negative, -1.0, 1.0))
+        converted[valid & ~exact] = array[valid & ~exact].astype("float64")
+        return converted, valid
+    return None
+
+
+def _validate_dates(array):
+    """
+    Vectorized Validator._xbrli_date_item_type_validator.
+
+    Strings other than dates in the YYYY-MM-DD format, such as "2019-1-1", are
+    left to the validator.
+
+    Args:
+        array (NumPy array): values to be validated.
+
+    Returns:
+        A tuple (NumPy array, NumPy array of bool) containing the converted
+        values and True for the valid values, None if the values can't be
+        vectorized.
+    """
+    if array.dtype == numpy.dtype("datetime64[D]"):
+        return array.copy(), ~numpy.isnat(array)
+    elif array.dtype.kind != "U":
+        return None
+
+    codes = _codepoints(array)
+    if codes.shape[1] < 10:
+        return numpy.zeros(len(array), dtype="datetime64[D]"), numpy.zeros(len(array), dtype=bool)
+    digits = codes[:, :10].astype("int64") - ord("0")
+    is_digit = (digits >= 0) & (digits <= 9)
+    valid = (is_digit[:, [0, 1, 2, 3, 5, 6, 8, 9]].all(axis=1) &
+             (codes[:, 4] == ord("-")) & (codes[:, 7] == ord("-")) &
+             (codes[:, 10:] == 0).all(axis=1))
+    year = digits[:, 0] * 1000 + digits[:, 1] * 100 + digits[:, 2] * 10 + digits[:, 3]
+    month = digits[:, 5] * 10 + digits[:, 6]
+    day = digits[:, 8] * 10 + digits[:, 9]
+    valid &= (year >= 1) & (month >= 1) & (month <= 12) & (day >= 1)
+    year = numpy.where(valid, year, 1970)
+    month = numpy.where(valid, month, 1)
+    month_start = ((year - 1970) * 12 + month - 1).astype("datetime64[M]")
+    first_day = month_start.astype("datetime64[D]")
+    days_in_month = ((month_start + 1).astype("datetime64[D]") - first_day).astype("int64")
+    valid &= day <= days_in_month
+    return first_day + (numpy.where(valid, day, 1) - 1), valid
+
+
+# Vectorized validators of the validator methods which have one.
+_BATCH_VALIDATORS = {
+    "_xbrli_boolean_item_type_validator": _validate_booleans,
+    "_xbrli_integer_item_type_validator": _validate_integers,
+    "_xbrli_duration_item_type_validator": _validate_integers,
+    "_xbrli_decimal_item_type_validator": _validate_decimals,
+    "_xbrli_monetary_item_type_validator": _validate_decimals,
+    "_num_power_item_type_validator": _validate_decimals,
+    "_num_percent_item_type_validator": _validate_decimals,
+    "_num_us_electric_current_item_type_validator": _validate_decimals,
+    "_num_us_frequency_item_type_validator": _validate_decimals,
+    "_num_us_insolation_item_type_validator": _validate_decimals,
+    "_num_us_irradiance_item_type_validator": _validate_decimals,
+    "_num_us_plane_angle_item_type_validator": _validate_decimals,
+    "_num_us_pressure_item_type_validator": _validate_decimals,
+    "_num_us_speed_item_type_validator": _validate_decimals,
+    "_num_us_temperature_item_type_validator": _validate_decimals,
+    "_num_us_voltage_item_type_validator": _validate_decimals,
+    "_num_area_item_type_validator": _validate_decimals,
+    "_num_energy_item_type_validator": _validate_decimals,
+    "_num_length_item_type_validator": _validate_decimals,
+    "_num_mass_item_type_validator": _validate_decimals,
+    "_num_volume_item_type_validator": _validate_decimals,
+    "_xbrli_date_item_type_validator": _validate_dates,
+}
+
+
 class Validator(object):
     """
     Validates values for concepts.
@@ -52,6 +490,7 @@ class Validator(object):
     def __init__(self, taxonomy):
         """ Initializes Validator """
         self._taxonomy = taxonomy
+        self._plans = {}
 
     def validate_concept_value(self, concept_details, value):
         """
@@ -65,40 +504,98 @@ class Validator(object):
             A tuple (*, list of str) containing original or converted value 
             and list of errors (can be empty).
         """
-        errors = []
-        result = (value, [])
-        # If null check if nillable is ok and return
-        if value is None and not concept_details.nillable:
-            errors += ["'{}' is not allowed to be nillable (null)."
-                       .format(concept_details.id)]
-        enum = self._taxonomy.types.get_type_enum(concept_details.type_name)
-        # Check data type and validator calling
-        if type(concept_details.type_name).__name__ in ["str", "unicode"]:
-            method_name = self._get_validator_method_name(concept_details.type_name)
-            # validator_module = sys.modules[__name__]
+        return self.get_validation_plan(concept_details).validate(value)
+
+    def validate_many(self, concept_details, values):
+        """
+        Validate a column of values of a concept.
+
+        Boolean, integer, decimal, monetary, date and enumerated values are
+        validated with NumPy, other values and values of mixed types one at a
+        time.  Results are the same as validating each value with
+        validate_concept_value, NumPy scalars are validated as the Python
+        values they hold.
+
+        Args:
+            concept_details (ConceptDetails): concept details.
+            values (list or NumPy array): values to be validated.
+
+        Returns:
+            A tuple (NumPy array, NumPy array of bool, dict) containing the
+            original or converted values, True for the values in error and the
+            list of errors of each value in error keyed by its index.  The
+            converted values of the values in error are undefined.
+
+        Raises:
+            ImportError if NumPy is not installed.
+        """
+        if numpy is None:
+            raise ImportError(
+                "NumPy is required to validate values in batches, install it with: pip install numpy")
+        return self.get_validation_plan(concept_details).validate_many(values)
+
+    def get_validation_plan(self, concept_details):
+        """
+        Return the compiled validation plan of a concept.
+
+        Plans are compiled the first time a concept is validated and cached
+        by the fields of the ConceptDetails they depend on.
+
+        Args:
+            concept_details (ConceptDetails): concept details.
+
+        Returns:
+            ValidationPlan of the concept.
+
+        Raises:
+            OBValidationError if there is no validator for the type of the concept.
+        """
+        key = (concept_details.id, concept_details.type_name, concept_details.nillable)
+        plan = self._plans.get(key)
+        if plan is None:
+            plan = self._compile_validation_plan(concept_details)
+            self._plans[key] = plan
+        return plan
+
+    def _compile_validation_plan(self, concept_details):
+        """
+        Compile the validation plan of a concept.
+
+        Args:
+            concept_details (ConceptDetails): concept details.
+
+        Returns:
+            ValidationPlan of the concept.
+        """
+        type_name = concept_details.type_name
+        types = self._taxonomy.types
+        enum = types.get_type_enum_set(type_name)
+        # Check identifiers.  This is based upon the name of the field containing
+        # the word Identifier in it.  Avoid UtilityIdentifier which is a LEI.
+        is_identifier = (concept_details.id != "solar:UtilityIdentifier" and
+                         concept_details.id.find("Identifier") != -1)
+        plan = ValidationPlan(concept_details.id, type_name, None,
+                              enum if enum else None,
+                              concept_details.nillable, is_identifier)
+
+        if type(type_name).__name__ in ["str", "unicode"]:
+            method_name = self._get_validator_method_name(type_name)
             found_method = getattr(self, method_name, None)
             if found_method:
                 if enum:
-                    result = found_method(value, enum)
+                    plan.method = lambda value: found_method(value, enum)
                 else:
-                    result = found_method(value)
+                    plan.method = found_method
+                    plan.batch = _BATCH_VALIDATORS.get(method_name)
             elif enum:
-                result = self._generic_enum_validator(value, concept_details,
-                                                      enum)
+                plan.method = plan._validate_enum
+                plan.batch = plan._validate_enums
+                plan.enum_lookup = functools.partial(types.find_type_enum_value, type_name)
             else:
                 raise ob.OBValidationError(
                     "Concept '{}' could not be processed. Missing method '{}'."
-                    .format(concept_details.type_name, method_name))
-
-        # Check identifiers.  This is based upon the name of the field containing
-        # the word Identifier in it.  Avoid UtilityIdentifier which is a LEI.
-        if concept_details.id != "solar:UtilityIdentifier" and concept_details.id.find("Identifier") != -1:
-            if not identifier.validate(value):
-                errors += ["'{}' is not valid identifier.".format(concept_details.id)]
-
-        # If all conditions clear then the value passes.
-        errors += result[1]
-        return result[0], errors
+                    .format(type_name, method_name))
+        return plan
 
     def _get_validator_method_name(self, type_name):
         """
@@ -119,24 +616,6 @@ class Validator(object):
         type_name = re.sub("([a-z0-9])([A-Z])", r"\1_\2", type_name).lower()
         return "_" + type_name + "_validator"
 
-    def _generic_enum_validator(self, value, concept_details, enum):
-        """
-        A generic validator for concept enum value.
-
-        Args:
-            value (str): value representing enum value
-            concept_details (ConceptDetails): concept details
-            enum (list of str): enumerator of all possible values
-
-        Returns:
-            A Tuple (str, list of str) containing original and list of errors (if any)
-        """
-        errors = []
-        if (value not in enum):
-            errors.append("Value '{}' is not found in enum list for type '{}'."
-                          .format(value, concept_details.type_name))
-        return value, errors
-
     # validators implementation
     # TODO: could be moved to other file and loaded and even loading custom
     # validator files
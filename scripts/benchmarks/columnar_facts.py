@@ -0,0 +1,86 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the memory used by the facts of a Monthly Operating Report holding N 15 minute interval readings,
+the time spent loading them with set_many, setting them one at a time reading each back with get ("Set+get")
+and exporting them to JSON and XML, with the facts stored as Fact objects ("Objects") and in the NumPy arrays
+of a ColumnarFactStore ("Columnar").  Requires NumPy.
+
+Usage: python scripts/benchmarks/columnar_facts.py
+"""
+
+import datetime
+import time
+import tracemalloc
+
+from oblib import data_model, taxonomy
+
+
+SIZES = [10000, 100000]
+CONCEPTS = ["solar:MeasEnergy", "solar:ExpectEnergyAtTheRevenueMeter", "solar:Curtail",
+            "solar:MeasEnergyWeatherAdj"]
+
+
+def make_records(n):
+    start = datetime.datetime(2019, 1, 1)
+    records = []
+    for i in range(n):
+        interval = start + datetime.timedelta(minutes=15 * (i // len(CONCEPTS)))
+        duration = {"start": interval, "end": interval + datetime.timedelta(minutes=15)}
+        records.append((CONCEPTS[i % len(CONCEPTS)], i % 1000,
+                        {"unit_name": "kWh", "entity": "ACME", "duration": duration}))
+    return records
+
+
+def measure(tax, records, columnar):
+    tracemalloc.start()
+    start = time.time()
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax, columnar=columnar)
+    doc.set_many(records)
+    load = time.time() - start
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.time()
+    interleaved = data_model.OBInstance("MonthlyOperatingReport", tax, columnar=columnar)
+    for concept_name, value, kwargs in records:
+        interleaved.set(concept_name, value, **kwargs)
+        context = data_model.Context(entity=kwargs["entity"], duration=kwargs["duration"])
+        assert interleaved.get(concept_name, context).value == value
+    set_get = time.time() - start
+
+    start = time.time()
+    doc.to_JSON_string()
+    json_export = time.time() - start
+    start = time.time()
+    doc.to_XML_string()
+    xml_export = time.time() - start
+    return memory / float(len(records)), load, set_get, json_export, xml_export
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+
+    print('%8s %10s %14s %10s %12s %10s %10s' % ("Facts", "Storage", "Memory (B/f)", "Load (s)",
+                                                 "Set+get (s)", "JSON (s)", "XML (s)"))
+    for n in SIZES:
+        records = make_records(n)
+        for name, columnar in [("Objects", False), ("Columnar", True)]:
+            print('%8d %10s %14.0f %10.2f %12.2f %10.2f %10.2f' % ((n, name) +
+                                                                    measure(tax, records, columnar)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the time spent storing N distinct contexts in a Hypercube and then looking each of them up again,
+as done when loading a report with 15 minute intervals, using the context key index ("Indexed") and a scan
+comparing every stored context with equals_context, which is how contexts used to be deduplicated
+("Scan").  The scan is quadratic so it is only measured up to SCAN_LIMIT contexts.
+
+Usage: python scripts/benchmarks/context_dedupe.py
+"""
+
+import datetime
+import time
+
+from oblib import data_model, taxonomy
+
+
+SIZES = [100, 1000, 3000, 10000, 30000, 100000]
+SCAN_LIMIT = 3000
+
+
+def make_contexts(n):
+    start = datetime.datetime(2019, 1, 1)
+    return [data_model.Context(entity="ACME", ProjectIdentifierAxis="1",
+                               instant=start + datetime.timedelta(minutes=15 * i))
+            for i in range(n)]
+
+
+def scan_store(contexts, new_context):
+    for context in contexts:
+        if context.equals_context(new_context):
+            return context
+    contexts.append(new_context)
+    return new_context
+
+
+def measure_indexed(table, contexts):
+    start = time.time()
+    for context in contexts:
+        table.store_context(context)
+    for context in contexts:
+        table.lookup_context(context)
+    return time.time() - start
+
+
+def measure_scan(contexts):
+    stored = []
+    start = time.time()
+    for context in contexts:
+        scan_store(stored, context)
+    for context in contexts:
+        scan_store(stored, context)
+    return time.time() - start
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+
+    print('%10s %12s %12s %8s' % ("Contexts", "Scan (s)", "Indexed (s)", "Speedup"))
+    for n in SIZES:
+        contexts = make_contexts(n)
+        table = data_model.OBInstance("MonthlyOperatingReport", tax).get_table_for_concept("solar:MeasEnergy")
+        indexed = measure_indexed(table, contexts)
+        if n <= SCAN_LIMIT:
+            scan = measure_scan(contexts)
+            print('%10d %12.4f %12.4f %7.0fx' % (n, scan, indexed, scan / indexed))
+        else:
+            print('%10d %12s %12.4f %8s' % (n, "-", indexed, "-"))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the memory used by the Facts of a 1M-fact document and the time spent creating them and reading
+their IDs (as the export does), with the slotted Fact generating its ID when it is first read ("After") and
+with a dict-backed Fact generating its ID in the constructor, which is how Fact used to work ("Before").
+
+Usage: python scripts/benchmarks/fact_objects.py
+"""
+
+import datetime
+import time
+import tracemalloc
+
+from oblib import data_model, identifier
+
+
+FACTS = 1000000
+
+
+class DictFact(object):
+    """Fact as it was before it had __slots__ and a lazily generated ID."""
+
+    def __init__(self, concept_name, context, unit, value, decimals=None, precision=None, id=None):
+        self.concept_name = concept_name
+        self.value = value
+        self.context = context
+        self.unit = unit
+        self.decimals = decimals
+        self.precision = precision
+        if id is None:
+            self.id = identifier.identifier()
+        else:
+            self.id = id
+
+
+def make_facts(fact_class, context):
+    return [fact_class("solar:MeasEnergy", context, "kWh", i) for i in range(FACTS)]
+
+
+def measure(fact_class, context):
+    start = time.time()
+    facts = make_facts(fact_class, context)
+    create = time.time() - start
+    start = time.time()
+    for fact in facts:
+        fact.id
+    read_ids = time.time() - start
+    del facts
+
+    # Measured separately since tracing allocations slows down the creation.
+    tracemalloc.start()
+    facts = make_facts(fact_class, context)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return memory / float(FACTS), create, read_ids
+
+
+def main():
+    context = data_model.Context(entity="ACME", duration={"start": datetime.date(2019, 1, 1),
+                                                          "end": datetime.date(2019, 2, 1)})
+
+    print('%8s %14s %12s %14s' % ("Fact", "Memory (B/f)", "Create (s)", "Read IDs (s)"))
+    for name, fact_class in [("Before", DictFact), ("After", data_model.Fact)]:
+        print('%8s %14.0f %12.2f %14.2f' % ((name,) + measure(fact_class, context)))
+
+
+if __name__ == "__main__":
+    main()
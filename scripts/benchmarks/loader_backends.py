@@ -0,0 +1,81 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the time spent parsing each type of taxonomy file with the "sax" and "expat" TaxonomyLoader
+backends and the resulting speedup.  Each measurement is the best of several runs.
+
+Usage: python scripts/benchmarks/loader_backends.py
+"""
+
+import os
+import time
+
+from oblib import constants, taxonomy_loader
+
+
+RUNS = 5
+
+
+def file_types(tl):
+    """Returns a list of (file type, loader method name, pathnames) tuples."""
+
+    core = os.path.join(constants.SOLAR_TAXONOMY_DIR, "core")
+    external = os.path.join(constants.SOLAR_TAXONOMY_DIR, "external")
+    return [
+        ("Entrypoints", "_load_entrypoints_file",
+         [os.path.join(constants.SOLAR_TAXONOMY_DIR, "META-INF", "taxonomyPackage.xml")]),
+        ("Elements", "_load_elements_file", tl._element_files()),
+        ("Presentation", "_load_concepts_file", [pathname for _, pathname in tl._entrypoint_files("pre.")]),
+        ("Definition", "_load_relationships_file", [pathname for _, pathname in tl._entrypoint_files("def.")]),
+        ("Calculation", "_load_calculations_file", [os.path.join(core, constants.SOLAR_CALCULATION_XML)]),
+        ("Labels", "_load_documentation_file", [os.path.join(core, constants.SOLAR_LAB_XML)]),
+        ("Units", "_load_units_file", [os.path.join(external, "utr.xml")]),
+        ("Types", "_load_types_file",
+         [os.path.join(core, f) for f in os.listdir(core) if "types" in f]),
+    ]
+
+
+def measure(tl, method_name, pathnames):
+    method = getattr(tl, method_name)
+    best = None
+    for i in range(RUNS):
+        start = time.time()
+        for pathname in pathnames:
+            method(pathname)
+        elapsed = time.time() - start
+        if best is None or elapsed < best:
+            best = elapsed
+    return best
+
+
+def main():
+    sax = taxonomy_loader.TaxonomyLoader(backend="sax")
+    expat = taxonomy_loader.TaxonomyLoader(backend="expat")
+
+    print('%15s %6s %12s %12s %8s' % ("File type", "Files", "Sax (s)", "Expat (s)", "Speedup"))
+    sax_total = 0
+    expat_total = 0
+    for name, method_name, pathnames in file_types(sax):
+        sax_time = measure(sax, method_name, pathnames)
+        expat_time = measure(expat, method_name, pathnames)
+        sax_total += sax_time
+        expat_total += expat_time
+        print('%15s %6d %12.4f %12.4f %7.1fx' % (name, len(pathnames), sax_time, expat_time,
+                                                 sax_time / expat_time))
+    print('%15s %6s %12.4f %12.4f %7.1fx' % ("Total", "", sax_total, expat_total, sax_total / expat_total))
+
+
+if __name__ == "__main__":
+    main()
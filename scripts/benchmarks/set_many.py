@@ -0,0 +1,73 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the throughput of importing N facts of a Monthly Operating Report, 15 minute interval readings of
+several energy concepts, with a call to OBInstance.set() per fact ("set") and with a single call to
+OBInstance.set_many() ("set_many").
+
+Usage: python scripts/benchmarks/set_many.py
+"""
+
+import datetime
+import time
+
+from oblib import data_model, taxonomy
+
+
+SIZES = [1000, 10000, 100000]
+CONCEPTS = ["solar:MeasEnergy", "solar:ExpectEnergyAtTheRevenueMeter", "solar:Curtail",
+            "solar:MeasEnergyWeatherAdj"]
+
+
+def make_records(n):
+    start = datetime.datetime(2019, 1, 1)
+    records = []
+    for i in range(n):
+        interval = start + datetime.timedelta(minutes=15 * (i // len(CONCEPTS)))
+        duration = {"start": interval, "end": interval + datetime.timedelta(minutes=15)}
+        records.append((CONCEPTS[i % len(CONCEPTS)], i % 1000,
+                        {"unit_name": "kWh", "entity": "ACME", "duration": duration}))
+    return records
+
+
+def measure_set(tax, records):
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax)
+    start = time.time()
+    for concept_name, value, kwargs in records:
+        doc.set(concept_name, value, **kwargs)
+    return len(records) / (time.time() - start)
+
+
+def measure_set_many(tax, records):
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax)
+    start = time.time()
+    errors = doc.set_many(records)
+    assert not errors
+    return len(records) / (time.time() - start)
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+
+    print('%10s %15s %20s %8s' % ("Facts", "set (fact/s)", "set_many (fact/s)", "Speedup"))
+    for n in SIZES:
+        records = make_records(n)
+        set_rate = measure_set(tax, records)
+        set_many_rate = measure_set_many(tax, records)
+        print('%10d %15.0f %20.0f %7.1fx' % (n, set_rate, set_many_rate, set_many_rate / set_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the time spent loading each Taxonomy component when parsing the XML files (serially and in a
+pool of worker processes) and when reading the snapshot cache, and the cost of the components a JSON
+validation service actually uses.
+
+Usage: python scripts/benchmarks/taxonomy_load.py
+"""
+
+import shutil
+import tempfile
+
+from oblib import taxonomy
+
+
+COMPONENTS = ["semantic", "types", "units", "numeric_types", "generic_roles", "ref_parts", "documentation"]
+
+# Components touched when validating an Orange Button JSON document.
+VALIDATION_COMPONENTS = ["semantic", "types", "units"]
+
+
+def main():
+    parsed = taxonomy.Taxonomy(use_cache=False, lazy=False).get_load_times()
+    parallel = taxonomy.Taxonomy(use_cache=False, lazy=False, parallel=True).get_load_times()
+    cache_dir = tempfile.mkdtemp()
+    try:
+        taxonomy.Taxonomy(lazy=False, cache_dir=cache_dir)  # Write the snapshot images.
+        cached = taxonomy.Taxonomy(lazy=False, cache_dir=cache_dir).get_load_times()
+    finally:
+        shutil.rmtree(cache_dir)
+
+    print('%15s %12s %12s %12s' % ("Component", "Parse (s)", "Parallel (s)", "Cache (s)"))
+    for name in COMPONENTS:
+        print('%15s %12.4f %12.4f %12.4f' % (name, parsed[name], parallel[name], cached[name]))
+    print('%15s %12.4f %12.4f %12.4f' % ("Total", sum(parsed.values()), sum(parallel.values()),
+                                         sum(cached.values())))
+    print('%15s %12.4f %12.4f %12.4f' % ("Validation only", sum(parsed[n] for n in VALIDATION_COMPONENTS),
+                                         sum(parallel[n] for n in VALIDATION_COMPONENTS),
+                                         sum(cached[n] for n in VALIDATION_COMPONENTS)))
+
+
+if __name__ == "__main__":
+    main()
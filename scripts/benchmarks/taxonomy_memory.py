@@ -0,0 +1,56 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the memory used per concept and per relationship by the slotted taxonomy records with interned
+strings ("After") and by equivalent dict-backed records holding a private copy of every string, which is
+how the loader used to build them ("Before").
+
+Usage: python scripts/benchmarks/taxonomy_memory.py
+"""
+
+from oblib import taxonomy, util
+
+
+class DictRecord(object):
+    """A dict-backed record, as ConceptDetails and Relationship were before they had __slots__."""
+
+    def __init__(self, record):
+        for name, value in record.to_dict().items():
+            if isinstance(value, str) and len(value) > 1:
+                # Strings of length one are cached by Python, the others are copied.
+                value = value.encode("utf-8").decode("utf-8")
+            setattr(self, name, value)
+
+
+def main():
+    semantic = taxonomy.Taxonomy(use_cache=False).semantic
+
+    concepts = semantic.get_all_concepts(details=True)
+    relationships = [r for entrypoint in semantic.get_all_entrypoints()
+                     for r in semantic.get_entrypoint_relationships(entrypoint)]
+    before_concepts = {c: DictRecord(details) for c, details in concepts.items()}
+    before_relationships = [DictRecord(r) for r in relationships]
+
+    print('%15s %8s %12s %12s %8s' % ("Record", "Count", "Before (B)", "After (B)", "Saving"))
+    for name, before, after in [("Concept", before_concepts, concepts),
+                                ("Relationship", before_relationships, relationships)]:
+        before_size = util.get_size(before) / float(len(after))
+        after_size = util.get_size(after) / float(len(after))
+        print('%15s %8d %12.1f %12.1f %7.0f%%' % (name, len(after), before_size, after_size,
+                                                  100 * (1 - after_size / before_size)))
+
+
+if __name__ == "__main__":
+    main()
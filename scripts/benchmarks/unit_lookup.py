@@ -0,0 +1,91 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the throughput of OBInstance.set() for a fact with a unit and of the TaxonomyUnits lookups it
+makes, using the prebuilt unit indexes ("After") and the previous lookups that rebuilt a dict of every unit
+on each call ("Before").
+
+Usage: python scripts/benchmarks/unit_lookup.py
+"""
+
+import time
+
+from oblib import data_model, ob, taxonomy
+
+
+SETS = 2000
+LOOKUPS = 2000
+
+
+class DictRebuildingUnits(object):
+    """TaxonomyUnits.is_unit and get_unit as they were before the unit indexes."""
+
+    def __init__(self, units):
+        self._units = units.get_all_units()
+
+    def _by_id(self):
+        return {self._units[k].id: k for k in self._units.keys()}
+
+    def _by_unit_name(self):
+        return {self._units[k].unit_name: k for k in self._units.keys()}
+
+    def is_unit(self, unit_str, attr=None):
+        return (unit_str in self._units.keys() or
+                unit_str in self._by_id().keys() or
+                unit_str in self._by_unit_name().keys())
+
+    def get_unit(self, unit_str, attr=None):
+        if self.is_unit(unit_str):
+            try:
+                return self._units[unit_str]
+            except KeyError:
+                if unit_str in self._by_id():
+                    return self._units[self._by_id()[unit_str]]
+                elif unit_str in self._by_unit_name():
+                    return self._units[self._by_unit_name()[unit_str]]
+        raise ob.OBNotFoundError("{} is not the type, name or id of a valid unit".format(unit_str))
+
+
+def measure_sets(tax, units):
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax)
+    doc.tu = units
+    start = time.time()
+    for i in range(SETS):
+        doc.set("solar:MeasEnergy", i, unit_name="Kilowatt-Hours", entity="ACME", duration="forever")
+    return SETS / (time.time() - start)
+
+
+def measure_lookups(units):
+    start = time.time()
+    for i in range(LOOKUPS):
+        units.is_unit("Kilowatt-Hours")
+        units.get_unit("u00016")
+    return LOOKUPS / (time.time() - start)
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+    before = DictRebuildingUnits(tax.units)
+    after = tax.units
+
+    print('%25s %15s %15s %8s' % ("Operation", "Before (op/s)", "After (op/s)", "Speedup"))
+    for name, before_rate, after_rate in [
+            ("OBInstance.set", measure_sets(tax, before), measure_sets(tax, after)),
+            ("is_unit + get_unit", measure_lookups(before), measure_lookups(after))]:
+        print('%25s %15.0f %15.0f %7.1fx' % (name, before_rate, after_rate, after_rate / before_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the time spent validating a Monthly Operating Report of N facts, 15 minute interval readings of
+several energy concepts, by exporting it to JSON and parsing the JSON again, which is how documents used
+to be re-validated ("Re-parse"), and with OBInstance.is_valid() ("is_valid").
+
+Usage: python scripts/benchmarks/validate_document.py
+"""
+
+import datetime
+import time
+
+from oblib import data_model, parser, taxonomy
+
+
+SIZES = [1000, 10000, 100000]
+CONCEPTS = ["solar:MeasEnergy", "solar:ExpectEnergyAtTheRevenueMeter", "solar:Curtail",
+            "solar:MeasEnergyWeatherAdj"]
+
+
+def make_document(tax, n):
+    start = datetime.datetime(2019, 1, 1)
+    records = []
+    for i in range(n):
+        interval = start + datetime.timedelta(minutes=15 * (i // len(CONCEPTS)))
+        duration = {"start": interval, "end": interval + datetime.timedelta(minutes=15)}
+        records.append((CONCEPTS[i % len(CONCEPTS)], i % 1000,
+                        {"unit_name": "kWh", "entity": "ACME", "duration": duration}))
+    doc = data_model.OBInstance("MonthlyOperatingReport", tax)
+    assert not doc.set_many(records)
+    return doc
+
+
+def measure_reparse(tax, doc):
+    start = time.time()
+    parser.Parser(tax).from_JSON_string(doc.to_JSON_string(), "MonthlyOperatingReport")
+    return time.time() - start
+
+
+def measure_is_valid(doc):
+    start = time.time()
+    assert doc.is_valid()
+    return time.time() - start
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+
+    print('%10s %14s %14s %8s' % ("Facts", "Re-parse (s)", "is_valid (s)", "Speedup"))
+    for n in SIZES:
+        doc = make_document(tax, n)
+        reparse = measure_reparse(tax, doc)
+        is_valid = measure_is_valid(doc)
+        print('%10d %14.3f %14.3f %7.1fx' % (n, reparse, is_valid, reparse / is_valid))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the throughput of validating a column of N values of a concept, as read from a CSV file, per concept
+type with a call to Validator.validate_concept_value() per value ("Scalar") and with a single call to
+Validator.validate_many() on the list of values ("Batch") and on a NumPy array of the values ("Batch array").
+One value in a hundred is invalid.
+
+Usage: python scripts/benchmarks/validate_many.py
+"""
+
+import datetime
+import time
+
+import numpy
+
+from oblib import taxonomy, validator
+
+
+VALUES = 100000
+INVALID_EVERY = 100
+CASES = [
+    ("solar:AdvisorInvoicesAvailOfDoc", lambda i: "true" if i % 2 else "false"),
+    ("solar:AssetMgrNumOfProj", lambda i: str(i)),
+    ("solar:ASTME28484ModelCoeffA1", lambda i: "{}.25".format(i)),
+    ("solar:AllProjAcctBalances", lambda i: i),
+    ("solar:AdvisorInvoicesEffectDate",
+     lambda i: (datetime.date(2019, 1, 1) + datetime.timedelta(days=i % 3650)).isoformat()),
+    ("solar:InverterStyle", lambda i: "Central" if i % 2 else "Transformerless"),
+]
+
+
+def make_column(make_value):
+    return [make_value(i) if i % INVALID_EVERY else "Arf" for i in range(VALUES)]
+
+
+def measure_scalar(concept_validator, concept_details, column):
+    start = time.time()
+    for value in column:
+        concept_validator.validate_concept_value(concept_details, value)
+    return len(column) / (time.time() - start)
+
+
+def measure_batch(concept_validator, concept_details, column):
+    start = time.time()
+    values, errors, messages = concept_validator.validate_many(concept_details, column)
+    rate = len(column) / (time.time() - start)
+    assert len(messages) == VALUES // INVALID_EVERY
+    return rate
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+    concept_validator = validator.Validator(tax)
+
+    print('%30s %16s %16s %22s %8s' % ("Type", "Scalar (val/s)", "Batch (val/s)", "Batch array (val/s)",
+                                       "Speedup"))
+    for concept_name, make_value in CASES:
+        concept_details = tax.semantic.get_concept_details(concept_name)
+        column = make_column(make_value)
+        scalar_rate = measure_scalar(concept_validator, concept_details, column)
+        batch_rate = measure_batch(concept_validator, concept_details, column)
+        array_rate = measure_batch(concept_validator, concept_details, numpy.array(column, dtype=str))
+        print('%30s %16.0f %16.0f %22.0f %7.1fx' % (concept_details.type_name, scalar_rate, batch_rate,
+                                                    array_rate, batch_rate / scalar_rate))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# Copyright 2019 SunSpec Alliance
+
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+
+#    http://www.apache.org/licenses/LICENSE-2.0
+
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Prints the throughput of Validator.validate_concept_value per concept type, using the compiled validation
+plans ("After") and the previous implementation that derived the validator method name with regular
+expressions, looked it up with getattr and fetched the type enumeration on every value ("Before").
+
+Usage: python scripts/benchmarks/validator_plans.py
+"""
+
+import datetime
+import time
+
+from oblib import identifier, ob, taxonomy, validator
+
+
+VALUES = 20000
+CASES = [
+    ("solar:AdvisorInvoicesAvailOfDoc", "true"),
+    ("solar:AssetMgrNumOfProj", 52),
+    ("solar:ASTME28484ModelCoeffA1", "0.25"),
+    ("solar:AllProjAcctBalances", 1000),
+    ("solar:AHJID", "Arf"),
+    ("solar:AdvisorInvoicesEffectDate", datetime.date(2019, 1, 1)),
+    ("solar:InverterOutputACFreqRangeMax", 60),
+    ("solar:InverterStyle", "Transformerless"),
+    ("dei:LegalEntityIdentifier", identifier.identifier()),
+]
+
+
+class ReflectingValidator(validator.Validator):
+    """Validator.validate_concept_value as it was before the validation plans."""
+
+    def validate_concept_value(self, concept_details, value):
+        errors = []
+        result = (value, [])
+        if value is None and not concept_details.nillable:
+            errors += ["'{}' is not allowed to be nillable (null)."
+                       .format(concept_details.id)]
+        enum = self._taxonomy.types.get_type_enum(concept_details.type_name)
+        if type(concept_details.type_name).__name__ in ["str", "unicode"]:
+            method_name = self._get_validator_method_name(concept_details.type_name)
+            found_method = getattr(self, method_name, None)
+            if found_method:
+                if enum:
+                    result = found_method(value, enum)
+                else:
+                    result = found_method(value)
+            elif enum:
+                result = self._generic_enum_validator(value, concept_details, enum)
+            else:
+                raise ob.OBValidationError(
+                    "Concept '{}' could not be processed. Missing method '{}'."
+                    .format(concept_details.type_name, method_name))
+        if concept_details.id != "solar:UtilityIdentifier" and concept_details.id.find("Identifier") != -1:
+            if not identifier.validate(value):
+                errors += ["'{}' is not valid identifier.".format(concept_details.id)]
+        errors += result[1]
+        return result[0], errors
+
+    def _generic_enum_validator(self, value, concept_details, enum):
+        errors = []
+        if (value not in enum):
+            errors.append("Value '{}' is not found in enum list for type '{}'."
+                          .format(value, concept_details.type_name))
+        return value, errors
+
+
+def measure(concept_validator, concept_details, value):
+    start = time.time()
+    for i in range(VALUES):
+        concept_validator.validate_concept_value(concept_details, value)
+    return VALUES / (time.time() - start)
+
+
+def main():
+    tax = taxonomy.getTaxonomy()
+    before = ReflectingValidator(tax)
+    after = validator.Validator(tax)
+
+    print('%50s %15s %15s %8s' % ("Type", "Before (val/s)", "After (val/s)", "Speedup"))
+    for concept_name, value in CASES:
+        concept_details = tax.semantic.get_concept_details(concept_name)
+        assert before.validate_concept_value(concept_details, value) == \
+            after.validate_concept_value(concept_details, value)
+        before_rate = measure(before, concept_details, value)
+        after_rate = measure(after, concept_details, value)
+        name = concept_details.type_name
+        if concept_details.id.find("Identifier") != -1:
+            name += " (identifier)"
+        print('%50s %15.0f %15.0f %7.1fx' % (name, before_rate, after_rate, after_rate / before_rate))
+
+
+if __name__ == "__main__":
+    main()
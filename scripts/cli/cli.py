@@ -30,7 +30,7 @@ Orange Button pyoblib and CLI GitHub: https://github.com/SunSpecOrangeButton/pyo
 DASHES = "---------------------------------------------------------------------------------------"
 
 
-taxonomy = taxonomy.Taxonomy()
+taxonomy = taxonomy.getTaxonomy()
 csv = False
 json = False
 xml = False
@@ -257,12 +257,29 @@ def list_concept_calculation(args):
 
 
 def list_type_enums(args):
-    enums = taxonomy.types.get_type_enum(args.type_name)
-    if enums is not None:
-        for enum in enums:
-            print(enum)
+    if args.value is not None:
+        if args.type_name is not None:
+            enum = taxonomy.types.find_type_enum_value(args.type_name, args.value)
+            if enum is not None:
+                print(enum)
+            else:
+                print("Not found")
+        else:
+            type_names = taxonomy.types.get_types_for_enum_value(args.value)
+            if type_names:
+                for type_name in type_names:
+                    print(type_name)
+            else:
+                print("Not found")
+    elif args.type_name is not None:
+        enums = taxonomy.types.get_type_enum(args.type_name)
+        if enums is not None:
+            for enum in enums:
+                print(enum)
+        else:
+            print("Not found")
     else:
-        print("Not found")
+        print("A type name or an enumerated value (--value) is required")
 
 
 def list_numeric_types(args):
@@ -476,8 +493,11 @@ list_relationships_parser.add_argument('entrypoint', action='store',
 list_types_parser = subparsers.add_parser('list-type-enums',
                                           help='List enumerations in an Orange Button Type')
 list_types_parser.set_defaults(command='list_type_enums')
-list_types_parser.add_argument('type_name', action='store',
+list_types_parser.add_argument('type_name', action='store', nargs='?',
                                help='The type to list enumerations for')
+list_types_parser.add_argument('--value', action='store',
+                               help='Look up an enumerated value ignoring case in the type, or list the types '
+                                    'having the value if no type is given')
 
 list_numeric_types_parser = subparsers.add_parser('list-numeric-types',
                                                   help='List Orange Button Numeric Types')
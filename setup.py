@@ -6,6 +6,7 @@ TESTS_REQUIRE = [
 ]
 
 EXTRAS_REQUIRE = {
+    'columnar': ['numpy'],
     'doc': ['sphinx', 'sphinx_rtd_theme'],
     'test': TESTS_REQUIRE
 }